@@ -2,19 +2,54 @@ from pathlib import Path
 from generation_utils.StructureHandler import StructureHandler
 from generation_utils.Logger import Logger
 from controller_utils.ui_struct.UI_UserInput import UI_UserInput
+from controller_utils.ui_struct.UI_SimulationInfo import PROFILES
 from controller_utils.myutils.UT_PCErrorLogging import UT_PCErrorLogging
 from controller_utils.precice_struct import PS_PreCICEConfig
-from generation_utils.AdapterConfigGenerator import AdapterConfigGenerator
+from generation_utils.AdapterConfigGenerator import AdapterConfigIndex
 from generation_utils.format_precice_config import PrettyPrinter
-import yaml
+from generation_utils.TopologyLoader import TopologyLoader
+from generation_utils.validate_precice_config import validate_file
+from generation_utils.lint_precice_config import lint_file
+from contextlib import contextmanager
 import argparse
+import importlib
+import sys
+import time
+
+# Sub-commands of precice-genesis, mapped to the module that implements their main(argv)
+COMMANDS = {
+    "query": "generation_utils.CaseIndex",
+    "format": "generation_utils.format_precice_config",
+    "port": "generation_utils.port_precice_config",
+    "validate": "generation_utils.validate_precice_config",
+    "lint": "generation_utils.lint_precice_config",
+    "adapter-configs": "generation_utils.AdapterConfigGenerator",
+    "diff": "generation_utils.diff_precice_config",
+    "simulate": "generation_utils.simulate_coupling",
+}
+
+# Appended to the run.sh of every participant of a steady-state topology
+STEADY_RUN_HINT = """
+# Steady-state coupling: preCICE iterates a single time window of pseudo-time until the coupling converges.
+# Run the solver in its steady (or pseudo-time) mode and advance it by a fixed number of solver iterations per
+# coupling iteration instead of marching through physical time.
+"""
 
 class FileGenerator:
-    def __init__(self, input_file: Path, output_path: Path) -> None:
+    def __init__(self, input_file: Path, output_path: Path, cache_dir: Path = None, site_config: Path = None,
+                 profile: str = None) -> None:
         """ Class which takes care of generating the content of the necessary files
             :param input_file: Input yaml file that is needed for generation of the precice-config.xml file
-            :param output_path: Path to the folder where the _generated/ folder will be placed"""
+            :param output_path: Path to the folder where the _generated/ folder will be placed
+            :param cache_dir: Optional directory for the parsed topology cache
+            :param site_config: Optional site config with the defaults of the cluster, e.g. its communication settings
+            :param profile: Optional configuration profile (debug or production), overrides the one of the topology"""
         self.input_file = input_file
+        self.topology_loader = TopologyLoader(cache_dir, site_config)
+        self.topology = None
+        self.profile = profile
+        self.timings = {}  # generation stage -> seconds, nested stages as parent/stage
+        self._stages = []  # the stages that are being timed, outermost first
         self.precice_config = PS_PreCICEConfig()
         self.mylog = UT_PCErrorLogging()
         self.user_ui = UI_UserInput()
@@ -25,20 +60,16 @@ class FileGenerator:
         """Generates the precice-config.xml file based on the topology.yaml file."""
 
         # Try to open the yaml file and get the configuration
-        try:
-            with open(self.input_file, "r") as config_file:
-                config = yaml.load(config_file.read(), Loader=yaml.SafeLoader)
-                self.logger.info(f"Input YAML file: {self.input_file}")
-        except FileNotFoundError:
-            self.logger.error(f"Input YAML file {self.input_file} not found.")
-            return
-        except Exception as e:
-            self.logger.error(f"Error reading input YAML file: {str(e)}")
+        config = self._load_topology()
+        if config is None:
             return
 
         # Build the ui
         self.logger.info("Building the user input info...")
         self.user_ui.init_from_yaml(config, self.mylog)
+        if self.profile is not None:
+            # the profile of the command line replaces the one of the topology, its settings are kept
+            self.user_ui.init_profile({**self.user_ui.sim_info.profile, "name": self.profile}, self.mylog)
 
         # Generate the precice-config.xml file
         self.logger.info("Generating preCICE config...")
@@ -58,6 +89,42 @@ class FileGenerator:
             return
 
         self.logger.success(f"XML generation completed successfully: {target}")
+        for warning in self.mylog.warnings:
+            self.logger.warning(warning)
+        self._validate_precice_config(target)
+        self._lint_precice_config(target)
+
+    def _validate_precice_config(self, target: str) -> None:
+        """Checks the structural rules of the written preCICE config and reports violated rules as warnings.
+            :param target: Path to the written precice-config.xml"""
+        with self._timed("validate"):
+            try:
+                issues = validate_file(target)
+            except Exception as e:
+                self.logger.warning(f"Could not check the written preCICE config: {str(e)}")
+                return
+        if not issues:
+            self.logger.success("preCICE config passed the structural checks")
+            return
+        for issue in issues:
+            self.logger.warning(f"preCICE config check: {issue}")
+
+    def _lint_precice_config(self, target: str) -> None:
+        """Reports performance anti-patterns of the written preCICE config, low severity findings only as info.
+            :param target: Path to the written precice-config.xml"""
+        # the vertex hints of the participants size their meshes for the size dependent rules
+        mesh_vertices = {mesh_name: solver.vertices for solver in self.precice_config.solvers.values()
+                         if solver.vertices for mesh_name in solver.meshes}
+        with self._timed("lint"):
+            try:
+                findings = lint_file(target, mesh_vertices)
+            except Exception as e:
+                self.logger.warning(f"Could not lint the written preCICE config: {str(e)}")
+                return
+        for finding in findings:
+            log = self.logger.info if finding.severity == "low" else self.logger.warning
+            log(f"preCICE config performance {finding.severity}: {finding.location}: {finding.message} "
+                f"[{finding.rule}] - fix: {finding.fix}")
     
     def _generate_static_files(self, target: Path, name: str) -> None:
         """Generate static files from templates
@@ -167,6 +234,12 @@ class FileGenerator:
             "**Adapter Configurations**:\n" + "\n".join(adapter_config_paths)
         )
         
+        # Record the chosen data mappings and the reason for each of them
+        mapping_choices = [f"- {mapping.describe()}" for mapping in self.precice_config.mappings]
+        readme_content = readme_content.replace(
+            "{MAPPING_CHOICES}", "\n".join(mapping_choices) if mapping_choices else "No data mappings were generated."
+        )
+
         # Explicitly replace solver links
         readme_content = readme_content.replace(
             "[Link1]", 
@@ -191,42 +264,104 @@ class FileGenerator:
 
         self.logger.success(f"Generated README at {self.structure.README}")
     
+    def _generate_rationale(self) -> None:
+        """Generates placement.md, the generation rationale: why the meshes have their dimensions, where each data
+        flow is mapped and exchanged, and how the coupling schemes, waveforms, convergence measures, received
+        meshes and the m2n communication are set up"""
+        lines = ["# Generation Rationale", "",
+                 "Why the generator chose the settings of `precice-config.xml`, from the hints of the topology. "
+                 "The rules are documented in `controller_utils/precice_struct/`: the dimensions in "
+                 "`PS_PreCICEConfig.resolve_dimensions()`, the data flows in "
+                 "`PS_Placement.py`, the coupling schemes in `PS_CouplingScheme.py`, the waveforms in "
+                 "`PS_Waveform.py`, the convergence measures in `PS_Convergence.py`, the received meshes in "
+                 "`PS_ReceiveMesh.py` and the communication in `PS_M2N.py`.", "",
+                 "| Participant | Ranks | Interface vertices |", "| --- | --- | --- |"]
+        for solver in self.precice_config.solvers.values():
+            lines.append(f"| {solver.name} | {solver.ranks or 'unknown'} | {solver.vertices or 'unknown'} |")
+        lines += ["", "## Dimensions", ""]
+        lines += [f"- {names}: {dimensionality}D meshes, {reason}"
+                  for names, dimensionality, reason in self.precice_config.dimensions] or ["No participants."]
+        lines += ["", "## Data Flows", ""]
+        lines += [f"- {placement.describe()}" for placement in self.precice_config.placements] or ["No data flows."]
+        lines += ["", "## Coupling Schemes", ""]
+        lines += [f"- {scheme.describe(self.precice_config)}" for scheme in self.precice_config.couplingSchemes]
+        lines += ["", "## Waveforms", ""]
+        lines += [f"- {placement.waveform.describe()}" for placement in self.precice_config.placements] \
+            or ["No data flows."]
+        lines += ["", "## Convergence Measures", ""]
+        lines += [f"- {measure.describe()}" for measure in self.precice_config.convergence_measures] \
+            or ["No implicit coupling."]
+        lines += ["", "## Received Meshes", ""]
+        lines += [f"- {mesh.describe()}" for mesh in self.precice_config.receive_meshes] or ["No received meshes."]
+        lines += ["", "## Communication", ""]
+        lines += [f"- {m2n.describe()}" for m2n in self.precice_config.m2ns] or ["No m2n communication."]
+        try:
+            self.structure.placement.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            self.logger.success(f"Generated the generation rationale at {self.structure.placement}")
+        except OSError as placementException:
+            self.logger.error(f"Failed to write the generation rationale: {placementException}")
+
     def _generate_run(self, run_sh: Path) -> None:
         """Generates the run.sh file
             :param run_sh: Path to the run.sh file"""
         self._generate_static_files(target=run_sh,
                                     name="run.sh")
+        if self.user_ui.sim_info.steady and run_sh.exists():
+            with open(run_sh, 'a', encoding="utf-8") as run_file:
+                run_file.write(STEADY_RUN_HINT)
 
     def _generate_clean(self) -> None:
         """Generates the clean.sh file."""
         self._generate_static_files(target=self.structure.clean,
                                     name="clean.sh")
 
-    def _generate_adapter_config(self, target_participant: str, adapter_config: Path) -> None:
-        """Generates the adapter-config.json file."""
-        adapter_config_generator = AdapterConfigGenerator(adapter_config_path=adapter_config,
-                                                            precice_config_path=self.structure.precice_config, 
-                                                            topology_path=self.input_file,  
-                                                            target_participant=target_participant)
-        adapter_config_generator.write_to_file()
+    def _generate_adapter_config(self, index: AdapterConfigIndex, target_participant: str, adapter_config: Path) -> None:
+        """Generates the adapter-config.json file.
+            :param index: Index of the generated precice-config.xml, shared by all participants
+            :param target_participant: Name of the participant
+            :param adapter_config: Path to the adapter-config.json file"""
+        try:
+            index.write(target_participant, adapter_config)
+        except OSError as e:
+            self.logger.error(f"Failed to write adapter configuration to file: {e}")
     
+    @contextmanager
+    def _timed(self, stage: str):
+        """Measures the wall time of a generation stage, a stage within another one is recorded as parent/stage."""
+        stage = "/".join(self._stages + [stage])
+        self._stages.append(stage.rsplit("/", 1)[-1])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages.pop()
+            self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+
     def generate_level_0(self) -> None:
         """Fills out the files of level 0 (everything in the root folder)."""
-        self._generate_clean()
-        self._generate_precice_config()
-        self._generate_README()
+        with self._timed("level_0"):
+            self._generate_clean()
+            self._generate_precice_config()
+            self._generate_README()
+            self._generate_rationale()
     
-    def _extract_participants(self) -> list[str]:
-        """Extracts the participants from the topology.yaml file."""
+    def _load_topology(self) -> dict:
+        """Loads the topology.yaml file once, later calls return the already parsed topology."""
+        if self.topology is not None:
+            return self.topology
         try:
-            with open(self.input_file, "r") as config_file:
-                config = yaml.load(config_file.read(), Loader=yaml.SafeLoader)
-                self.logger.info(f"Input YAML file: {self.input_file}")
+            self.topology = self.topology_loader.load(self.input_file)
+            self.logger.info(f"Input YAML file: {self.input_file}")
         except FileNotFoundError:
             self.logger.error(f"Input YAML file {self.input_file} not found.")
-            return
         except Exception as e:
             self.logger.error(f"Error reading input YAML file: {str(e)}")
+        return self.topology
+
+    def _extract_participants(self) -> list[str]:
+        """Extracts the participants from the topology.yaml file."""
+        config = self._load_topology()
+        if config is None:
             return
         
         return list(config["participants"].keys())
@@ -234,13 +369,16 @@ class FileGenerator:
     def generate_level_1(self) -> None:
         """Generates the files of level 1 (everything in the generated sub-folders)."""
 
-        participants = self._extract_participants()
-        for participant in participants:
-            target_participant = self.structure.create_level_1_structure(participant, self.user_ui)
-            adapter_config = target_participant[1]
-            run_sh = target_participant[2]
-            self._generate_adapter_config(target_participant=participant, adapter_config=adapter_config)
-            self._generate_run(run_sh)
+        with self._timed("level_1"):
+            participants = self._extract_participants()
+            # the preCICE config is parsed once for the adapter configs of all participants
+            index = AdapterConfigIndex(self.structure.precice_config, self._load_topology())
+            for participant in participants:
+                target_participant = self.structure.create_level_1_structure(participant, self.user_ui)
+                adapter_config = target_participant[1]
+                run_sh = target_participant[2]
+                self._generate_adapter_config(index, target_participant=participant, adapter_config=adapter_config)
+                self._generate_run(run_sh)
 
     def format_precice_config(self) -> None:
         """Formats the generated preCICE configuration file."""
@@ -250,13 +388,40 @@ class FileGenerator:
         printer = PrettyPrinter(indent='    ', maxwidth=120)
         # Specify the path to the XML file you want to prettify.
         try:
-            printer.prettify_file(precice_config_path)
+            with self._timed("format"):
+                printer.prettify_file(precice_config_path)
             self.logger.success(f"Successfully prettified preCICE configuration XML")
         except Exception as prettifyException:
             self.logger.error("An error occurred during XML prettification: ", prettifyException)
-            
-        
-def main():
+
+    def index_case(self, index_db: Path) -> None:
+        """Upserts the generated case into the SQLite case index.
+            :param index_db: Path to the SQLite database of the case library"""
+        from generation_utils.CaseIndex import CaseIndex
+
+        topology = self._load_topology() or {}
+        participants = {name: participant.solverName for name, participant in self.user_ui.participants.items()}
+        exchanges = topology.get("exchanges")
+        if exchanges is None:
+            # legacy topologies only describe couplings between participant pairs
+            exchanges = [{"from": coupling.partitcipant1.name, "to": coupling.partitcipant2.name,
+                          "data": None, "type": coupling.coupling_type.name}
+                         for coupling in self.user_ui.couplings]
+        try:
+            with CaseIndex(index_db) as index:
+                index.upsert_case(self.structure.generated_root, self.input_file, participants, exchanges,
+                                  timings=self.timings)
+            self.logger.success(f"Indexed generated case in {index_db}")
+        except Exception as indexException:
+            self.logger.error(f"Failed to index the generated case in {index_db}: {indexException}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        command = importlib.import_module(COMMANDS[argv[0]])
+        sys.exit(command.main(argv[1:]))
+
     parser = argparse.ArgumentParser(description="Takes topology.yaml files as input and writes out needed files to start the precice.")
     parser.add_argument(
         "-f", "--input-file", 
@@ -272,10 +437,41 @@ def main():
         help="Output path for the generated folder.",
         default=Path(__file__).parent
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        required=False,
+        help="Directory for the cache of parsed topologies (default: $PRECICE_GENESIS_CACHE_DIR, disabled if unset).",
+        default=None
+    )
+    parser.add_argument(
+        "--site-config",
+        type=Path,
+        required=False,
+        help="YAML file with the site defaults, e.g. the communication settings of the cluster "
+             "(default: $PRECICE_GENESIS_SITE_CONFIG, none if unset).",
+        default=None
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILES,
+        required=False,
+        help="Configuration profile: debug (verbose log, exports, watch-points) or production (warnings-only log, "
+             "no exports), overrides the profile of the topology.",
+        default=None
+    )
+    parser.add_argument(
+        "--index-db",
+        type=Path,
+        required=False,
+        help="SQLite database of the case library, the generated case is upserted into it (see 'precice-genesis query').",
+        default=None
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    fileGenerator = FileGenerator(args.input_file, args.output_path)
+    fileGenerator = FileGenerator(args.input_file, args.output_path, cache_dir=args.cache_dir,
+                                  site_config=args.site_config, profile=args.profile)
     fileGenerator.generate_level_0()
     fileGenerator.generate_level_1()
     
@@ -283,5 +479,8 @@ def main():
 
     fileGenerator.format_precice_config()
 
+    if args.index_db is not None:
+        fileGenerator.index_case(args.index_db)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,7 +5,8 @@ class UT_PCErrorLogging(object):
     This is the main class to record all the loggings during the run of the program
     """
     def __init__(self):
-        """ empty Ctor """
+        """ Ctor """
+        self.warnings = [] # the warnings the user has to see, reported by the FileGenerator
         pass
 
     def rep_error(self, msg: str):
@@ -13,6 +14,11 @@ class UT_PCErrorLogging(object):
         logging.info(msg)
         pass
 
+    def rep_warning(self, msg: str):
+        logging.info(msg)
+        self.warnings.append(msg)
+        pass
+
     def rep_info(self,msg: str):
         logging.info(msg)
         pass
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Convergence measure of each data flow that is iterated in an implicit coupling scheme.
+
+The measure and its limits come, in this order of precedence, from the convergence settings of the exchange in
+the topology (convergence: measure, limit, abs-limit, rel-limit), from the relative-accuracy of the coupling
+scheme, and from the physics of the exchanged quantity (see PS_QuantityCoupled), or from the steady state:
+
+ - relative: for quantities that stay away from zero during the iterations (forces, pressures, temperatures),
+   the limit is the relative accuracy.
+ - absolute-or-relative: for quantities that start at or pass through zero (displacements, velocities, heat
+   fluxes), a relative measure cannot converge there. The iterations converge on the relative accuracy or once
+   the change drops below the absolute tolerance of the quantity, whichever comes first.
+ - residual-relative and absolute: only if configured, with the relative accuracy or the absolute tolerance of
+   the quantity as default limit.
+ - residual-relative in steady state: the single window iterates from the initial guess to the steady solution,
+   its residual has to drop relative to the first iteration by the relative accuracy, STEADY_RESIDUAL_REDUCTION
+   by default. A change relative to the data themselves would stop the iterations while they still creep.
+
+A looser limit where the coupled solution allows it cuts the sub-iterations of every time window directly.
+"""
+
+# Reduction of the residual of the steady-state window relative to its first iteration
+STEADY_RESIDUAL_REDUCTION = 1E-3
+
+
+class PS_ConvergenceMeasure(object):
+    """ The convergence measure of one data flow, with the reason of the choice """
+    def __init__(self, placement):
+        self.placement = placement # PS_Placement of the data flow
+        self.type = "relative" # one of UI_SimulationInfo.CONVERGENCE_MEASURES
+        self.limit = None # limit of the relative, residual-relative and absolute measures
+        self.abs_limit = None # limits of the absolute-or-relative measure
+        self.rel_limit = None
+        self.reason = ""
+        pass
+
+    @property
+    def tag(self) -> str:
+        return self.type + "-convergence-measure"
+
+    def attributes(self) -> dict:
+        """ attributes of the convergence measure tag """
+        placement = self.placement
+        if self.type == "absolute-or-relative":
+            attr = {"abs-limit": str(self.abs_limit), "rel-limit": str(self.rel_limit)}
+        else:
+            attr = {"limit": str(self.limit)}
+        attr.update({"mesh": placement.exchange_mesh, "data": placement.quantity.name})
+        return attr
+
+    def describe(self) -> str:
+        """ one line description of the convergence measure, used in the generation rationale """
+        placement = self.placement
+        return "{} from {} to {}: {} {} - {}".format(
+            placement.quantity.name, placement.sender.name, placement.receiver.name, self.tag,
+            ", ".join("{}={}".format(k, v) for k, v in self.attributes().items() if k.endswith("limit")), self.reason)
+
+
+def configure_convergence_measure(placement, settings: dict, relative_accuracy,
+                                  steady: bool = False) -> PS_ConvergenceMeasure:
+    """
+    Chooses the convergence measure of a data flow, see the module documentation.
+
+    Args:
+        placement (PS_Placement): The data flow.
+        settings (dict): The convergence settings of the exchange in the topology.
+        relative_accuracy (float): The relative accuracy of the coupling scheme, None if not given.
+        steady (bool): Whether the coupling is steady state.
+
+    Returns:
+        PS_ConvergenceMeasure: The configured convergence measure.
+    """
+    quantity = placement.quantity
+    measure = PS_ConvergenceMeasure(placement)
+    relative = relative_accuracy if relative_accuracy is not None else quantity.relative_tolerance
+    measure.type = settings.get("measure", "residual-relative" if steady else quantity.convergence_measure)
+    if "measure" in settings:
+        measure.reason = "configured for the exchange"
+    elif steady:
+        relative = relative_accuracy if relative_accuracy is not None else STEADY_RESIDUAL_REDUCTION
+        measure.reason = "steady state, the residual has to drop by the limit"
+    elif measure.type == "absolute-or-relative":
+        measure.reason = "{} starts at or passes through zero".format(quantity.name)
+    else:
+        measure.reason = "{} stays away from zero".format(quantity.name)
+
+    if measure.type == "absolute-or-relative":
+        measure.abs_limit = settings.get("abs-limit", quantity.absolute_tolerance)
+        measure.rel_limit = settings.get("rel-limit", settings.get("limit", relative))
+    elif measure.type == "absolute":
+        measure.limit = settings.get("limit", quantity.absolute_tolerance)
+    else:
+        measure.limit = settings.get("limit", relative)
+    if any(key in settings for key in ("limit", "abs-limit", "rel-limit")):
+        measure.reason += ", limits of the exchange"
+    return measure
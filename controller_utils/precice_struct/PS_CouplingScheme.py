@@ -3,32 +3,198 @@ from controller_utils.precice_struct.PS_ParticipantSolver import PS_ParticipantS
 from controller_utils.ui_struct.UI_UserInput import UI_UserInput
 import xml.etree.ElementTree as etree
 
+# Defaults of the acceleration, see PS_ImplicitPostProcessing.tune()
+DEFAULT_INITIAL_RELAXATION = 0.1
+DEFAULT_RELAXATION = 0.5 # of the constant acceleration
+DEFAULT_MAX_USED_ITERATIONS = 100
+DEFAULT_TIME_WINDOWS_REUSED = 10
+DEFAULT_FILTER = "QR2"
+DEFAULT_FILTER_LIMIT = 1e-2
+DEFAULT_PRECONDITIONER = "residual-sum"
+
+# Sub-iterations of implicit coupling per time window, transient and steady state
+DEFAULT_MAX_ITERATIONS = 50
+STEADY_MAX_ITERATIONS = 200
+# Steady-state schemes iterate within a single window of this pseudo-time
+STEADY_TIME_WINDOW_SIZE = 1.0
+
+# A parallel implicit scheme needs about this many times the iterations of a serial one to converge,
+# see PS_CouplingScheme.choose_coupling_mode()
+PARALLEL_ITERATIONS_RATIO = 1.5
+
 class PS_CouplingScheme(object):
     """Class to represent the Coupling schemes """
     def __init__(self):
         """Ctor to initialize all the fields """
+        self.coupling_str = "" # type of the bi-coupling scheme, e.g. parallel-implicit
         self.firstSolver = None
         self.secondSolver = None
+        self.solvers = {} # the participants of this scheme
+        self.pairs = [] # the participant pairs (frozensets of names) whose data are exchanged in this scheme
+        self.implicit_pairs = set() # the pairs among them that iterate
+        self.control_participant = None # the participant that controls a multi scheme
+        self.reason = "" # why the scheme type, the order or the control participant was chosen
+        self.steady = False # steady state: a single pseudo-time window instead of the physical time
+        self.NrTimeStep = -1
+        self.Dt = 1E-4
+        pass
+
+    def add_pair(self, solver1, solver2, implicit: bool):
+        """ adds the data exchanged between two participants to this scheme """
+        self.solvers[solver1.name] = solver1
+        self.solvers[solver2.name] = solver2
+        pair = frozenset((solver1.name, solver2.name))
+        if pair not in self.pairs:
+            self.pairs.append(pair)
+        if implicit:
+            self.implicit_pairs.add(pair)
+        pass
+
+    def placements_of(self, config, implicit_only: bool = False):
+        """ returns the data flows (PS_Placement) that are exchanged in this scheme """
+        pairs = self.implicit_pairs if implicit_only else self.pairs
+        return [p for p in config.placements if frozenset((p.sender.name, p.receiver.name)) in pairs]
+
+    def participant_names(self, config):
+        """ returns the names of the participants of this scheme, in the order of the config """
+        return [name for name in config.solvers if name in self.solvers]
+
+    def choose_control_participant(self, config):
+        """ chooses the participant that controls a multi scheme, with the reason of the choice
+
+        preCICE exchanges the data of a multi scheme only between the control participant and each other
+        participant, so the control participant has to exchange data with every other participant of the
+        scheme. If none does, the one with the most partners controls it and the other pairs are detached, see
+        detach_pairs(). The control participant gathers the iterated data of all pairs and computes the
+        acceleration. Among the candidates, the cheapest control participant leaves the fewest bytes per iteration
+        in exchanges it is not part of (a participant of every implicit pair leaves nothing), on a tie the one
+        with the most ranks, over which the acceleration is distributed, and then the first one in the config. """
+        placements = self.placements_of(config, implicit_only=True)
+        participant_names = self.participant_names(config)
+        candidates = []
+        for name in participant_names:
+            partners = sum(1 for pair in self.pairs if name in pair)
+            gathered = sum(p.exchange_bytes for p in placements if name not in (p.sender.name, p.receiver.name))
+            ranks = self.solvers[name].ranks
+            candidates.append((-partners, gathered, -(ranks or 1), len(candidates), name, ranks))
+        partners, gathered, _, _, name, ranks = min(candidates)
+        self.control_participant = name
+        self.reason = "~{} bytes of iterated data per iteration in pairs it is not part of, runs on {} ranks".format(
+            gathered, ranks or "an unknown number of")
+        if -partners < len(participant_names) - 1:
+            self.reason += ", exchanges data with only {} of the {} other participants, the rest is coupled explicitly".format(
+                -partners, len(participant_names) - 1)
+        return name
+
+    def detach_pairs(self, config) -> list:
+        """ removes the pairs the control participant is not part of and returns them as explicit bi-schemes
+
+        Their data can not be exchanged in the multi scheme (see choose_control_participant()), and a participant
+        takes part in at most one implicit scheme. Participants without a pair left leave the multi scheme. """
+        detached = []
+        for pair in [pair for pair in self.pairs if self.control_participant not in pair]:
+            solver1, solver2 = [config.solvers[name] for name in config.solvers if name in pair]
+            coupling_scheme = PS_ExplicitCoupling()
+            coupling_scheme.add_pair(solver1, solver2, False)
+            coupling_scheme.steady, coupling_scheme.NrTimeStep, coupling_scheme.Dt = self.steady, self.NrTimeStep, self.Dt
+            detached.append(coupling_scheme)
+            self.pairs.remove(pair)
+        self.implicit_pairs &= set(self.pairs)
+        self.solvers = {name: solver for name, solver in self.solvers.items()
+                        if any(name in pair for pair in self.pairs)}
+        return detached
+
+    def describe(self, config) -> str:
+        """ one line description of the scheme, used in the generation rationale """
+        participant_names = self.participant_names(config)
+        text = "{}: {}".format("multi" if len(participant_names) > 2 else self.coupling_str, ", ".join(participant_names))
+        if self.control_participant is not None:
+            text += " - control {}, {}".format(self.control_participant, self.reason)
+        elif self.reason:
+            text += " - " + self.reason
+        if self.steady:
+            text += ", steady state in a single time window"
+        return text
+
+    def choose_coupling_mode(self, config):
+        """ chooses serial or parallel coupling of a bi-scheme and the order of its two participants
+
+        One-way exchanges (never implicit, see PS_PreCICEConfig.is_implicit_coupling()) are coupled serial-explicit with the sender first, so the receiver reads the
+        data of the same time window. If both participants also iterate together in another scheme (a pair detached from
+        a multi scheme, see detach_pairs()), the receiver would wait for the converged window of the sender, whose
+        iterations need the data of the receiver, so such pairs are coupled parallel-explicit. Otherwise the mode with the shorter estimated time per time window, and
+        hence the shorter idle time, is chosen from the cost-per-window hints of the two participants:
+
+            parallel-explicit: max(cost1, cost2)     serial-explicit: cost1 + cost2
+            parallel-implicit: max(cost1, cost2) * PARALLEL_ITERATIONS_RATIO
+            serial-implicit:   cost1 + cost2
+
+        Explicit pairs thus stay parallel, implicit pairs become serial if one participant is much cheaper
+        than the other, then the more expensive participant computes first. Without hints, and on ties, the
+        coupling stays parallel. """
+        implicit = len(self.implicit_pairs) > 0
+        mode = "implicit" if implicit else "explicit"
+        senders = {p.sender.name for p in self.placements_of(config)}
+        if not implicit and len(senders) == 1:
+            sender = senders.pop()
+            if any(scheme is not self and scheme.implicit_pairs and self.solvers.keys() <= scheme.solvers.keys()
+                   for scheme in config.couplingSchemes):
+                self.coupling_str = "parallel-explicit"
+                self.reason = "one-way exchange from {}, parallel as both participants also iterate in another " \
+                              "scheme, which a serial coupling would deadlock".format(sender)
+                return
+            self.coupling_str = "serial-explicit"
+            if sender != self.firstSolver:
+                self.firstSolver, self.secondSolver = self.secondSolver, self.firstSolver
+            self.reason = "one-way exchange from {}, which computes first".format(sender)
+            return
+
+        costs = {name: self.solvers[name].cost_per_window for name in (self.firstSolver, self.secondSolver)}
+        self.coupling_str = "parallel-" + mode
+        if None in costs.values():
+            self.reason = "no cost-per-window hints, parallel coupling"
+            return
+        parallel_seconds = max(costs.values()) * (PARALLEL_ITERATIONS_RATIO if implicit else 1.0)
+        serial_seconds = sum(costs.values())
+        if serial_seconds < parallel_seconds:
+            self.coupling_str = "serial-" + mode
+            if costs[self.firstSolver] < costs[self.secondSolver]:
+                self.firstSolver, self.secondSolver = self.secondSolver, self.firstSolver
+        self.reason = "estimated {:.3g}s per time window serial against {:.3g}s parallel".format(
+            serial_seconds, parallel_seconds)
         pass
 
     def init_from_UI(self, ui_config:UI_UserInput, conf): # : PS_PreCICEConfig
-        """ This method should be overwritten by the subclasses """
+        """ initializes the time settings, the subclasses add their own ones """
+        simulation_conf = ui_config.sim_info
+        self.steady = simulation_conf.steady
+        self.NrTimeStep = simulation_conf.NrTimeStep
+        self.Dt = simulation_conf.Dt
+        pass
+
+    def write_time_windows(self, coupling_scheme: etree):
+        """ writes the end and the size of the time windows, a single pseudo-time window in steady state """
+        if self.steady:
+            i = etree.SubElement(coupling_scheme, "max-time-windows", value="1")
+            i = etree.SubElement(coupling_scheme, "time-window-size", value=str(STEADY_TIME_WINDOW_SIZE))
+        else:
+            i = etree.SubElement(coupling_scheme, "max-time", value=str(self.NrTimeStep))
+            i = etree.SubElement(coupling_scheme, "time-window-size", value=str(self.Dt))
         pass
 
     def write_precice_xml_config(self, tag: etree, config): # config: PS_PreCICEConfig
         """ parent function to write out XML file """
         pass
 
-    def write_participants_and_coupling_scheme(self, tag: etree, config, coupling_str:str ):
+    def write_participants_and_coupling_scheme(self, tag: etree, config):
         """ write out the config XMl file """
-        if len(config.solvers) <= 2:
-            # for only
-            coupling_scheme = etree.SubElement(tag, "coupling-scheme:" + coupling_str)
+        participant_names = self.participant_names(config)
+        if len(participant_names) <= 2:
             # print the participants, ASSUMPTION! we assume there is at least two
             mylist = ["NONE", "NONE"]
             mycomplexity = [-1, -1]
             myindex = 0
-            for participant_name in config.solvers:
+            for participant_name in participant_names:
                 p = config.solvers[participant_name]
                 mylist[myindex] = participant_name
                 mycomplexity[myindex] = p.solver_domain.value
@@ -36,101 +202,66 @@ class PS_CouplingScheme(object):
                 pass
             # the solver with the higher complexity should be first
             if mycomplexity[0] < mycomplexity[1]:
-                i = etree.SubElement(coupling_scheme, "participants", first=mylist[0],
-                                     second=mylist[1])
+                self.firstSolver, self.secondSolver = mylist[0], mylist[1]
             else:
-                i = etree.SubElement(coupling_scheme, "participants", first=mylist[1],
-                                     second=mylist[0])
+                self.firstSolver, self.secondSolver = mylist[1], mylist[0]
+            self.choose_coupling_mode(config)
+            coupling_scheme = etree.SubElement(tag, "coupling-scheme:" + self.coupling_str)
+            i = etree.SubElement(coupling_scheme, "participants", first=self.firstSolver,
+                                 second=self.secondSolver)
         else:
-            # TODO: is "multi" good for all
             coupling_scheme = etree.SubElement(tag, "coupling-scheme:multi")
-            # first find the solver with the most meshes and this should be the one who controls the coupling
-            nr_max_meshes = -1
-            control_participant_name = "NONE"
-            for participant_name in config.solvers:
-                participant = config.solvers[participant_name]
-                # TODO: we should select the solver with the most meshes ?
-                if len(participant.meshes) > nr_max_meshes:
-                    nr_max_meshes = len(participant.meshes)
-                    control_participant_name = participant.name
-                pass
-            # second print all the participants
-            for participant_name in config.solvers:
-                participant = config.solvers[participant_name]
-                if participant.name == control_participant_name:
-                    i = etree.SubElement(coupling_scheme, "participants", name=participant_name, control="yes")
+            self.firstSolver, self.secondSolver = None, None
+            for participant_name in participant_names:
+                if participant_name == self.control_participant:
+                    i = etree.SubElement(coupling_scheme, "participant", name=participant_name, control="yes")
                 else:
-                    i = etree.SubElement(coupling_scheme, "participants", name=participant_name)
-                    pass
+                    i = etree.SubElement(coupling_scheme, "participant", name=participant_name)
                 pass
             pass
         return coupling_scheme
 
-    def write_exchange_and_convergance(self, config, coupling_scheme, relative_conv_str:str):
-        """ Writes to the XML the exchange list """
-        # select the solver with minimal complexity
-        simple_solver = None
-        solver_simplicity = -2
-        for q_name in config.coupling_quantities:
-            q = config.coupling_quantities[q_name]
-            solver = q.source_solver
-            if solver_simplicity < solver.solver_domain.value:
-                simple_solver = solver
-
-        # For each quantity, specify the exchange and the convergence
-        for q_name in config.coupling_quantities:
-            q = config.coupling_quantities[q_name]
-            solver = q.source_solver
-
-            # look for the second solver in the list of solvers within the quantity
-            other_solver_for_coupling = None
-            other_mesh_name = None  # Initialize other mesh name
-            for oq in q.list_of_solvers:
-                other_solver = q.list_of_solvers[oq]
-                if other_solver.name != solver.name:
-                    other_solver_for_coupling = other_solver
-                    for allm in other_solver.meshes:
-                        if allm != q.source_mesh_name:
-                            other_mesh_name = allm
-
-            # the from and to attributes
-            from_s = solver.name
-            to_s = other_solver_for_coupling.name
-            exchange_mesh_name = other_mesh_name if solver.name == simple_solver.name else q.source_mesh_name
-
-            e = etree.SubElement(coupling_scheme, "exchange", data=q_name, mesh=exchange_mesh_name,
-                                from___=from_s, to=to_s)
-
-            if relative_conv_str != "":
-                c = etree.SubElement(coupling_scheme, "relative-convergence-measure",
-                                    limit=relative_conv_str, mesh=exchange_mesh_name, data=q_name)
+    def write_exchange_and_convergance(self, config, coupling_scheme, converge: bool):
+        """ Writes to the XML the exchange list, and the convergence measures of the iterated data if converge """
+        # For each data flow, the exchange (and the convergence) is on the mesh chosen by its placement
+        for placement in self.placements_of(config):
+            q_name = placement.quantity.name
+            exchange_mesh_name = placement.exchange_mesh
+            pair = frozenset((placement.sender.name, placement.receiver.name))
+
+            attributes = {"data": q_name, "mesh": exchange_mesh_name, "from___": placement.sender.name,
+                          "to": placement.receiver.name}
+            # the values of all time steps of the sender, if the receiver samples the waveform within the window
+            if placement.waveform is not None and placement.waveform.substeps is not None:
+                attributes["substeps"] = "true" if placement.waveform.substeps else "false"
+            e = etree.SubElement(coupling_scheme, "exchange", attributes)
+
+            # weakly coupled pairs within an implicit scheme do not take part in the convergence
+            if converge and pair in self.implicit_pairs:
+                measure = placement.convergence
+                c = etree.SubElement(coupling_scheme, measure.tag, measure.attributes())
+                config.convergence_measures.append(measure)
 
 
 class PS_ExplicitCoupling(PS_CouplingScheme):
     """ Explicit coupling scheme """
     def __init__(self):
-        self.NrTimeStep = -1
-        self.Dt = 1E-4
+        super(PS_ExplicitCoupling, self).__init__()
+        self.coupling_str = "parallel-explicit"
         pass
 
     def initFromUI(self, ui_config: UI_UserInput, conf):  # conf : PS_PreCICEConfig
         # call theinitialization from the UI data structures
         super(PS_ExplicitCoupling, self).init_from_UI(ui_config, conf)
-        simulation_conf = ui_config.sim_info
-        self.NrTimeStep = simulation_conf.NrTimeStep
-        self.Dt = simulation_conf.Dt
         pass
 
     def write_precice_xml_config(self, tag:etree, config): # config: PS_PreCICEConfig
         """ write out the config XMl file """
-        coupling_scheme = self.write_participants_and_coupling_scheme( tag, config, "parallel-explicit" )
+        coupling_scheme = self.write_participants_and_coupling_scheme( tag, config )
+        self.write_time_windows(coupling_scheme)
 
-        i = etree.SubElement(coupling_scheme, "max-time", value=str(self.NrTimeStep))
-        attr = { "value": str(self.Dt)}
-        i = etree.SubElement(coupling_scheme, "time-window-size", attr)
-
-        # write out the exchange but not the convergence (if empty it will not be written)
-        self.write_exchange_and_convergance(config, coupling_scheme, "")
+        # write out the exchange but not the convergence
+        self.write_exchange_and_convergance(config, coupling_scheme, False)
 
 
 class PS_ImplicitCoupling(PS_CouplingScheme):
@@ -139,10 +270,10 @@ class PS_ImplicitCoupling(PS_CouplingScheme):
 
         # TODO: define here only implicit coupling specific measures
 
-        self.NrTimeStep = -1
-        self.Dt = 1E-4
-        self.maxIteration = 50
-        self.relativeConverganceEps = 1E-4
+        super(PS_ImplicitCoupling, self).__init__()
+        self.coupling_str = "parallel-implicit"
+        self.maxIteration = DEFAULT_MAX_ITERATIONS
+        self.minIteration = None # None for the preCICE default
         self.extrapolation_order = 2
         self.postProcessing = PS_ImplicitPostProcessing() # this is the postprocessing
         pass
@@ -154,26 +285,28 @@ class PS_ImplicitCoupling(PS_CouplingScheme):
         # TODO: should we add all quantities?
         # later do delte some quantities from the list?
         self.postProcessing.post_process_quantities = conf.coupling_quantities
+        self.postProcessing.init_from_UI(ui_config.sim_info.acceleration)
 
         simulation_conf = ui_config.sim_info
-
-        self.NrTimeStep = simulation_conf.NrTimeStep
-        self.Dt = simulation_conf.Dt
+        # a steady state converges in a single window, which needs more iterations than a time step
+        self.maxIteration = simulation_conf.max_iterations
+        if self.maxIteration is None:
+            self.maxIteration = STEADY_MAX_ITERATIONS if self.steady else DEFAULT_MAX_ITERATIONS
+        self.minIteration = simulation_conf.min_iterations
 
         pass
 
     def write_precice_xml_config(self, tag:etree, config): # config: PS_PreCICEConfig
         """ write out the config XMl file """
-        coupling_scheme = self.write_participants_and_coupling_scheme( tag, config, "parallel-implicit" )
-
-        i = etree.SubElement(coupling_scheme, "max-time", value = str(self.NrTimeStep))
-        attr = { "value": str(self.Dt)}
-        i = etree.SubElement(coupling_scheme, "time-window-size", attr)
+        coupling_scheme = self.write_participants_and_coupling_scheme( tag, config )
+        self.write_time_windows(coupling_scheme)
         i = etree.SubElement(coupling_scheme, "max-iterations", value=str(self.maxIteration))
+        if self.minIteration is not None:
+            i = etree.SubElement(coupling_scheme, "min-iterations", value=str(self.minIteration))
         #i = etree.SubElement(coupling_scheme, "extrapolation-order", value=str(self.extrapolation_order))
 
-        # write out the exchange and the convergance rate
-        self.write_exchange_and_convergance(config, coupling_scheme, str(self.relativeConverganceEps))
+        # write out the exchange and the convergence measures
+        self.write_exchange_and_convergance(config, coupling_scheme, True)
 
         # finally we write out the post processing...
         self.postProcessing.write_precice_xml_config(coupling_scheme, config, self)
@@ -186,44 +319,101 @@ class PS_ImplicitPostProcessing(object):
     def __init__(self):
         """ Ctor for the postprocessing """
         self.name = "IQN-ILS"
-        self.precondition_type = "residual-sum"
+        self.settings = {} # the acceleration settings of the topology, the missing ones are tuned
+        self.initial_relaxation = DEFAULT_INITIAL_RELAXATION
+        self.relaxation = DEFAULT_RELAXATION
+        self.precondition_type = DEFAULT_PRECONDITIONER
+        self.freeze_after = None
+        self.filter_type = DEFAULT_FILTER
+        self.filter_limit = DEFAULT_FILTER_LIMIT
+        self.max_used_iterations = DEFAULT_MAX_USED_ITERATIONS # bounds the cost of the quasi-Newton update
+        self.time_windows_reused = DEFAULT_TIME_WINDOWS_REUSED
+        self.imvj_restart_mode = None # attributes of the imvj-restart-mode tag
         self.post_process_quantities = {} # The quantities that are in the acceleration
 
+    def init_from_UI(self, settings: dict):
+        """ stores the acceleration settings of the topology, e.g. {type: IQN-IMVJ, initial-relaxation: 0.5} """
+        self.settings = dict(settings or {})
+        self.name = self.settings.get("type", "IQN-ILS")
+        pass
+
+    def accelerated_placements(self, config, parent):
+        """ returns the data flows whose data are accelerated, each data on its exchange mesh only once
+
+        In a serial scheme only the data written by the second participant are accelerated, in parallel
+        and multi schemes the data of both sides. """
+        serial = parent.coupling_str.startswith("serial") and parent.secondSolver is not None
+        accelerated = {}
+        for placement in parent.placements_of(config, implicit_only=True):
+            if serial and placement.sender.name != parent.secondSolver:
+                continue
+            key = (placement.quantity.instance_name, placement.exchange_mesh)
+            accelerated.setdefault(key, placement)
+        return list(accelerated.values())
+
+    def tune(self, placements: list, steady_iterations: int = None):
+        """ derives the missing settings from the number of accelerated data and the interface size
+
+         - max-used-iterations: DEFAULT_MAX_USED_ITERATIONS, but at most half of the interface unknowns
+           (vertices times components of the accelerated data), more columns than unknowns are filtered anyway.
+           In steady state (steady_iterations, the max-iterations of the single window) all iterations of the
+           fixed-point iteration are kept instead, within the same bound.
+         - time-windows-reused: DEFAULT_TIME_WINDOWS_REUSED for IQN-ILS, 0 for IQN-IMVJ which keeps its
+           Jacobian approximation over the time windows, and 0 in steady state, there is no previous window
+         - preconditioner: DEFAULT_PRECONDITIONER if data of different magnitude (more than one data) are
+           accelerated, otherwise none """
+        settings = self.settings
+        unknowns = None
+        if placements and all(p.exchange_vertices for p in placements):
+            unknowns = sum(p.exchange_vertices * p.quantity.components(p.sender.dimensionality) for p in placements)
+
+        self.initial_relaxation = settings.get("initial-relaxation", DEFAULT_INITIAL_RELAXATION)
+        self.relaxation = settings.get("relaxation", DEFAULT_RELAXATION)
+        max_used_iterations = DEFAULT_MAX_USED_ITERATIONS if steady_iterations is None else steady_iterations
+        if unknowns is not None:
+            max_used_iterations = max(1, min(max_used_iterations, unknowns // 2))
+        self.max_used_iterations = settings.get("max-used-iterations", max_used_iterations)
+        reused = 0 if self.name == "IQN-IMVJ" or steady_iterations is not None else DEFAULT_TIME_WINDOWS_REUSED
+        self.time_windows_reused = settings.get("time-windows-reused", reused)
+        filter_settings = settings.get("filter", {})
+        self.filter_type = filter_settings.get("type", DEFAULT_FILTER)
+        self.filter_limit = filter_settings.get("limit", DEFAULT_FILTER_LIMIT)
+        preconditioner = settings.get("preconditioner", {})
+        self.precondition_type = preconditioner.get("type",
+                                                    DEFAULT_PRECONDITIONER if len(placements) > 1 else "none")
+        self.freeze_after = preconditioner.get("freeze-after")
+        self.imvj_restart_mode = settings.get("imvj-restart-mode")
+        pass
+
     def write_precice_xml_config(self, tag: etree.Element, config, parent):
         """ Write out the config XML file of the acceleration in case of implicit coupling
             Only for explicit coupling (one directional) this should not write out anything """
+        placements = self.accelerated_placements(config, parent)
+        self.tune(placements, parent.maxIteration if parent.steady else None)
 
         post_processing = etree.SubElement(tag, "acceleration:" + self.name)
-
-        # Identify unique solvers and their meshes
-        solver_meshes = {}
-        for q_name, q in config.coupling_quantities.items():
-            solver = q.source_solver
-            if solver.name not in solver_meshes:
-                solver_meshes[solver.name] = set()
-            solver_meshes[solver.name].add(q.source_mesh_name)
-
-        # Attempt to find the 'simplest' solver (e.g., solid solver)
-        # This is a heuristic and might need adjustment based on specific use cases
-        def solver_complexity(solver_name):
-            complexity_map = {
-                'solid': 1,
-                'structural': 1,
-                'fluid': 2,
-                'thermal': 3
-            }
-            return complexity_map.get(solver_name.lower(), 10)
-
-        sorted_solvers = sorted(solver_meshes.keys(), key=solver_complexity)
-        
-        # Choose the simplest solver's mesh
-        simple_solver = sorted_solvers[0] if sorted_solvers else None
-        
-        if simple_solver:
-            for q_name, q in config.coupling_quantities.items():
-                # Use the first mesh from the simplest solver
-                mesh_name = list(solver_meshes[simple_solver])[0]
-                
-                i = etree.SubElement(post_processing, "data", 
-                                     name=q.instance_name, 
-                                     mesh=mesh_name)
+        if self.name == "constant":
+            i = etree.SubElement(post_processing, "relaxation", value=str(self.relaxation))
+            return
+
+        # the data are accelerated on the mesh they are exchanged on
+        for placement in placements:
+            i = etree.SubElement(post_processing, "data",
+                                 name=placement.quantity.instance_name,
+                                 mesh=placement.exchange_mesh)
+        i = etree.SubElement(post_processing, "initial-relaxation", value=str(self.initial_relaxation))
+        if self.name == "aitken":
+            return
+
+        i = etree.SubElement(post_processing, "max-used-iterations", value=str(self.max_used_iterations))
+        i = etree.SubElement(post_processing, "time-windows-reused", value=str(self.time_windows_reused))
+        if self.filter_type != "none":
+            i = etree.SubElement(post_processing, "filter", type=self.filter_type, limit=str(self.filter_limit))
+        if self.precondition_type != "none":
+            attr = {"type": self.precondition_type}
+            if self.freeze_after is not None:
+                attr["freeze-after"] = str(self.freeze_after)
+            i = etree.SubElement(post_processing, "preconditioner", attr)
+        if self.name == "IQN-IMVJ" and self.imvj_restart_mode:
+            i = etree.SubElement(post_processing, "imvj-restart-mode",
+                                 {name: str(value) for name, value in self.imvj_restart_mode.items()})
@@ -0,0 +1,127 @@
+"""
+Transport and initialization of the m2n communication between two participants.
+
+The settings come from the communication section of the topology, on top of the site config (see the README):
+
+    type: sockets (default), mpi or mpi-multiple-ports
+    network: the network interface of the sockets, e.g. ib0 for InfiniBand
+    port: the first port of the sockets, the m2n connections of a case use consecutive ports from there
+    exchange-directory: where the connection information is exchanged, e.g. a node-local directory. The
+        placeholder {case} is replaced by a name that is unique per case, without it the name is appended.
+    use-two-level-initialization, enforce-gather-scatter: true, false or auto (default)
+    intra-comm: sockets or mpi, the communication within the ranks of each parallel participant
+
+Without an exchange-directory the preCICE connection files are exchanged in the parent directory of the participants.
+With auto, the two-level initialization is used if the two participants run on at least TWO_LEVEL_INITIALIZATION_RANKS
+ranks together, which keeps the connection setup of large runs short. Otherwise the data are gathered on and scattered
+from the primary ranks if all exchanged meshes have at most GATHER_SCATTER_MAX_VERTICES vertices and one participant
+is parallel, a small interface does not pay for the setup of the point-to-point connections between all ranks.
+The two-level initialization is used with sockets only, and never together with gather-scatter.
+"""
+import hashlib
+
+DEFAULT_EXCHANGE_DIRECTORY = "../"
+# Ranks of both participants from which the two-level initialization pays off
+TWO_LEVEL_INITIALIZATION_RANKS = 512
+# Largest exchanged mesh for which the communication is gathered on the primary ranks
+GATHER_SCATTER_MAX_VERTICES = 1000
+
+
+class PS_M2N(object):
+    """ The m2n communication between two participants, with the reason of its initialization settings """
+    def __init__(self, acceptor, connector):
+        self.acceptor = acceptor # PS_ParticipantSolver that maps the data of the pair
+        self.connector = connector # PS_ParticipantSolver
+        self.type = "sockets"
+        self.exchange_directory = DEFAULT_EXCHANGE_DIRECTORY
+        self.network = None # network interface of the sockets, None for the preCICE default
+        self.port = None # port of the sockets, None for any free port
+        self.use_two_level_initialization = False
+        self.enforce_gather_scatter = False
+        self.reason = ""
+        pass
+
+    @property
+    def tag(self) -> str:
+        return "m2n:" + self.type
+
+    def attributes(self) -> dict:
+        """ attributes of the m2n tag """
+        attr = {"connector": self.connector.name, "acceptor": self.acceptor.name,
+                "exchange-directory": self.exchange_directory}
+        if self.network is not None:
+            attr["network"] = self.network
+        if self.port is not None:
+            attr["port"] = str(self.port)
+        if self.use_two_level_initialization:
+            attr["use-two-level-initialization"] = "true"
+        if self.enforce_gather_scatter:
+            attr["enforce-gather-scatter"] = "true"
+        return attr
+
+    def describe(self) -> str:
+        """ one line description of the m2n, used in the generation rationale """
+        return "{} between {} and {}: {}".format(self.tag, self.acceptor.name, self.connector.name, self.reason)
+
+
+def case_exchange_directory(directory: str, case_path) -> str:
+    """ makes the exchange directory unique per case, see the module documentation """
+    case_id = "{}-{}".format(case_path.name, hashlib.sha1(str(case_path).encode("utf-8")).hexdigest()[:8])
+    if "{case}" in directory:
+        return directory.replace("{case}", case_id)
+    return directory.rstrip("/") + "/" + case_id
+
+
+def _choice(settings: dict, key: str):
+    """ True / False if the setting is given, None for auto """
+    value = settings.get(key, "auto")
+    return None if value == "auto" else bool(value)
+
+
+def configure_m2n(acceptor, connector, settings: dict, index: int, placements: list, case_path) -> PS_M2N:
+    """
+    Chooses the transport and the initialization of the m2n communication between two participants.
+
+    Args:
+        acceptor, connector (PS_ParticipantSolver): The participants of the m2n.
+        settings (dict): The communication settings of the topology and the site config.
+        index (int): Index of the m2n within the case, its sockets use the port first port + index.
+        placements (list): The data flows (PS_Placement) exchanged between the two participants.
+        case_path (Path): The case directory, used for the per-case exchange directory.
+
+    Returns:
+        PS_M2N: The configured m2n.
+    """
+    m2n = PS_M2N(acceptor, connector)
+    m2n.type = settings.get("type", "sockets")
+    if settings.get("exchange-directory"):
+        m2n.exchange_directory = case_exchange_directory(settings["exchange-directory"], case_path)
+    sockets = m2n.type == "sockets"
+    if sockets:
+        m2n.network = settings.get("network")
+        if settings.get("port") is not None:
+            m2n.port = int(settings["port"]) + index
+
+    ranks = [solver.ranks for solver in (acceptor, connector)]
+    vertices = [placement.exchange_vertices for placement in placements]
+    two_level = _choice(settings, "use-two-level-initialization")
+    gather_scatter = _choice(settings, "enforce-gather-scatter")
+    reasons = []
+    if two_level is None:
+        two_level = None not in ranks and sum(ranks) >= TWO_LEVEL_INITIALIZATION_RANKS
+        reasons.append("{} ranks together".format(sum(ranks) if None not in ranks else "unknown"))
+    m2n.use_two_level_initialization = two_level and sockets
+    if gather_scatter is None:
+        gather_scatter = bool(vertices) and None not in vertices and max(vertices) <= GATHER_SCATTER_MAX_VERTICES \
+            and any(r is None or r > 1 for r in ranks)
+        reasons.append("largest exchanged mesh with {} vertices".format(
+            max(vertices) if vertices and None not in vertices else "unknown"))
+    m2n.enforce_gather_scatter = gather_scatter and not m2n.use_two_level_initialization
+    if m2n.use_two_level_initialization:
+        initialization = "two-level initialization"
+    elif m2n.enforce_gather_scatter:
+        initialization = "gather-scatter on the primary ranks"
+    else:
+        initialization = "point-to-point initialization"
+    m2n.reason = initialization + (" ({})".format(", ".join(reasons)) if reasons else " as configured")
+    return m2n
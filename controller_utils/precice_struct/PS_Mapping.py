@@ -0,0 +1,92 @@
+"""
+Selection of the data mapping method between two coupling meshes.
+
+Without any interface hints in the topology the generator keeps the nearest-neighbor mapping.
+With hints, the method is chosen by the following thresholds (checked in this order):
+
+ 1. both meshes have a known size that differs by at most MATCHING_MESH_RATIO -> nearest-neighbor,
+    the meshes (nearly) match and any other method only adds cost
+ 2. the larger mesh has at most GLOBAL_RBF_MAX_VERTICES vertices -> rbf-global-direct,
+    the most accurate method, the dense system is still cheap to factorize
+ 3. the mesh that is projected on declares connectivity -> nearest-projection,
+    second order accurate and as cheap as nearest-neighbor
+ 4. otherwise -> rbf-pum-direct, its cost grows linearly with the mesh size; the vertices per
+    cluster are taken from PUM_VERTICES_PER_CLUSTER
+"""
+
+# Meshes whose vertex counts differ at most by this factor are considered matching
+MATCHING_MESH_RATIO = 1.05
+# Up to this number of vertices a global RBF system is solved directly in reasonable time
+GLOBAL_RBF_MAX_VERTICES = 5000
+# Vertices per cluster of rbf-pum-direct: (largest mesh size, vertices per cluster), larger clusters are
+# more accurate but more expensive, beyond the last size PUM_MAX_VERTICES_PER_CLUSTER is used
+PUM_VERTICES_PER_CLUSTER = ((50000, 50), (500000, 80))
+PUM_MAX_VERTICES_PER_CLUSTER = 100
+# Basis function of the RBF mappings, it has global support and therefore needs no support radius
+RBF_BASIS_FUNCTION = "thin-plate-splines"
+
+
+class PS_Mapping(object):
+    """ The data mapping between two meshes, together with the reason why the method was chosen """
+    def __init__(self, method: str, reason: str, vertices_per_cluster: int = None):
+        self.method = method # e.g. nearest-neighbor, the tag is "mapping:" + method
+        self.reason = reason
+        self.vertices_per_cluster = vertices_per_cluster
+        self.basis_function = RBF_BASIS_FUNCTION if method.startswith("rbf-") else None
+        self.direction = ""
+        self.from_mesh = ""
+        self.to_mesh = ""
+        self.constraint = ""
+        self.participant = "" # the participant that computes the mapping
+        pass
+
+    @property
+    def tag(self) -> str:
+        return "mapping:" + self.method
+
+    def describe(self) -> str:
+        """ one line description of the mapping, used in the generated README """
+        return "{}: {} mapping from {} to {} ({}): {} - {}".format(
+            self.participant, self.direction, self.from_mesh, self.to_mesh, self.constraint, self.method, self.reason)
+
+
+def pum_vertices_per_cluster(vertices: int) -> int:
+    """ returns the vertices per cluster of rbf-pum-direct for a mesh with the given number of vertices """
+    for max_vertices, vertices_per_cluster in PUM_VERTICES_PER_CLUSTER:
+        if vertices <= max_vertices:
+            return vertices_per_cluster
+    return PUM_MAX_VERTICES_PER_CLUSTER
+
+
+def select_mapping(constraint: str, from_vertices: int = None, to_vertices: int = None,
+                   from_connectivity: bool = False, to_connectivity: bool = False) -> PS_Mapping:
+    """
+    Chooses the mapping method from the interface hints of the two meshes, see the module documentation.
+
+    Args:
+        constraint (str): consistent or conservative.
+        from_vertices, to_vertices (int): Number of interface vertices of the meshes, None if unknown.
+        from_connectivity, to_connectivity (bool): Whether the mesh provides edges / triangles.
+
+    Returns:
+        PS_Mapping: The chosen mapping, the meshes and direction are set by the caller.
+    """
+    # a consistent mapping projects on the elements of the source mesh, a conservative one on the target mesh
+    projection_connectivity = from_connectivity if constraint == "consistent" else to_connectivity
+    sizes = [vertices for vertices in (from_vertices, to_vertices) if vertices]
+
+    if not sizes and not projection_connectivity:
+        return PS_Mapping("nearest-neighbor", "no interface hints given")
+    if len(sizes) == 2 and max(sizes) <= MATCHING_MESH_RATIO * min(sizes):
+        return PS_Mapping("nearest-neighbor",
+                          f"matching meshes ({from_vertices} and {to_vertices} vertices)")
+    if sizes and max(sizes) <= GLOBAL_RBF_MAX_VERTICES:
+        return PS_Mapping("rbf-global-direct",
+                          f"small meshes (at most {max(sizes)} <= {GLOBAL_RBF_MAX_VERTICES} vertices)")
+    if projection_connectivity:
+        return PS_Mapping("nearest-projection", "the {} mesh provides connectivity".format(
+            "source" if constraint == "consistent" else "target"))
+    vertices_per_cluster = pum_vertices_per_cluster(max(sizes))
+    return PS_Mapping("rbf-pum-direct",
+                      f"large meshes (up to {max(sizes)} vertices), {vertices_per_cluster} vertices per cluster",
+                      vertices_per_cluster)
@@ -28,6 +28,11 @@ class SolverNature(Enum):
     STATIONARY = 0
     TRANSIENT = 1
 
+# The domain of a participant that writes the data, e.g. the fluid writes the forces of FSI and the heat flux of CHT
+DOMAIN_OF_WRITTEN_DATA = {"Force": SolverDomain.Fluid, "Pressure": SolverDomain.Fluid, "Velocity": SolverDomain.Fluid,
+                          "HeatTransfer": SolverDomain.Fluid, "Displacement": SolverDomain.Solid,
+                          "Temperature": SolverDomain.Solid}
+
 class PS_ParticipantSolver(object):
     """Class to represent a participat in the preCICE data structure """
 
@@ -49,6 +54,17 @@ class PS_ParticipantSolver(object):
         self.solver_name = participant.solverName
         self.name = participant.name
 
+        # interface hints of the coupling mesh, used to choose and place the mappings
+        self.vertices = participant.vertices
+        self.connectivity = participant.connectivity
+        self.ranks = participant.ranks
+        self.cost_per_window = participant.cost_per_window
+        self.time_step_size = participant.time_step_size
+        self.receive_mesh_settings = participant.receive_mesh
+        self.declared_dimensionality = participant.dimensionality # None if the topology does not declare it
+        if participant.dimensionality is not None:
+            self.set_dimensionality(participant.dimensionality)
+
         pass
 
     def set_dimensionality(self, dim: int):
@@ -70,83 +86,18 @@ class PS_ParticipantSolver(object):
         self.coupling_participants[other_solver_name] = 1
         pass
 
-    def add_quantities_for_coupling(self, conf, boundary_code1:str, boundary_code2:str, other_solver_name:str,
-                                    r_list:list, w_list:list):
-        # there should be at least one coupling quantity, therefore no early exit
-        # add mesh
-        source_mesh_name = conf.get_mesh_name_by_participants(self.name, other_solver_name)
-        other_mesh_name = conf.get_mesh_name_by_participants(other_solver_name, self.name)
-        self.create_mesh_for_coupling(conf, other_solver_name )
-        # add reading quantities
-        for i in r_list:
-            r = conf.get_coupling_quantitiy(i, other_mesh_name, boundary_code1, self, False)
-            conf.add_quantity_to_mesh(other_mesh_name, r)
-            conf.add_quantity_to_mesh(source_mesh_name, r)
-            #print(" add r=", r.instance_name, " M=", other_mesh_name)
-            self.quantities_read[r.name] = r
-            pass
-        # add writing quantities
-        for i in w_list:
-            w = conf.get_coupling_quantitiy(i, source_mesh_name, boundary_code2, self, True)
-            conf.add_quantity_to_mesh(other_mesh_name, w)
-            conf.add_quantity_to_mesh(source_mesh_name, w)
-            #print(" add w=", w.instance_name, " M=", source_mesh_name)
-            self.quantities_write[w.name] = w
-            pass
-        pass
-
-    def make_participant_fsi_fluid(self, conf, boundary_code1:str, boundary_code2:str, other_solver_name:str):
-        """ This method should setup the participant as a fluid solver for FSI """
-        self.add_quantities_for_coupling(conf, boundary_code1, boundary_code2, other_solver_name,
-                                    ["Displacement"], ["Force"])
-        # set the type of the solver/participant
-        self.solver_domain = SolverDomain.Fluid
-        self.nature = SolverNature.TRANSIENT
-        pass
-
-    def make_participant_fsi_structure(self, conf, boundary_code1:str, boundary_code2:str, other_solver_name:str):
-        """ This method should setup the participant as a structure solver for FSI """
-        self.add_quantities_for_coupling(conf, boundary_code1, boundary_code2, other_solver_name,
-                                    ["Force"], ["Displacement"])
-        # set the type of the participant
-        self.solver_domain = SolverDomain.Solid
-        self.nature = SolverNature.TRANSIENT
-        pass
-
-    def make_participant_f2s_fluid(self, conf, boundary_code1:str, boundary_code2:str, other_solver_name:str):
-        """ This method should setup the participant as a fluid solver for F2S """
-        self.add_quantities_for_coupling(conf, boundary_code1, boundary_code2, other_solver_name,
-                                    [], ["Force"])
-        # set the type of the solver/participant
-        self.solver_domain = SolverDomain.Fluid
-        self.nature = SolverNature.TRANSIENT
-        pass
-
-    def make_participant_f2s_structure(self, conf, boundary_code1:str, boundary_code2:str, other_solver_name:str):
-        """ This method should setup the participant as a structure solver for F2S """
-        self.add_quantities_for_coupling(conf, boundary_code1, boundary_code2, other_solver_name,
-                                    ["Force"], [])
-        # set the type of the participant
-        self.solver_domain = SolverDomain.Solid
-        self.nature = SolverNature.TRANSIENT
-        pass
-
-    def make_participant_cht_fluid(self, conf, boundary_code1: str, boundary_code2: str, other_solver_name: str):
-        """ makes a change heat fluid solver from the participant """
-        #print("CHT FLUID")
-        self.add_quantities_for_coupling(conf, boundary_code1, boundary_code2, other_solver_name,
-                                    ["HeatTransfer", "Temperature"], ["HeatTransfer", "Temperature"])
-        # set the type of the participant
-        self.solver_domain = SolverDomain.Fluid
-        self.nature = SolverNature.TRANSIENT
-        pass
-
-    def make_participant_cht_structure(self, conf, boundary_code1: str, boundary_code2: str, other_solver_name: str):
-        """ makes a change heat structure solver from the participant """
-        #print("CHT STRUCTURE")
-        self.add_quantities_for_coupling(conf, boundary_code1, boundary_code2, other_solver_name,
-                                    ["HeatTransfer", "Temperature"], ["HeatTransfer", "Temperature"])
-        # set the type of the participant
-        self.solver_domain = SolverDomain.Solid
+    def add_exchange(self, conf, exchange_data: str, other_solver_name: str, patch: str, read: bool):
+        """ adds one exchanged data to the coupling mesh of this participant, read or written """
+        mesh_name = conf.get_mesh_name_by_participants(self.name, other_solver_name)
+        self.create_mesh_for_coupling(conf, other_solver_name)
+        quantity = conf.get_coupling_quantitiy(exchange_data, mesh_name, patch, self, not read)
+        conf.add_quantity_to_mesh(mesh_name, quantity)
+        if read:
+            self.quantities_read[quantity.name] = quantity
+        else:
+            self.quantities_write[quantity.name] = quantity
+            # the physics of the written data hints at the domain of the participant
+            if self.solver_domain == SolverDomain.NotDefined and quantity.name in DOMAIN_OF_WRITTEN_DATA:
+                self.solver_domain = DOMAIN_OF_WRITTEN_DATA[quantity.name]
         self.nature = SolverNature.TRANSIENT
-        pass
+        return quantity
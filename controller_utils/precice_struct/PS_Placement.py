@@ -0,0 +1,122 @@
+"""
+Placement of the mapping and choice of the exchange mesh for each data flow between two participants.
+
+Data flows from the sender to the receiver. Either the receiver maps it (read mapping, the data is
+exchanged on the sender's mesh) or the sender maps it (write mapping, the data is exchanged on the
+receiver's mesh). The participant that maps receives the mesh of the other participant.
+
+preCICE allows only read-consistent and write-conservative mappings on parallel participants, the other
+combination is a candidate only if the participant that would map runs on a single rank. Among the
+candidates, the one with the lower estimated time per time window is chosen:
+
+    mapping time  = (vertices of both meshes) * MAPPING_SECONDS_PER_VERTEX / ranks of the mapping participant
+    transfer time = vertices of the exchange mesh * components * BYTES_PER_VALUE / M2N_BYTES_PER_SECOND
+
+Meshes of unknown size count with UNKNOWN_VERTICES vertices, participants with unknown rank counts with one
+rank (but they are not considered serial). Without any rank or vertex hints, and on ties, the preCICE
+default (read-consistent / write-conservative) is kept.
+"""
+
+# Rough cost of mapping one vertex on one rank, only the ratio to the transfer cost matters
+MAPPING_SECONDS_PER_VERTEX = 1e-6
+# Sustained bandwidth of the m2n communication between two participants
+M2N_BYTES_PER_SECOND = 1e8
+# Every component of the exchanged data is sent as a double
+BYTES_PER_VALUE = 8
+# Assumed size of meshes without a vertex hint
+UNKNOWN_VERTICES = 10000
+
+
+class PS_Placement(object):
+    """ Where one data flow is mapped and on which mesh it is exchanged, with the reason of the choice """
+    def __init__(self, quantity, sender, receiver):
+        self.quantity = quantity # QuantityCouple
+        self.sender = sender # PS_ParticipantSolver that writes the data
+        self.receiver = receiver # PS_ParticipantSolver that reads the data
+        self.mapper = None # the participant that maps the data
+        self.direction = "" # direction of the mapping, read or write
+        self.from_mesh = ""
+        self.to_mesh = ""
+        self.exchange_mesh = ""
+        self.exchange_vertices = None # vertices of the exchange mesh, None if unknown
+        self.exchange_bytes = 0 # bytes sent over m2n per exchange
+        self.estimated_seconds = 0.0 # estimated mapping + transfer time per exchange
+        self.waveform = None # PS_Waveform, the substeps and the waveform degree of the data flow
+        self.convergence = None # PS_ConvergenceMeasure of the data flow, written if it is iterated
+        self.reason = ""
+        pass
+
+    def describe(self) -> str:
+        """ one line description of the placement, used in the generation rationale """
+        size = "" if self.exchange_vertices is not None else ", assuming {} vertices".format(UNKNOWN_VERTICES)
+        return "{} from {} to {}: {} mapping on {}, exchanged on {} (~{} bytes per exchange{}) - {}".format(
+            self.quantity.name, self.sender.name, self.receiver.name, self.direction, self.mapper.name,
+            self.exchange_mesh, self.exchange_bytes, size, self.reason)
+
+
+def _is_serial(solver) -> bool:
+    return solver.ranks == 1
+
+
+def _estimate(quantity, mapper, from_solver, to_solver, exchange_solver):
+    """ returns (estimated seconds, bytes per exchange) of one candidate placement """
+    from_vertices = from_solver.vertices or UNKNOWN_VERTICES
+    to_vertices = to_solver.vertices or UNKNOWN_VERTICES
+    exchange_bytes = (exchange_solver.vertices or UNKNOWN_VERTICES) * \
+        quantity.components(exchange_solver.dimensionality) * BYTES_PER_VALUE
+    mapping_seconds = (from_vertices + to_vertices) * MAPPING_SECONDS_PER_VERTEX / (mapper.ranks or 1)
+    return mapping_seconds + exchange_bytes / M2N_BYTES_PER_SECOND, exchange_bytes
+
+
+def place_exchange(quantity, sender, receiver, conf) -> PS_Placement:
+    """
+    Places the mapping of one data flow and chooses its exchange mesh, see the module documentation.
+
+    Args:
+        quantity (QuantityCouple): The exchanged data.
+        sender, receiver (PS_ParticipantSolver): The participants that write and read the data.
+        conf (PS_PreCICEConfig): The config, used for the mesh names.
+
+    Returns:
+        PS_Placement: The chosen placement.
+    """
+    sender_mesh = conf.get_mesh_name_by_participants(sender.name, receiver.name)
+    receiver_mesh = conf.get_mesh_name_by_participants(receiver.name, sender.name)
+
+    # (mapping participant, direction, participant whose mesh is exchanged), the preCICE default first
+    if quantity.is_consistent:
+        candidates = [(receiver, "read", sender)]
+        if _is_serial(sender):
+            candidates.append((sender, "write", receiver))
+    else:
+        candidates = [(sender, "write", receiver)]
+        if _is_serial(receiver):
+            candidates.append((receiver, "read", sender))
+
+    estimates = [_estimate(quantity, mapper, sender, receiver, exchanged) for mapper, _, exchanged in candidates]
+    has_hints = any(s.ranks is not None or s.vertices is not None for s in (sender, receiver))
+    chosen = 0
+    if has_hints and len(candidates) > 1 and estimates[1][0] < estimates[0][0]:
+        chosen = 1
+
+    placement = PS_Placement(quantity, sender, receiver)
+    placement.mapper, placement.direction, exchanged = candidates[chosen]
+    placement.from_mesh, placement.to_mesh = sender_mesh, receiver_mesh
+    placement.exchange_mesh = sender_mesh if exchanged is sender else receiver_mesh
+    placement.exchange_vertices = exchanged.vertices
+    placement.estimated_seconds, placement.exchange_bytes = estimates[chosen]
+
+    constraint = quantity.mapping_string
+    if not has_hints:
+        placement.reason = f"no rank or vertex hints, preCICE default {placement.direction}-{constraint} placement"
+    elif len(candidates) == 1:
+        # the participant that could take the mapping in the other direction is not known to be serial
+        other_side = sender if quantity.is_consistent else receiver
+        cause = "rank count of {} unknown" if other_side.ranks is None else "{} does not run on a single rank"
+        placement.reason = (cause + ", so only a {}-{} mapping on {} is possible").format(
+            other_side.name, placement.direction, constraint, placement.mapper.name)
+    else:
+        other = estimates[1 - chosen][0]
+        placement.reason = "estimated {:.3g}s per exchange against {:.3g}s with the mapping on {}".format(
+            placement.estimated_seconds, other, candidates[1 - chosen][0].name)
+    return placement
@@ -4,6 +4,14 @@ from controller_utils.ui_struct.UI_Coupling import *
 from controller_utils.precice_struct.PS_Mesh import *
 from controller_utils.precice_struct.PS_ParticipantSolver import PS_ParticipantSolver
 from controller_utils.precice_struct.PS_CouplingScheme import *
+from controller_utils.precice_struct.PS_Mapping import PS_Mapping, select_mapping
+from controller_utils.precice_struct.PS_Placement import PS_Placement, place_exchange
+from controller_utils.precice_struct.PS_M2N import PS_M2N, configure_m2n
+from controller_utils.precice_struct.PS_ReceiveMesh import PS_ReceiveMesh, configure_receive_mesh
+from controller_utils.precice_struct.PS_Waveform import PS_Waveform, configure_waveform
+from controller_utils.precice_struct.PS_Convergence import PS_ConvergenceMeasure, configure_convergence_measure
+from controller_utils.precice_struct.PS_Profile import PS_Profile, configure_profile
+from pathlib import Path
 import xml.etree.ElementTree as etree
 import xml.dom.minidom as my_minidom
 
@@ -14,11 +22,25 @@ class PS_PreCICEConfig(object):
         """ Ctor """
         # the overall coupling scheme
         # this contains all the coupling information between the solvers
-        self.couplingScheme = None
+        self.couplingSchemes = [] # one coupling scheme per participant pair (or one multi scheme for several)
         # here we enlist all the solvers including their meshes
         self.solvers = {} # empty dictionary with the solvers
         self.meshes = {} # dictionary with the meshes of the coupling scenario
         self.coupling_quantities = {} # ditionary with the coupling quantities
+        self.data_flows = [] # (quantity, sender, receiver) of every exchange declared in the topology
+        self.mappings = [] # the data mappings of all participants, with the reason of their method
+        self.placements = [] # where each data flow is mapped and exchanged, with the reason of the choice
+        self.communication = {} # m2n and intra-comm settings, see PS_M2N
+        self.m2ns = [] # the m2n communications, one per pair of participants that exchange data
+        self.receive_meshes = [] # the meshes received by the participants, with their initialization settings
+        self.exchange_settings = {} # (from, to, data) -> substeps, waveform-degree and convergence of the topology
+        self.time_window_size = None # the time window of the coupling schemes
+        self.steady = False # steady state: every two-way pair iterates in a single pseudo-time window
+        self.relative_accuracy = None # relative accuracy of the implicit schemes, None for the quantity defaults
+        self.convergence_measures = [] # the convergence measures written into the implicit schemes
+        self.dimensions = [] # the dimensions of each group of coupled participants, with the reason
+        self.profile_settings = {} # the configuration profile of the topology, see PS_Profile
+        self.profile = None # PS_Profile, None without a profile
         pass
 
     def get_coupling_quantitiy(self, quantity_name:str, source_mesh_name:str, bc: str, solver, read:bool):
@@ -94,6 +116,49 @@ class PS_PreCICEConfig(object):
         # TODO: create solver ... ?
         return None
 
+    def place_exchanges(self):
+        """ places the mapping and chooses the exchange mesh of every data flow between two participants """
+        self.placements = []
+        for q, sender, receiver in self.data_flows:
+            placement = place_exchange(q, sender, receiver, self)
+            settings = self.exchange_settings.get((sender.name, receiver.name, q.name), {})
+            placement.waveform = configure_waveform(placement, settings, self.time_window_size, self.steady)
+            placement.convergence = configure_convergence_measure(
+                placement, settings.get("convergence", {}), self.relative_accuracy, self.steady)
+            self.placements.append(placement)
+        return self.placements
+
+    def waveform_degree(self, quantity) -> int:
+        """ returns the highest waveform degree the exchanges of the quantity request, None if none does """
+        degrees = [p.waveform.degree for p in self.placements
+                   if p.quantity is quantity and p.waveform.degree is not None]
+        return max(degrees) if degrees else None
+
+    def create_mapping(self, placement: PS_Placement):
+        """ chooses the mapping method of a placed data flow and records it """
+        sender, receiver = placement.sender, placement.receiver
+        constraint = placement.quantity.mapping_string
+        mapping = select_mapping(constraint, sender.vertices, receiver.vertices,
+                                 sender.connectivity, receiver.connectivity)
+        mapping.participant = placement.mapper.name
+        mapping.direction = placement.direction
+        mapping.from_mesh = placement.from_mesh
+        mapping.to_mesh = placement.to_mesh
+        mapping.constraint = constraint
+        self.mappings.append(mapping)
+        return mapping
+
+    def write_mapping(self, solver_tag, mapping: PS_Mapping):
+        """ writes the mapping tag (and its basis function) into the participant tag """
+        attributes = {"direction": mapping.direction, "from___": mapping.from_mesh, "to": mapping.to_mesh,
+                      "constraint": mapping.constraint}
+        if mapping.vertices_per_cluster is not None:
+            attributes["vertices-per-cluster"] = str(mapping.vertices_per_cluster)
+        mapping_tag = etree.SubElement(solver_tag, mapping.tag, attributes)
+        if mapping.basis_function is not None:
+            etree.SubElement(mapping_tag, "basis-function:" + mapping.basis_function)
+        return mapping_tag
+
     def create_config(self, user_input: UI_UserInput):
         """Creates the main preCICE config from the UI structure."""
 
@@ -103,61 +168,138 @@ class PS_PreCICEConfig(object):
             list = participant_obj.list_of_couplings
             self.solvers[participant_name] = PS_ParticipantSolver(participant_obj, list[0], self)
 
-        # should we do something for the couplings?
-        # the couplings are added to the participants already
-        max_coupling_value = 100
+        # the data flows, exactly one per exchange declared in the topology
+        self.data_flows = []
         for coupling in user_input.couplings:
-            # for all couplings, configure the solvers properly
-            participant1_name = coupling.partitcipant1.name
-            participant2_name = coupling.partitcipant2.name
-            participant1_solver = self.solvers[participant1_name]
-            participant2_solver = self.solvers[participant2_name]
-            max_coupling_value = min(max_coupling_value, coupling.coupling_type.value)
-
-            # ========== FSI =========
-            if coupling.coupling_type == UI_CouplingType.fsi:
-                # VERY IMPORTANT: we rely here on the fact that the participants are sorted alphabetically
-                participant1_solver.make_participant_fsi_fluid(
-                    self, coupling.boundaryC1, coupling.boundaryC2, participant2_solver.name )
-                participant2_solver.make_participant_fsi_structure(
-                    self, coupling.boundaryC1, coupling.boundaryC2, participant1_solver.name)
-                pass
-            # ========== F2S =========
-            if coupling.coupling_type == UI_CouplingType.f2s:
-                # VERY IMPORTANT: we rely here on the fact that the participants are sorted alphabetically
-                participant1_solver.make_participant_f2s_fluid(
-                    self, coupling.boundaryC1, coupling.boundaryC2, participant2_solver.name )
-                participant2_solver.make_participant_f2s_structure(
-                    self, coupling.boundaryC1, coupling.boundaryC2, participant1_solver.name)
-                pass
-            # ========== CHT =========
-            if coupling.coupling_type == UI_CouplingType.cht:
-                # VERY IMPORTANT: we rely here on the fact that the participants are sorted alphabetically
-                participant1_solver.make_participant_cht_fluid(
-                    self, coupling.boundaryC1, coupling.boundaryC2, participant2_solver.name )
-                participant2_solver.make_participant_cht_structure(
-                    self, coupling.boundaryC1, coupling.boundaryC2, participant1_solver.name)
-                pass
-            pass
+            for exchange in coupling.exchanges:
+                sender = self.solvers[exchange.from_participant.name]
+                receiver = self.solvers[exchange.to_participant.name]
+                if any(q.name == exchange.data and (s, r) == (sender, receiver) for q, s, r in self.data_flows):
+                    continue
+                quantity = sender.add_exchange(self, exchange.data, receiver.name, exchange.from_patch, False)
+                receiver.add_exchange(self, exchange.data, sender.name, exchange.to_patch, True)
+                self.data_flows.append((quantity, sender, receiver))
+
+        self.resolve_dimensions()
+
+        self.communication = user_input.sim_info.communication
+        self.profile_settings = user_input.sim_info.profile
+        self.exchange_settings = user_input.exchange_settings
+        self.steady = user_input.sim_info.steady
+        self.time_window_size = STEADY_TIME_WINDOW_SIZE if self.steady else user_input.sim_info.Dt
+        self.relative_accuracy = user_input.sim_info.relative_accuracy
+
+        # one coupling scheme per participant pair, composed into a set that preCICE accepts
+        self.couplingSchemes = self.compose_coupling_schemes(user_input)
 
-        # Determine coupling scheme based on new coupling type logic or existing max_coupling_value
-        if hasattr(user_input, 'coupling_type') and user_input.coupling_type is not None:
-            if user_input.coupling_type == 'strong':
-                self.couplingScheme = PS_ImplicitCoupling()
-            elif user_input.coupling_type == 'weak':
-                self.couplingScheme = PS_ExplicitCoupling()
-            else:
-                # Fallback to existing logic if invalid type
-                self.couplingScheme = PS_ImplicitCoupling() if max_coupling_value < 2 else PS_ExplicitCoupling()
-        else:
-            # Use existing logic if no coupling type specified
-            self.couplingScheme = PS_ImplicitCoupling() if max_coupling_value < 2 else PS_ExplicitCoupling()
-            #throw an error if no coupling type is specified and the coupling scheme is not compatible with the coupling type
-            #raise ValueError("No coupling type specified and coupling scheme is not compatible with the coupling type " + ("explicit" if self.couplingScheme is PS_ExplicitCoupling() else "implicit"))
-        
         # Initialize coupling scheme with user input
-        self.couplingScheme.initFromUI(user_input, self)
+        for coupling_scheme in self.couplingSchemes:
+            coupling_scheme.initFromUI(user_input, self)
+
+        pass
 
+    def resolve_dimensions(self):
+        """ chooses the dimensions of the coupling meshes and thus the size of the vector data
+
+        preCICE maps only between meshes of the same dimensions, so all participants connected by data flows
+        couple on meshes of one dimension: the largest dimensionality they declare, 3 if none declares one.
+        A 2D participant coupled with a 3D one therefore exchanges its (planar) interface in 3D. """
+        groups = {name: {name} for name in self.solvers}
+        for _, sender, receiver in self.data_flows:
+            group = groups[sender.name] | groups[receiver.name]
+            for name in group:
+                groups[name] = group
+        self.dimensions = []
+        for group in {frozenset(group) for group in groups.values()}:
+            solvers = [self.solvers[name] for name in self.solvers if name in group]
+            declared = {s.name: s.declared_dimensionality for s in solvers if s.declared_dimensionality is not None}
+            dimensionality = max([d if d in (2, 3) else 3 for d in declared.values()] or [3])
+            for solver in solvers:
+                solver.set_dimensionality(dimensionality)
+            names = ", ".join(s.name for s in solvers)
+            if not declared:
+                reason = "no dimensionality declared"
+            elif all(d == dimensionality for d in declared.values()):
+                reason = "declared"
+            else:
+                lower = ", ".join("{} ({}D)".format(n, d) for n, d in declared.items() if d != dimensionality)
+                reason = "mixed dimensions, {} exchange their interface on {}D meshes, as preCICE maps only " \
+                         "between meshes of the same dimensions".format(lower, dimensionality)
+            self.dimensions.append((names, dimensionality, reason))
+        self.dimensions.sort()
+        pass
+
+    def is_implicit_coupling(self, coupling) -> bool:
+        """ returns True if the pair of participants of the coupling needs sub-iterations """
+        if coupling.one_way:
+            # the data of a one-way coupling do not depend on each other, there is nothing to iterate
+            return False
+        if self.steady:
+            # a steady state is reached only by iterating the single time window
+            return True
+        if coupling.exchange_type == 'strong':
+            return True
+        if coupling.exchange_type == 'weak':
+            return False
+        if coupling.coupling_type == UI_CouplingType.error_coupling:
+            # two-way pairs of the exchanges format without a type are coupled strongly
+            return True
+        # legacy topologies: FSI and CHT are coupled implicitly, F2S explicitly
+        return coupling.coupling_type in (UI_CouplingType.fsi, UI_CouplingType.cht)
+
+    def compose_coupling_schemes(self, user_input: UI_UserInput) -> list:
+        """ builds the coupling schemes from the coupling graph of the participants
+
+        preCICE combines the explicit bi-coupling schemes of a participant with at most one implicit scheme.
+        Participants connected by implicitly coupled pairs therefore iterate in one scheme: a single pair in a
+        bi-scheme, a larger group (a cycle or a chain of strongly coupled pairs) in a multi scheme, which then
+        also exchanges the weak pairs among its participants. All other pairs get explicit bi-schemes, as do the
+        pairs of a multi scheme its control participant is not part of (see choose_control_participants()). """
+        # the groups of participants connected by implicitly coupled pairs
+        groups = {}
+        for coupling in user_input.couplings:
+            if self.is_implicit_coupling(coupling):
+                names = (coupling.partitcipant1.name, coupling.partitcipant2.name)
+                group = set(names).union(*(groups.get(name, set()) for name in names))
+                for name in group:
+                    groups[name] = group
+
+        schemes = []
+        group_schemes = {}
+        for coupling in user_input.couplings:
+            solver1 = self.solvers[coupling.partitcipant1.name]
+            solver2 = self.solvers[coupling.partitcipant2.name]
+            implicit = self.is_implicit_coupling(coupling)
+            group = groups.get(solver1.name)
+            if group is not None and solver2.name in group:
+                key = frozenset(group)
+                if key not in group_schemes:
+                    group_schemes[key] = PS_ImplicitCoupling()
+                    schemes.append(group_schemes[key])
+                group_schemes[key].add_pair(solver1, solver2, implicit)
+                continue
+            coupling_scheme = PS_ImplicitCoupling() if implicit else PS_ExplicitCoupling()
+            coupling_scheme.add_pair(solver1, solver2, implicit)
+            schemes.append(coupling_scheme)
+        return schemes
+
+    def choose_control_participants(self, log: UT_PCErrorLogging):
+        """ chooses the control participant of every multi scheme, the pairs it is not part of are coupled
+        explicitly in their own bi-schemes (see PS_CouplingScheme.choose_control_participant()) """
+        coupling_schemes = []
+        for coupling_scheme in self.couplingSchemes:
+            coupling_schemes.append(coupling_scheme)
+            if len(coupling_scheme.solvers) <= 2:
+                continue
+            control_participant = coupling_scheme.choose_control_participant(self)
+            implicit_pairs = set(coupling_scheme.implicit_pairs)
+            for detached in coupling_scheme.detach_pairs(self):
+                if detached.pairs[0] in implicit_pairs:
+                    log.rep_warning("The strongly coupled participants {} are coupled explicitly, their multi scheme "
+                                  "exchanges data only with its control participant {}.".format(
+                                      " and ".join(detached.participant_names(self)), control_participant))
+                coupling_schemes.append(detached)
+        self.couplingSchemes = coupling_schemes
         pass
 
     def write_precice_xml_config(self, filename:str, log:UT_PCErrorLogging, sync_mode: str, mode: str):
@@ -165,6 +307,11 @@ class PS_PreCICEConfig(object):
 
         self.sync_mode = sync_mode  # Store sync_mode
         self.mode = mode  # Store mode
+        self.mappings = []
+        self.m2ns = []
+        self.receive_meshes = []
+        self.convergence_measures = []
+        case_path = Path(filename).resolve().parent.parent
 
         nsmap = {
             "data": "data",
@@ -177,128 +324,113 @@ class PS_PreCICEConfig(object):
 
         precice_configuration_tag = etree.Element("precice-configuration", nsmap=nsmap)
 
+        # 0 log and profiling of the configuration profile
+        self.profile = configure_profile(self.profile_settings, sync_mode, mode)
+        if self.profile is not None:
+            self.profile.write_precice_xml_config(precice_configuration_tag, self)
 
         # write out:
-        # first get the dimensionality of the coupling
-        dimensionality = 0
+        # first get the dimensionality of the meshes, each mesh has the one of the participant providing it
+        mesh_dimensionality = {}
         for solver_name in self.solvers:
             solver = self.solvers[solver_name]
-            dimensionality = max ( dimensionality, solver.dimensionality )
+            for solvers_mesh_name in solver.meshes:
+                mesh_dimensionality[solvers_mesh_name] = solver.dimensionality
             pass
 
-        # 1 quantities
+        # 1 quantities, with the waveform degree their exchanges request
+        self.place_exchanges()
+        self.choose_control_participants(log)
         for coupling_quantities_name in self.coupling_quantities:
             coupling_quantity = self.coupling_quantities[coupling_quantities_name]
             mystr = "scalar"
             if coupling_quantity.dim > 1:
                 mystr = "vector"
                 pass
-            data_tag = etree.SubElement(precice_configuration_tag, etree.QName("data:"+mystr),
-                                        name=coupling_quantity.name)
+            attributes = {"name": coupling_quantity.name}
+            degree = self.waveform_degree(coupling_quantity)
+            if degree is not None:
+                attributes["waveform-degree"] = str(degree)
+            data_tag = etree.SubElement(precice_configuration_tag, etree.QName("data:"+mystr), attributes)
             pass
 
         # 2 meshes
         for mesh_name in self.meshes:
             mesh = self.meshes[mesh_name]
-            mesh_tag = etree.SubElement(precice_configuration_tag, "mesh", name=mesh.name, dimensions=str(dimensionality))
+            mesh_tag = etree.SubElement(precice_configuration_tag, "mesh", name=mesh.name,
+                                        dimensions=str(mesh_dimensionality.get(mesh.name, 3)))
             for quantities_name in mesh.quantities:
                 quant = mesh.quantities[quantities_name]
                 quant_tag = etree.SubElement(mesh_tag, "use-data", name=quant.instance_name)
 
         # 3 participants
+        m2n_pairs = set()
         for solver_name in self.solvers:
             solver = self.solvers[solver_name]
             solver_tag = etree.SubElement(precice_configuration_tag,
                                           "participant", name=solver.name)
+            # the data flows this participant maps, the reads first
+            mapped = [p for p in self.placements if p.mapper is solver and p.direction == "read"] + \
+                     [p for p in self.placements if p.mapper is solver and p.direction == "write"]
 
             # there are more then one meshes per participant
             for solvers_mesh_name in solver.meshes:
-                # print("Mesh=", solvers_mesh_name)
                 solver_mesh_tag = etree.SubElement(solver_tag,
                                               "provide-mesh", name=solvers_mesh_name)
-                list_of_solvers_with_higher_complexity = {}
-                type_of_the_mapping = {} # for each solver for the mapping
-                                        # we also save the type of mapping (conservative / consistent)
-                list_of_solvers_with_higher_complexity_read = {}
-                type_of_the_mapping_read = {}
-                list_of_solvers_with_higher_complexity_write = {}
-                type_of_the_mapping_write = {}
-                # write out the quantities that are either read or written
-                # -------------------------------------------------
-                # | Collect all the solvers and mappings from the coupling
-                # -------------------------------------------------
-                used_meshes = {}
+            # one mapping per mesh pair, direction and constraint, shared by all data mapped that way
+            solver_mappings = {}
+            for placement in mapped:
+                key = (placement.direction, placement.from_mesh, placement.to_mesh, placement.quantity.mapping_string)
+                if key not in solver_mappings:
+                    solver_mappings[key] = self.create_mapping(placement)
+            # the mapping participant receives the mesh of the other participant, within one participant only once
+            used_meshes = {}
+            for placement in mapped:
+                other_solver = placement.sender if placement.direction == "read" else placement.receiver
+                other_mesh_name = placement.from_mesh if placement.direction == "read" else placement.to_mesh
+                if other_mesh_name not in solver.meshes and other_mesh_name not in used_meshes:
+                    mesh_mappings = [m for m in solver_mappings.values() if other_mesh_name in (m.from_mesh, m.to_mesh)]
+                    receive_mesh = configure_receive_mesh(other_mesh_name, other_solver, solver, mesh_mappings)
+                    solver_mesh_tag = etree.SubElement(solver_tag, "receive-mesh", receive_mesh.attributes())
+                    self.receive_meshes.append(receive_mesh)
+                    used_meshes[other_mesh_name] = 1
+            # write out the quantities that are either read or written
+            for solvers_mesh_name in solver.meshes:
                 for q_name in solver.quantities_read:
                     q = solver.quantities_read[q_name]
                     read_tag = etree.SubElement(solver_tag,
-                                                       "read-data", name=q.name, mesh=solvers_mesh_name)
-                    for other_solvers_name in q.list_of_solvers:
-                        other_solver = q.list_of_solvers[other_solvers_name]
-                        # consistent only read
-                        if other_solvers_name != solver_name \
-                                and q.is_consistent:
-                            #print(" other solver:", other_solvers_name, " solver", solver_name)
-                            list_of_solvers_with_higher_complexity[other_solvers_name] = other_solver
-                            type_of_the_mapping[other_solvers_name] = q.mapping_string
-                            list_of_solvers_with_higher_complexity_read[other_solvers_name] = other_solver
-                            type_of_the_mapping_read[other_solvers_name] = q.mapping_string
-                            # within one participant put the "use-mesh" only once there
-                            if solvers_mesh_name != q.source_mesh_name and \
-                                            q.source_mesh_name not in used_meshes:
-                                solver_mesh_tag = etree.SubElement(solver_tag,
-                                                                   "receive-mesh", name=q.source_mesh_name,
-                                                                   from___=q.source_solver.name)
-                                used_meshes[q.source_mesh_name] = 1
-                                pass
-                    pass
+                                                "read-data", name=q.name, mesh=solvers_mesh_name)
                 for q_name in solver.quantities_write:
                     q = solver.quantities_write[q_name]
                     write_tag = etree.SubElement(solver_tag,
-                                                       "write-data", name=q.name, mesh=solvers_mesh_name)
-                    for other_solvers_name in q.list_of_solvers:
-                        other_solver = q.list_of_solvers[other_solvers_name]
-                        # conservative only write
-                        if other_solvers_name != solver_name \
-                                and not q.is_consistent:
-                            #print(" other solver:", other_solvers_name, " solver", solver_name)
-                            list_of_solvers_with_higher_complexity[other_solvers_name] = other_solver
-                            type_of_the_mapping[other_solvers_name] = q.mapping_string
-                            list_of_solvers_with_higher_complexity_write[other_solvers_name] = other_solver
-                            type_of_the_mapping_write[other_solvers_name] = q.mapping_string
-                    pass
-
-                # do the mesh mapping on the more "complex" side of the computations, to avoid data intensive traffic
-                # for each mesh we look if the belonging solver has higher complexity
-
-                # READS
-                for other_solver_name in list_of_solvers_with_higher_complexity_read:
-                    other_solver = list_of_solvers_with_higher_complexity_read[other_solver_name]
-                    mapping_string = type_of_the_mapping_read[other_solver_name]
-                    other_solver_mesh_name = self.get_mesh_name_by_participants(other_solver_name, solver_name)
-                    mapped_tag = etree.SubElement(solver_tag, "mapping:nearest-neighbor", direction = "read",
-                                                  from___ = other_solver_mesh_name, to= solvers_mesh_name,
-                                                  constraint = mapping_string)
-                    pass
-                # WRITES
-                for other_solver_name in list_of_solvers_with_higher_complexity_write:
-                    other_solver = list_of_solvers_with_higher_complexity_write[other_solver_name]
-                    mapping_string = type_of_the_mapping_write[other_solver_name]
-                    other_solver_mesh_name = self.get_mesh_name_by_participants(other_solver_name, solver_name)
-                    mapped_tag = etree.SubElement(solver_tag, "mapping:nearest-neighbor", direction="write",
-                                              from___ = solvers_mesh_name, to = other_solver_mesh_name,
-                                              constraint = mapping_string)
-                    pass
-                # treat M2N communications with other solver
-                for other_solver_name in list_of_solvers_with_higher_complexity:
-                    other_solver = list_of_solvers_with_higher_complexity[other_solver_name]
+                                                 "write-data", name=q.name, mesh=solvers_mesh_name)
+
+            for mapping in solver_mappings.values():
+                mapping_tag = self.write_mapping(solver_tag, mapping)
+            # watch-points and exports of the configuration profile
+            if self.profile is not None:
+                self.profile.write_participant(solver_tag, solver, log)
+            # parallel participants communicate between their ranks as configured
+            if self.communication.get("intra-comm") and solver.ranks != 1:
+                intra_comm_tag = etree.SubElement(solver_tag, "intra-comm:" + self.communication["intra-comm"])
+            # treat M2N communications with other solver, one per pair of participants
+            for placement in mapped:
+                other_solver = placement.sender if placement.direction == "read" else placement.receiver
+                pair = frozenset((solver.name, other_solver.name))
+                if pair not in m2n_pairs:
                     # we also add the M2N construct that is mandatory for the configuration
-                    m2n_tag = etree.SubElement( precice_configuration_tag, "m2n:sockets", connector = other_solver_name,
-                                                acceptor = solver_name, exchange___directory = "../")
-                pass
+                    pair_placements = [p for p in self.placements if frozenset((p.sender.name, p.receiver.name)) == pair]
+                    m2n = configure_m2n(solver, other_solver, self.communication, len(self.m2ns), pair_placements,
+                                        case_path)
+                    m2n_tag = etree.SubElement(precice_configuration_tag, m2n.tag, m2n.attributes())
+                    self.m2ns.append(m2n)
+                    m2n_pairs.add(pair)
+            pass
 
         # 4 coupling scheme
         # TODO: later this migh be more complex !!!
-        self.couplingScheme.write_precice_xml_config(precice_configuration_tag, self)
+        for coupling_scheme in self.couplingSchemes:
+            coupling_scheme.write_precice_xml_config(precice_configuration_tag, self)
 
         # =========== generate XML ===========================
 
@@ -312,11 +444,12 @@ class PS_PreCICEConfig(object):
                                                                                             to_index + 1:]
         # just a workaround of how to avoid problems with the parser
         # TODO: later we should find a more elegant solution
-        replace_only_list = [("from___", "from"), ("exchange___directory", "exchange-directory")]
+        replace_only_list = [("from___", "from")]
         for a,b in replace_only_list:
             xml_string = xml_string.replace(a, b)
-        replace_list = [("data:", "data___"), ("mapping:nearest", "mapping___nearest"), ("m2n:", "m2n___" ),
-                        ("coupling-scheme:","coupling-scheme___"), ("acceleration:", "acceleration___")]
+        replace_list = [("data:", "data___"), ("mapping:", "mapping___"), ("basis-function:", "basis-function___"), ("m2n:", "m2n___" ),
+                        ("coupling-scheme:","coupling-scheme___"), ("acceleration:", "acceleration___"),
+                        ("intra-comm:", "intra-comm___"), ("export:", "export___")]
         for a,b in replace_list:
             xml_string = xml_string.replace(a, b)
 
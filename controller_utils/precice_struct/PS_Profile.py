@@ -0,0 +1,95 @@
+"""
+Configuration profiles: the log, the exports, the watch-points and the profiling of a run.
+
+The profile is chosen in the topology (profile: debug, or profile: {name: debug, export-every: 5,
+watch-points: [...]}) or with --profile on the command line, which takes precedence:
+
+ - debug: a verbose log (DEBUG_LOG_FILTER), VTU exports of the meshes of every participant every export-every
+   time windows (DEFAULT_EXPORT_EVERY), the watch-points of the profile, and profiling of all events (mode
+   advanced) or the fundamental ones (mode fundamental), synchronized if sync-mode is on.
+ - production: a warnings-only log (PRODUCTION_LOG_FILTER), no exports and no watch-points, and fundamental
+   profiling without synchronization, which would add a barrier to every profiled event.
+
+Without a profile nothing is written and preCICE uses its defaults.
+"""
+import xml.etree.ElementTree as etree
+
+# Log filters of the profiles, in the filter syntax of the preCICE log sinks
+DEBUG_LOG_FILTER = "%Severity% >= debug"
+PRODUCTION_LOG_FILTER = "%Severity% >= warning"
+# Time windows between two exports of the debug profile
+DEFAULT_EXPORT_EVERY = 10
+EXPORT_DIRECTORY = "precice-exports"
+# preCICE profiling mode of the simulation modes of the topology
+PROFILING_MODES = {"fundamental": "fundamental", "advanced": "all"}
+
+
+class PS_Profile(object):
+    """ The log, exports, watch-points and profiling settings of a configuration profile """
+    def __init__(self, name: str):
+        self.name = name # debug or production
+        self.log_filter = None
+        self.export_every = None # time windows between two exports, None for no exports
+        self.watch_points = [] # watch-point settings, {name, participant, coordinate}
+        self.profiling_mode = "fundamental"
+        self.synchronize = False
+        pass
+
+    def write_precice_xml_config(self, tag: etree, config): # config: PS_PreCICEConfig
+        """ writes the log and the profiling tags of the configuration """
+        log_tag = etree.SubElement(tag, "log")
+        sink_tag = etree.SubElement(log_tag, "sink", {"type": "stream", "output": "stdout",
+                                                      "filter": self.log_filter, "enabled": "true"})
+        profiling_tag = etree.SubElement(tag, "profiling", {"mode": self.profiling_mode,
+                                                             "synchronize": "true" if self.synchronize else "false"})
+        pass
+
+    def write_participant(self, solver_tag: etree, solver, log):
+        """ writes the watch-points and the exports of a participant, watch-points that do not fit its mesh are
+        reported and skipped """
+        for watch_point in self.watch_points:
+            if watch_point["participant"] != solver.name:
+                continue
+            coordinate = watch_point["coordinate"]
+            if not solver.meshes:
+                log.rep_warning("The watch-point {} is skipped, {} provides no mesh.".format(
+                    watch_point["name"], solver.name))
+                continue
+            if len(coordinate) != solver.dimensionality:
+                log.rep_warning("The watch-point {} needs a coordinate with {} components.".format(
+                    watch_point["name"], solver.dimensionality))
+                continue
+            # watch-points are on the mesh the participant provides
+            mesh_name = next(iter(solver.meshes))
+            watch_tag = etree.SubElement(solver_tag, "watch-point", mesh=mesh_name, name=watch_point["name"],
+                                         coordinate=";".join(str(c) for c in coordinate))
+        if self.export_every is not None:
+            export_tag = etree.SubElement(solver_tag, "export:vtu", {"directory": EXPORT_DIRECTORY,
+                                                                     "every-n-time-windows": str(self.export_every)})
+        pass
+
+
+def configure_profile(settings: dict, sync_mode: str, mode: str):
+    """
+    Chooses the log, export, watch-point and profiling settings of a profile, see the module documentation.
+
+    Args:
+        settings (dict): The profile settings of the topology (name, export-every, watch-points).
+        sync_mode (str): The sync-mode of the topology, on or off.
+        mode (str): The simulation mode of the topology, fundamental or advanced.
+
+    Returns:
+        PS_Profile: The configured profile, None without a profile.
+    """
+    if not settings.get("name"):
+        return None
+    profile = PS_Profile(settings["name"])
+    if profile.name == "debug":
+        profile.log_filter = DEBUG_LOG_FILTER
+        profile.export_every = int(settings.get("export-every", DEFAULT_EXPORT_EVERY))
+        profile.watch_points = list(settings.get("watch-points", []))
+        profile.profiling_mode = PROFILING_MODES.get(mode, "fundamental")
+        profile.synchronize = sync_mode == "on"
+    else:
+        profile.log_filter = PRODUCTION_LOG_FILTER
+    return profile
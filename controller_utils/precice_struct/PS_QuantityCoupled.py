@@ -9,6 +9,8 @@ class QuantityCouple(object):
         self.unit = "None"   # unit of the quantity
         self.BC = -1 # boundary code for the coupling
         self.relative_tolerance = 1E-4 # the relative convergence for coupling
+        self.convergence_measure = "relative" # the convergence measure that fits the physics of the quantity
+        self.absolute_tolerance = 1E-8 # the absolute convergence, in the unit of the quantity
         self.list_of_solvers = {} # list of solvers that use this quantity (either read or write)
         self.source_solver = None # the origin of this quantity the solver how creates it
         self.source_mesh_name = "None" # the source mesh name
@@ -17,6 +19,10 @@ class QuantityCouple(object):
         self.is_consistent = True # True if this quantity is consistent Falso if it is conservative
         pass
 
+    def components(self, dimensionality: int) -> int:
+        """ returns the number of values per vertex on a mesh of the given dimensions """
+        return 1 if self.dim == 1 else dimensionality
+
 
 def get_quantity_object(name:str, bc:str, instance_name:str):
     """ Function to create coupling quantity """
@@ -34,8 +40,13 @@ def get_quantity_object(name:str, bc:str, instance_name:str):
     if name.startswith("HeatTransfer"):
         ret = HeatTransfer()
     if ret == None:
-        # TODO: report error
-        return QuantityCouple()
+        # data without known physics, exchanged as a consistent vector
+        ret = QuantityCouple()
+        ret.name = name
+        ret.mapping_string = "consistent"
+        ret.BC = bc
+        ret.instance_name = instance_name
+        return ret
     else:
         # set the boundary code at the source solver
         ret.BC = bc
@@ -60,6 +71,9 @@ class Displacement(QuantityCouple):
     def __init__(self):
         super().__init__()
         self.name = "Displacement"
+        # starts at or passes through zero, where a relative measure cannot converge
+        self.convergence_measure = "absolute-or-relative"
+        self.absolute_tolerance = 1E-9
         self.unit = "m"
         self.mapping_string = "consistent"
         pass
@@ -70,6 +84,9 @@ class Velocity(QuantityCouple):
     def __init__(self):
         super().__init__()
         self.name = "Velocity"
+        # starts at or passes through zero, where a relative measure cannot converge
+        self.convergence_measure = "absolute-or-relative"
+        self.absolute_tolerance = 1E-9
         self.unit = "m/s"
         self.mapping_string = "consistent"
         pass
@@ -102,6 +119,9 @@ class HeatTransfer(QuantityCouple):
     def __init__(self):
         super().__init__()
         self.name = "HeatTransfer"
+        # starts at or passes through zero, where a relative measure cannot converge
+        self.convergence_measure = "absolute-or-relative"
+        self.absolute_tolerance = 1E-3
         self.unit = "?"
         self.mapping_string = "consistent"
         self.dim = 1
@@ -0,0 +1,102 @@
+"""
+Initialization settings of a mesh that a participant receives from another participant.
+
+During the initialization the received mesh is re-partitioned: every rank of the receiver keeps the vertices
+within the bounding box of its own partition, enlarged by the safety factor. The settings can be given per
+participant in the topology (receive-mesh: geometric-filter, safety-factor, api-access), the missing ones are
+derived from the interface hints:
+
+ - geometric-filter: no-filter if the receiver runs on a single rank or the mesh has at most
+   NO_FILTER_MAX_VERTICES vertices, filtering then costs more than it saves. on-primary-rank if the filter
+   would broadcast more than BROADCAST_MAX_VERTICES vertices to the ranks of the receiver (mesh vertices
+   times ranks), the primary rank then sends every rank only its part. Otherwise the preCICE default
+   (on-secondary-ranks).
+ - safety-factor: MATCHING_SAFETY_FACTOR if the received mesh is mapped with nearest-neighbor only and matches
+   the mesh of the receiver (see PS_Mapping.MATCHING_MESH_RATIO), the partitions of matching meshes cover the
+   same region. Otherwise the preCICE default (0.5).
+ - api-access: only if requested, the adapter then accesses the received mesh directly (e.g. for just-in-time
+   mapping), which the adapter has to support.
+
+Without rank or vertex hints nothing is written and preCICE uses its defaults.
+"""
+from controller_utils.precice_struct.PS_Mapping import MATCHING_MESH_RATIO
+
+# Up to this number of vertices every rank receives the whole mesh
+NO_FILTER_MAX_VERTICES = 1000
+# Beyond this number of broadcast vertices (mesh vertices times ranks) the primary rank filters
+BROADCAST_MAX_VERTICES = 50000000
+# Safety factor of matching meshes, the preCICE default is 0.5
+MATCHING_SAFETY_FACTOR = 0.1
+
+
+class PS_ReceiveMesh(object):
+    """ A mesh received by a participant, with its initialization settings and the reason of the choice """
+    def __init__(self, name: str, provider, receiver):
+        self.name = name
+        self.provider = provider # PS_ParticipantSolver that provides the mesh
+        self.receiver = receiver # PS_ParticipantSolver that receives the mesh
+        self.geometric_filter = None # None for the preCICE default
+        self.safety_factor = None # None for the preCICE default
+        self.api_access = False
+        self.reason = ""
+        pass
+
+    def attributes(self) -> dict:
+        """ attributes of the receive-mesh tag """
+        attr = {"name": self.name, "from___": self.provider.name}
+        if self.geometric_filter is not None:
+            attr["geometric-filter"] = self.geometric_filter
+        if self.safety_factor is not None:
+            attr["safety-factor"] = str(self.safety_factor)
+        if self.api_access:
+            attr["api-access"] = "true"
+        return attr
+
+    def describe(self) -> str:
+        """ one line description of the received mesh, used in the generation rationale """
+        return "{} received by {}: {}".format(self.name, self.receiver.name, self.reason)
+
+
+def configure_receive_mesh(name: str, provider, receiver, mappings: list) -> PS_ReceiveMesh:
+    """
+    Chooses the initialization settings of a received mesh, see the module documentation.
+
+    Args:
+        name (str): Name of the received mesh.
+        provider, receiver (PS_ParticipantSolver): The participants that provide and receive the mesh.
+        mappings (list): The mappings (PS_Mapping) of the receiver from or to the mesh.
+
+    Returns:
+        PS_ReceiveMesh: The configured received mesh.
+    """
+    settings = receiver.receive_mesh_settings
+    receive_mesh = PS_ReceiveMesh(name, provider, receiver)
+    vertices, ranks = provider.vertices, receiver.ranks
+    reasons = []
+
+    receive_mesh.geometric_filter = settings.get("geometric-filter")
+    if receive_mesh.geometric_filter is None:
+        if ranks == 1:
+            receive_mesh.geometric_filter = "no-filter"
+            reasons.append("no-filter, {} runs on a single rank".format(receiver.name))
+        elif vertices is not None and vertices <= NO_FILTER_MAX_VERTICES:
+            receive_mesh.geometric_filter = "no-filter"
+            reasons.append("no-filter for {} vertices".format(vertices))
+        elif vertices is not None and ranks is not None and vertices * ranks > BROADCAST_MAX_VERTICES:
+            receive_mesh.geometric_filter = "on-primary-rank"
+            reasons.append("on-primary-rank, broadcasting {} vertices to {} ranks is too expensive".format(
+                vertices, ranks))
+
+    sizes = (vertices, receiver.vertices)
+    matching = None not in sizes and max(sizes) <= MATCHING_MESH_RATIO * min(sizes)
+    receive_mesh.safety_factor = settings.get("safety-factor")
+    if receive_mesh.safety_factor is None and ranks != 1 and matching and mappings \
+            and all(m.method == "nearest-neighbor" for m in mappings):
+        receive_mesh.safety_factor = MATCHING_SAFETY_FACTOR
+        reasons.append("safety-factor {} for matching meshes".format(MATCHING_SAFETY_FACTOR))
+
+    receive_mesh.api_access = bool(settings.get("api-access", False))
+    if settings:
+        reasons.append("settings of the topology")
+    receive_mesh.reason = ", ".join(reasons) or "preCICE defaults"
+    return receive_mesh
@@ -0,0 +1,102 @@
+"""
+Waveform relaxation of multi-rate participants: substeps and waveform degree of each data flow.
+
+Participants can declare the time step they prefer (time-step-size), exchanges the waveform the receiver needs
+(substeps: true, false or auto, waveform-degree). With time-window-size: auto the time window is the largest
+declared time step, the faster participants then take several time steps per window instead of forcing all
+participants to the smallest step. The receiver samples the data within the window from the waveform of the sender:
+
+ - substeps: with auto, true if the sender takes several time steps per window and the receiver samples the
+   data within the window, i.e. it takes several time steps itself or interpolates with waveform degree
+   HIGHER_DEGREE or more. The values of all time steps of the sender are then exchanged. false if the sender
+   takes a single time step per window, or the receiver only needs the value at the end of the window, only
+   that value is exchanged then. Without the time step hints nothing is written (preCICE default). In steady
+   state false, the single pseudo-time window has no time steps to sample.
+ - waveform-degree: the highest degree requested by the exchanges of the data, written on the data only if
+   requested (the preCICE default is linear). Degrees from HIGHER_DEGREE on need the substeps of the sender.
+   In steady state the degree is dropped, there is nothing to interpolate without substeps.
+
+A time step counts as smaller than the window if it is at least STEP_TOLERANCE relatively smaller.
+"""
+import math
+
+# Waveform degree from which the receiver needs the values of all time steps of the sender
+HIGHER_DEGREE = 2
+# Relative tolerance when comparing a time step to the time window
+STEP_TOLERANCE = 1e-9
+
+
+class PS_Waveform(object):
+    """ Substeps and waveform degree of one data flow, with the reason of the choice """
+    def __init__(self, placement):
+        self.placement = placement # PS_Placement of the data flow
+        self.substeps = None # True / False, None for the preCICE default
+        self.degree = None # waveform degree requested by the exchange, None for the preCICE default
+        self.reason = ""
+        pass
+
+    def describe(self) -> str:
+        """ one line description of the waveform, used in the generation rationale """
+        placement = self.placement
+        return "{} from {} to {}: {}".format(placement.quantity.name, placement.sender.name,
+                                             placement.receiver.name, self.reason)
+
+
+def steps_per_window(solver, window: float):
+    """ returns the number of time steps the solver takes per time window, None without a time step hint """
+    if solver.time_step_size is None or not window:
+        return None
+    return max(1, math.ceil(window / solver.time_step_size * (1.0 - STEP_TOLERANCE)))
+
+
+def configure_waveform(placement, settings: dict, window: float, steady: bool = False) -> PS_Waveform:
+    """
+    Chooses the substeps and the waveform degree of a data flow, see the module documentation.
+
+    Args:
+        placement (PS_Placement): The data flow.
+        settings (dict): The substeps and waveform-degree settings of the exchange in the topology.
+        window (float): The time window size.
+        steady (bool): Whether the coupling is steady state.
+
+    Returns:
+        PS_Waveform: The configured waveform.
+    """
+    waveform = PS_Waveform(placement)
+    waveform.degree = settings.get("waveform-degree")
+    sender_steps = steps_per_window(placement.sender, window)
+    receiver_steps = steps_per_window(placement.receiver, window)
+    higher_degree = waveform.degree is not None and waveform.degree >= HIGHER_DEGREE
+
+    substeps = settings.get("substeps", "auto")
+    if substeps != "auto":
+        waveform.substeps = bool(substeps)
+        waveform.reason = "substeps {} as configured".format("exchanged" if waveform.substeps else "not exchanged")
+    elif steady:
+        waveform.substeps = False
+        waveform.reason = "steady state, only the end of the single window is exchanged"
+        if waveform.degree is not None:
+            waveform.reason += ", the requested waveform degree {} is dropped".format(waveform.degree)
+            waveform.degree = None
+    elif higher_degree:
+        waveform.substeps = True
+        waveform.reason = "substeps exchanged for waveform degree {}".format(waveform.degree)
+    elif sender_steps is None:
+        waveform.reason = "no time step hint of {}, preCICE default".format(placement.sender.name)
+    elif sender_steps == 1:
+        waveform.substeps = False
+        waveform.reason = "{} takes one time step per window, only the end of the window is exchanged".format(
+            placement.sender.name)
+    elif receiver_steps is None:
+        waveform.reason = "no time step hint of {}, preCICE default".format(placement.receiver.name)
+    elif receiver_steps > 1:
+        waveform.substeps = True
+        waveform.reason = "substeps exchanged, {} takes {} and {} takes {} time steps per window".format(
+            placement.sender.name, sender_steps, placement.receiver.name, receiver_steps)
+    else:
+        waveform.substeps = False
+        waveform.reason = "{} only reads at the end of the window, substeps of {} are not exchanged".format(
+            placement.receiver.name, placement.sender.name)
+    if waveform.degree is not None:
+        waveform.reason += ", waveform degree {}".format(waveform.degree)
+    return waveform
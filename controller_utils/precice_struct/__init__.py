@@ -5,4 +5,5 @@ from .PS_ParticipantSolver import SolverNature
 from .PS_QuantityCoupled import QuantityCouple
 from .PS_PreCICEConfig import PS_PreCICEConfig
 from .PS_CouplingScheme import PS_ImplicitCoupling
-from .PS_CouplingScheme import PS_ExplicitCoupling
\ No newline at end of file
+from .PS_CouplingScheme import PS_ExplicitCoupling
+from .PS_Mapping import PS_Mapping
\ No newline at end of file
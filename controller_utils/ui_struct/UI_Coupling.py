@@ -1,4 +1,5 @@
 from controller_utils.myutils.UT_PCErrorLogging import UT_PCErrorLogging
+from controller_utils.ui_struct.UI_Exchange import UI_Exchange
 from enum import Enum
 
 class UI_CouplingType(Enum):
@@ -8,6 +9,14 @@ class UI_CouplingType(Enum):
     f2s = 2
     error_coupling = -1
 
+# The data exchanged by the coupling types of legacy topologies, (from, to, data) between the
+# "fluid" and the "structure" participant of the coupling
+COUPLING_TEMPLATES = {
+    UI_CouplingType.fsi: (("fluid", "structure", "Force"), ("structure", "fluid", "Displacement")),
+    UI_CouplingType.f2s: (("fluid", "structure", "Force"),),
+    UI_CouplingType.cht: (("fluid", "structure", "HeatTransfer"), ("structure", "fluid", "Temperature")),
+}
+
 class UI_Coupling(object):
     """
     This class contains information on the user input level
@@ -20,6 +29,9 @@ class UI_Coupling(object):
         self.partitcipant1 = None
         self.partitcipant2 = None
         self.coupling_type = UI_CouplingType.error_coupling
+        self.exchange_type = None # strong / weak from the exchanges of this pair, None if not given
+        self.one_way = False # all data of this pair flow from one participant to the other
+        self.exchanges = [] # the data exchanges (UI_Exchange) between the two participants
         pass
 
     def init_from_yaml(self, name_coupling: str, etree, participants: dict,
@@ -36,6 +48,7 @@ class UI_Coupling(object):
         elif name_coupling == "f2s":
             # fsi coupling, meaning we have "fluid" and "structure", explicit coupling
             self.coupling_type = UI_CouplingType.f2s
+            self.one_way = True
             pass
         elif name_coupling == "cht":
             # conjugate heat transfer -> there we also have fluid and structure
@@ -78,6 +91,12 @@ class UI_Coupling(object):
 
         except:
             mylog.rep_error("Error in YAML initialization of the Coupling name=" + name_coupling + " data:")
+
+        # the coupling type is a shorthand for the data the fluid and the structure exchange
+        sides = {"fluid": (self.partitcipant1, self.boundaryC1), "structure": (self.partitcipant2, self.boundaryC2)}
+        if self.partitcipant2 is not None:
+            self.exchanges = [UI_Exchange(sides[source][0], sides[target][0], data, sides[source][1], sides[target][1])
+                              for source, target, data in COUPLING_TEMPLATES.get(self.coupling_type, ())]
         pass
 
     def get_first_boundary_code(self, solverName: str):
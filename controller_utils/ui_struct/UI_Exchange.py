@@ -0,0 +1,13 @@
+class UI_Exchange(object):
+    """
+    This class contains information on the user input level regarding
+    one data exchange from one participant to another
+    """
+    def __init__(self, from_participant, to_participant, data: str, from_patch: str = "", to_patch: str = ""):
+        """The constructor."""
+        self.from_participant = from_participant # UI_Participant that writes the data
+        self.to_participant = to_participant # UI_Participant that reads the data
+        self.data = data # name of the exchanged data
+        self.from_patch = from_patch # patch of the writing participant
+        self.to_patch = to_patch # patch of the reading participant
+        pass
@@ -1,6 +1,9 @@
 from controller_utils.myutils.UT_PCErrorLogging import UT_PCErrorLogging
 from controller_utils.ui_struct.UI_Coupling import UI_Coupling
 
+# Geometric filters of a received mesh in preCICE v3
+GEOMETRIC_FILTERS = ("on-primary-rank", "on-secondary-ranks", "no-filter")
+
 class UI_Participant(object):
     """
     This class represents one participant as it is declared on the user input level
@@ -12,6 +15,42 @@ class UI_Participant(object):
         self.solverType = ""
         self.list_of_couplings = [] # list of empty couplings
         self.solver_domain = "" # this shows if this participant is a fluid or structure or else solver
+        # optional interface hints, used to choose the data mappings
+        self.vertices = None # number of interface vertices of the coupling mesh
+        self.connectivity = False # the coupling mesh provides edges / triangles
+        self.dimensionality = None # dimension of the coupling mesh
+        self.ranks = None # number of MPI ranks the solver runs on
+        self.cost_per_window = None # estimated seconds the solver needs for one time window
+        self.time_step_size = None # the time step the solver prefers, it takes several per longer time window
+        self.receive_mesh = {} # initialization settings of the meshes this participant receives
+        pass
+
+    def init_hints_from_yaml(self, etree, mylog: UT_PCErrorLogging):
+        """ Reads the optional hints (vertices, connectivity, dimensionality, ranks, cost-per-window,
+        time-step-size) and the receive-mesh settings of a participant node """
+        try:
+            if etree.get("vertices") is not None:
+                self.vertices = int(etree["vertices"])
+            self.connectivity = bool(etree.get("connectivity", False))
+            if etree.get("dimensionality") is not None:
+                self.dimensionality = int(etree["dimensionality"])
+            if etree.get("ranks") is not None:
+                self.ranks = int(etree["ranks"])
+            if etree.get("cost-per-window") is not None:
+                self.cost_per_window = float(etree["cost-per-window"])
+            if etree.get("time-step-size") is not None:
+                self.time_step_size = float(etree["time-step-size"])
+            self.receive_mesh = dict(etree.get("receive-mesh") or {})
+            if self.receive_mesh.get("geometric-filter", GEOMETRIC_FILTERS[0]) not in GEOMETRIC_FILTERS:
+                mylog.rep_error("Invalid geometric-filter of the Participant {}: {}. Must be one of {}.".format(
+                    self.name, self.receive_mesh.pop("geometric-filter"), ", ".join(GEOMETRIC_FILTERS)))
+        except (TypeError, ValueError):
+            mylog.rep_error("Invalid interface hints of the Participant " + self.name + ".")
+        pass
+
+    def add_patch_vertices(self, vertices: int):
+        """ Adds the vertices of one more interface patch to the coupling mesh """
+        self.vertices = (self.vertices or 0) + int(vertices)
         pass
 
     def init_from_yaml(self, etree, participant_name: str, mylog: UT_PCErrorLogging):
@@ -21,6 +60,7 @@ class UI_Participant(object):
             self.name = participant_name
             self.solverName = etree["solver"]
             self.solverType = etree["solver-type"]
+            self.init_hints_from_yaml(etree, mylog)
         except:
             mylog.rep_error("Error in YAML initialization of the Participant.")
         pass
\ No newline at end of file
@@ -1,5 +1,17 @@
 from controller_utils.myutils.UT_PCErrorLogging import UT_PCErrorLogging
 
+# Acceleration types of implicit coupling, they are the suffix of the preCICE acceleration tag
+ACCELERATION_TYPES = ("IQN-ILS", "IQN-IMVJ", "aitken", "constant")
+# Transports of the m2n and of the intra-participant communication, the suffix of the preCICE tags
+M2N_TYPES = ("sockets", "mpi", "mpi-multiple-ports")
+INTRA_COMM_TYPES = ("sockets", "mpi")
+# Convergence measures of implicit coupling, the prefix of the preCICE convergence-measure tag
+CONVERGENCE_MEASURES = ("relative", "residual-relative", "absolute", "absolute-or-relative")
+# Configuration profiles, see PS_Profile
+PROFILES = ("debug", "production")
+# Relative accuracy of the accuracy levels of legacy topologies
+ACCURACY_LEVELS = {"low": 1E-3, "medium": 1E-4, "high": 1E-5}
+
 class UI_SimulationInfo(object):
     """
     This class contains information on the user input level regarding the
@@ -11,8 +23,14 @@ class UI_SimulationInfo(object):
         self.NrTimeStep = -1
         self.Dt = 1E-3
         self.accuracy = "medium"
-        self.mode = "on"
-        self.sync_mode = "fundamental"
+        self.relative_accuracy = None # relative accuracy of implicit coupling, None for the quantity defaults
+        self.max_iterations = None # maximal sub-iterations of implicit coupling per time window, None for the default
+        self.min_iterations = None # minimal sub-iterations of implicit coupling, None for the preCICE default
+        self.mode = "fundamental"
+        self.sync_mode = "on"
+        self.acceleration = {} # acceleration settings of implicit coupling, empty for the tuned defaults
+        self.communication = {} # m2n and intra-comm settings of the topology and the site config
+        self.profile = {} # name, export-every and watch-points of the configuration profile, empty for none
         pass
 
     def init_from_yaml(self, etree, mylog: UT_PCErrorLogging):
@@ -23,8 +41,10 @@ class UI_SimulationInfo(object):
             self.NrTimeStep = etree["timesteps"]
             self.Dt = etree["time-window-size"]
             self.accuracy = etree["accuracy"]
+            self.relative_accuracy = ACCURACY_LEVELS.get(self.accuracy)
             self.sync_mode = etree.get("synchronize", "on")
             self.mode = etree.get("mode", "fundamental")
+            self.acceleration = etree.get("acceleration") or {}
         except:
             mylog.rep_error("Error in YAML initialization of the Simulator info.")
         pass
\ No newline at end of file
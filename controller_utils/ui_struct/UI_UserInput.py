@@ -1,8 +1,9 @@
-from controller_utils.ui_struct.UI_SimulationInfo import UI_SimulationInfo
+from controller_utils.ui_struct.UI_SimulationInfo import UI_SimulationInfo, ACCELERATION_TYPES, M2N_TYPES, \
+    INTRA_COMM_TYPES, CONVERGENCE_MEASURES, PROFILES
 from controller_utils.ui_struct.UI_Participant import UI_Participant
 from controller_utils.ui_struct.UI_Coupling import UI_Coupling
+from controller_utils.ui_struct.UI_Exchange import UI_Exchange
 from controller_utils.myutils.UT_PCErrorLogging import UT_PCErrorLogging
-from controller_utils.ui_struct.UI_Coupling import UI_CouplingType
 
 
 class UI_UserInput(object):
@@ -19,6 +20,83 @@ class UI_UserInput(object):
         self.sim_info = UI_SimulationInfo()
         self.participants = {} # empty participants stored as a dictionary
         self.couplings = []    # empty coupling list
+        self.exchange_settings = {} # (from, to, data) -> substeps, waveform-degree and convergence of the exchange
+        pass
+
+    def check_communication(self, mylog: UT_PCErrorLogging):
+        """ Checks the transports of the communication settings, invalid ones are reported and dropped """
+        communication = self.sim_info.communication
+        for key, types in (("type", M2N_TYPES), ("intra-comm", INTRA_COMM_TYPES)):
+            if key in communication and communication[key] not in types:
+                mylog.rep_error("Invalid communication {}: {}. Must be one of {}.".format(
+                    key, communication[key], ", ".join(types)))
+                communication.pop(key)
+        pass
+
+    def init_profile(self, profile, mylog: UT_PCErrorLogging):
+        """ Reads the configuration profile, a name or {name, export-every, watch-points}, invalid settings are
+        reported and dropped """
+        profile = {"name": profile} if isinstance(profile, str) else dict(profile or {})
+        if profile.get("name") is not None and profile["name"] not in PROFILES:
+            mylog.rep_error("Invalid profile: {}. Must be one of {}.".format(profile["name"], ", ".join(PROFILES)))
+            profile = {}
+        watch_points = []
+        for watch_point in profile.get("watch-points", []):
+            if watch_point.get("participant") not in self.participants or not watch_point.get("name") \
+                    or not isinstance(watch_point.get("coordinate"), list):
+                mylog.rep_error("Invalid watch-point: {}.".format(watch_point))
+                continue
+            watch_points.append(watch_point)
+        if "watch-points" in profile:
+            profile["watch-points"] = watch_points
+        self.sim_info.profile = profile
+        pass
+
+    def init_exchange_settings(self, exchanges: list, mylog: UT_PCErrorLogging):
+        """ Reads the substeps, waveform-degree and convergence settings of the exchanges, invalid ones are reported
+        and dropped """
+        self.exchange_settings = {}
+        for exchange in exchanges:
+            settings = {key: exchange[key] for key in ("substeps", "waveform-degree") if key in exchange}
+            if exchange.get("convergence"):
+                convergence = dict(exchange["convergence"])
+                if convergence.get("measure", "relative") not in CONVERGENCE_MEASURES:
+                    mylog.rep_error("Invalid convergence measure of the exchange of {}: {}. Must be one of {}.".format(
+                        exchange.get("data"), convergence.pop("measure"), ", ".join(CONVERGENCE_MEASURES)))
+                try:
+                    for key in ("limit", "abs-limit", "rel-limit"):
+                        if key in convergence:
+                            convergence[key] = float(convergence[key])
+                    settings["convergence"] = convergence
+                except (TypeError, ValueError):
+                    mylog.rep_error("Invalid convergence limits of the exchange of {}.".format(exchange.get("data")))
+            if settings.get("substeps", "auto") not in (True, False, "auto"):
+                mylog.rep_error("Invalid substeps of the exchange of {}: {}. Must be true, false or auto.".format(
+                    exchange.get("data"), settings.pop("substeps")))
+            if "waveform-degree" in settings:
+                degree = settings["waveform-degree"]
+                if not isinstance(degree, int) or isinstance(degree, bool) or degree < 0:
+                    mylog.rep_error("Invalid waveform-degree of the exchange of {}: {}.".format(
+                        exchange.get("data"), settings.pop("waveform-degree")))
+                elif degree >= 2 and settings.get("substeps") is False:
+                    # preCICE needs the substeps of the sender for higher waveform degrees
+                    mylog.rep_error("The waveform-degree {} of the exchange of {} needs substeps.".format(
+                        degree, exchange.get("data")))
+                    settings.pop("substeps")
+            if settings:
+                self.exchange_settings[(exchange["from"], exchange["to"], exchange["data"])] = settings
+        pass
+
+    def resolve_time_window_size(self, mylog: UT_PCErrorLogging):
+        """ With time-window-size auto, the time window is the largest time step the participants declare """
+        if self.sim_info.Dt != "auto":
+            return
+        steps = [p.time_step_size for p in self.participants.values() if p.time_step_size is not None]
+        if steps:
+            self.sim_info.Dt = max(steps)
+        else:
+            mylog.rep_error("time-window-size auto needs the time-step-size of at least one participant.")
+            self.sim_info.Dt = 1E-3
         pass
 
     def init_from_yaml(self, etree, mylog: UT_PCErrorLogging):
@@ -28,43 +106,59 @@ class UI_UserInput(object):
             simulation_info = etree["coupling-scheme"]
             self.sim_info.sync_mode = simulation_info.get("sync-mode", "on")
             self.sim_info.mode = simulation_info.get("mode", "fundamental")
-            self.sim_info.steady = False
+            self.sim_info.steady = bool(simulation_info.get("steady-state", False))
             self.sim_info.NrTimeStep = simulation_info.get("max-time", 1e-3)
             self.sim_info.Dt = simulation_info.get("time-window-size", 1e-3)
             self.sim_info.accuracy = "medium"
+            if simulation_info.get("relative-accuracy") is not None:
+                self.sim_info.relative_accuracy = float(simulation_info["relative-accuracy"])
+            if simulation_info.get("max-iterations") is not None:
+                self.sim_info.max_iterations = int(simulation_info["max-iterations"])
+            if simulation_info.get("min-iterations") is not None:
+                self.sim_info.min_iterations = int(simulation_info["min-iterations"])
+            self.sim_info.acceleration = simulation_info.get("acceleration") or {}
+            if self.sim_info.acceleration.get("type", "IQN-ILS") not in ACCELERATION_TYPES:
+                mylog.rep_error("Invalid acceleration type: {}. Must be one of {}.".format(
+                    self.sim_info.acceleration["type"], ", ".join(ACCELERATION_TYPES)))
+                self.sim_info.acceleration = {}
+            self.sim_info.communication = dict(etree.get("communication") or {})
+            self.check_communication(mylog)
+
+            for exchange in etree["exchanges"]:
+                if exchange.get("type") not in (None, "strong", "weak"):
+                    mylog.rep_error(f"Invalid exchange type: {exchange['type']}. Must be 'strong' or 'weak'.")
 
-            # Initialize coupling type to None
-            self.coupling_type = None
-            
-            # Extract coupling type from exchanges
-            if 'exchanges' in etree:
-                exchanges = etree['exchanges']
-                exchange_types = [exchange.get('type') for exchange in exchanges if 'type' in exchange]
-                
-                # Validate exchange types
-                if exchange_types:
-                    # If all types are the same, set that as the coupling type
-                    if len(set(exchange_types)) == 1:
-                        if exchange_types[0] == 'strong' or exchange_types[0] == 'weak':
-                            self.coupling_type = exchange_types[0]
-                        else:
-                            mylog.rep_error(f"Invalid exchange type: {exchange_types[0]}. Must be 'strong' or 'weak'.")
-                            self.coupling_type = None
-                    else:
-                        # Mixed types, default to weak
-                        #mylog.rep_error("Mixed exchange types detected. Defaulting to 'weak'.")
-                        self.coupling_type = 'weak'
-            
             # --- Parse participants ---
             self.participants = {}
             participants_data = etree["participants"]
             for participant_name, solver_info in participants_data.items():
                 new_participant = UI_Participant()
                 new_participant.name = participant_name
-                new_participant.solverName = solver_info
+                if isinstance(solver_info, dict):
+                    # participant with hints, e.g. {solver: SU2, ranks: 64, vertices: 20000, connectivity: true}
+                    new_participant.solverName = solver_info.get("solver", "")
+                    new_participant.init_hints_from_yaml(solver_info, mylog)
+                else:
+                    new_participant.solverName = solver_info
                 new_participant.solverType = ""  # Placeholder; adjust if solver-type info available
                 new_participant.list_of_couplings = []
                 self.participants[participant_name] = new_participant
+            self.resolve_time_window_size(mylog)
+            self.init_exchange_settings(etree["exchanges"], mylog)
+            self.init_profile(etree.get("profile"), mylog)
+
+            # --- Interface sizes given per exchanged patch ---
+            # the coupling mesh of a participant holds all its patches, a size given for the
+            # participant itself takes precedence over the sum of its patches
+            sized_participants = {name for name, p in self.participants.items() if p.vertices is not None}
+            patch_vertices = {}
+            for exchange in etree["exchanges"]:
+                for side in ("from", "to"):
+                    if exchange.get(side + "-vertices") is not None:
+                        patch_vertices[(exchange[side], exchange.get(side + "-patch"))] = exchange[side + "-vertices"]
+            for (participant_name, patch), vertices in patch_vertices.items():
+                if participant_name in self.participants and participant_name not in sized_participants:
+                    self.participants[participant_name].add_patch_vertices(vertices)
 
             # --- Parse couplings from exchanges ---
             exchanges_list = etree["exchanges"]
@@ -81,21 +175,18 @@ class UI_UserInput(object):
                 coupling.partitcipant1 = self.participants[p1_name]
                 coupling.partitcipant2 = self.participants[p2_name]
 
-                # Determine coupling type based on exchanged data
-                data_names = {ex["data"] for ex in ex_list}
-                if "Force" in data_names and "Displacement" in data_names:
-                    coupling.coupling_type = UI_CouplingType.fsi
-                elif "Force" in data_names:
-                    coupling.coupling_type = UI_CouplingType.f2s
-                elif "Temperature" in data_names:
-                    coupling.coupling_type = UI_CouplingType.cht
-                else:
-                    coupling.coupling_type = UI_CouplingType.error_coupling
+                # the data of the pair, exactly as declared
+                coupling.exchanges = [UI_Exchange(self.participants[ex["from"]], self.participants[ex["to"]],
+                                                  ex["data"], ex.get("from-patch", ""), ex.get("to-patch", ""))
+                                      for ex in ex_list]
 
-                # Use the first exchange's patches as boundary interfaces (simple heuristic)
-                first_ex = ex_list[0]
-                coupling.boundaryC1 = first_ex.get("from-patch", "")
-                coupling.boundaryC2 = first_ex.get("to-patch", "")
+                # the pair is coupled strongly only if all of its exchanges are strong
+                pair_types = {ex.get("type") for ex in ex_list}
+                if pair_types == {"strong"}:
+                    coupling.exchange_type = "strong"
+                elif pair_types <= {"strong", "weak"}:
+                    coupling.exchange_type = "weak"
+                coupling.one_way = len({ex["from"] for ex in ex_list}) == 1
 
                 self.couplings.append(coupling)
                 coupling.partitcipant1.list_of_couplings.append(coupling)
@@ -110,6 +201,8 @@ class UI_UserInput(object):
                 self.sim_info.sync_mode = sync_mode
                 self.sim_info.mode = mode
                 self.sim_info.init_from_yaml(simulation_info, mylog)
+                self.sim_info.communication = dict(etree.get("communication") or {})
+                self.check_communication(mylog)
 
                 # Parse participants from the old structure
                 participants_list = etree["participants"]
@@ -118,6 +211,8 @@ class UI_UserInput(object):
                     new_participant = UI_Participant()
                     new_participant.init_from_yaml(participant_data, participant_name, mylog)
                     self.participants[participant_name] = new_participant
+                self.resolve_time_window_size(mylog)
+                self.init_profile(etree.get("profile"), mylog)
 
                 # Parse couplings from the old structure
                 couplings_list = etree["couplings"]
@@ -1,9 +1,160 @@
 from pathlib import Path
 from generation_utils.Logger import Logger
+from generation_utils.TopologyLoader import TopologyLoader
 from lxml import etree
+import argparse
+import copy
 import json
+import os
+import sys
 import yaml
 
+ADAPTER_CONFIG_TEMPLATE_PATH = Path(__file__).parent.parent / "templates" / "adapter-config-template.json"
+
+
+class AdapterConfigIndex:
+    def __init__(self, precice_config_path: Path, topology: dict = None, template: dict = None) -> None:
+        """
+        Index of a precice-config.xml for the adapter configs of all participants.
+        The XML is parsed once and indexed as participant -> mesh -> read/write data, the patches
+        of the interfaces are taken from the exchanges of the topology.
+
+        Args:
+            precice_config_path (Path): Path to the precice-config.xml file.
+            topology (dict): The loaded topology, without it the interfaces have no patches.
+            template (dict): The adapter-config template, loaded from the templates directory if None.
+        """
+        self.logger = Logger()
+        self.template = template if template is not None else self._load_template()
+        self.participants = {}  # participant -> mesh -> {"read": [data], "write": [data]}
+        self.patches = {}       # (participant, data, "read"/"write") -> [patch]
+        self.participant_patches = {}  # participant -> [patch], used if the data names do not match
+        self.direct_access = {}  # participant -> [received mesh with api-access], accessed by the adapter directly
+        # steady state: the adapters run their solvers to a steady solution within the single time window
+        topology = topology or {}
+        scheme = topology.get("coupling-scheme") or topology.get("simulation") or {}
+        self.steady_state = bool(scheme.get("steady-state", False))
+
+        parser = etree.XMLParser(ns_clean=True, recover=True, remove_blank_text=True)
+        root = etree.parse(str(precice_config_path), parser).getroot()
+        if root is None:
+            raise ValueError(f"Could not parse {precice_config_path}")
+        for participant in root:
+            if participant.tag == "participant":
+                self._index_participant(participant)
+        for exchange in topology.get("exchanges", []) or []:
+            self._index_exchange(exchange)
+
+    @staticmethod
+    def _load_template() -> dict:
+        with open(ADAPTER_CONFIG_TEMPLATE_PATH, 'r', encoding='utf-8') as template_file:
+            return json.load(template_file)
+
+    def _index_participant(self, participant) -> None:
+        meshes = self.participants.setdefault(participant.get("name"), {})
+        for child in participant:
+            if child.tag in ("provide-mesh", "receive-mesh"):
+                if child.tag == "provide-mesh" or child.get("api-access") == "true":
+                    meshes.setdefault(child.get("name"), {"read": [], "write": []})
+                if child.get("api-access") == "true":
+                    self.direct_access.setdefault(participant.get("name"), []).append(child.get("name"))
+            elif child.tag in ("read-data", "write-data"):
+                direction = "read" if child.tag == "read-data" else "write"
+                data = meshes.setdefault(child.get("mesh"), {"read": [], "write": []})[direction]
+                if child.get("name") not in data:
+                    data.append(child.get("name"))
+
+    def _index_exchange(self, exchange: dict) -> None:
+        for participant, patch, direction in ((exchange.get("to"), exchange.get("to-patch"), "read"),
+                                              (exchange.get("from"), exchange.get("from-patch"), "write")):
+            if patch is None:
+                continue
+            patches = self.patches.setdefault((participant, exchange.get("data"), direction), [])
+            if patch not in patches:
+                patches.append(patch)
+            participant_patches = self.participant_patches.setdefault(participant, [])
+            if patch not in participant_patches:
+                participant_patches.append(patch)
+
+    def _interface_patches(self, participant: str, data: dict) -> list:
+        """Patches of one interface: the patches of the exchanges of its data, in order of appearance."""
+        patches = []
+        for direction in ("read", "write"):
+            for name in data[direction]:
+                for patch in self.patches.get((participant, name, direction), []):
+                    if patch not in patches:
+                        patches.append(patch)
+        return patches or list(self.participant_patches.get(participant, []))
+
+    def adapter_config(self, participant: str, precice_config_file_name: str = None) -> dict:
+        """
+        Builds the adapter config of a participant, with one interface per mesh that carries data.
+
+        Args:
+            participant (str): Name of the participant.
+            precice_config_file_name (str): Path of the precice-config.xml relative to the adapter config,
+                the default of the template is used if None.
+
+        Returns:
+            dict: The adapter config or None if the participant does not exist.
+        """
+        meshes = self.participants.get(participant)
+        if meshes is None:
+            self.logger.error(f"Participant '{participant}' not found in precice-config.xml.")
+            return None
+
+        adapter_config = copy.deepcopy(self.template)
+        adapter_config["participant_name"] = participant
+        if precice_config_file_name is not None:
+            adapter_config["precice_config_file_name"] = precice_config_file_name
+        interface_template = adapter_config["interfaces"][0]
+
+        if not any(data["read"] for data in meshes.values()):
+            self.logger.warning(f"Participant '{participant}' is missing a 'read-data' element.")
+        if not any(data["write"] for data in meshes.values()):
+            self.logger.warning(f"Participant '{participant}' is missing a 'write-data' element.")
+
+        # one interface per mesh with data, a participant without data gets an interface on its first mesh,
+        # received meshes with api-access are accessed by the adapter directly (e.g. for just-in-time mapping)
+        direct_access = self.direct_access.get(participant, [])
+        with_data = [mesh for mesh, data in meshes.items() if data["read"] or data["write"] or mesh in direct_access]
+        interfaces = []
+        for mesh in with_data or list(meshes)[:1]:
+            data = meshes[mesh]
+            interface = copy.deepcopy(interface_template)
+            interface["mesh_name"] = mesh
+            interface["patches"] = self._interface_patches(participant, data)
+            if mesh in direct_access:
+                interface["direct_access"] = True
+            interface["write_data_names"] = list(data["write"])
+            interface["read_data_names"] = list(data["read"])
+            # Remove keys if their lists are empty
+            if not interface["write_data_names"]:
+                interface.pop("write_data_names")
+            if not interface["read_data_names"]:
+                interface.pop("read_data_names")
+            interfaces.append(interface)
+        adapter_config["interfaces"] = interfaces or [interface_template]
+        if self.steady_state:
+            adapter_config["steady_state"] = True
+        return adapter_config
+
+    def write(self, participant: str, adapter_config_path: Path, precice_config_file_name: str = None) -> bool:
+        """
+        Writes the adapter config of a participant.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        adapter_config = self.adapter_config(participant, precice_config_file_name)
+        if adapter_config is None:
+            return False
+        with open(adapter_config_path, 'w', encoding='utf-8') as adapter_config_file:
+            json.dump(adapter_config, adapter_config_file, indent=4)
+        self.logger.success(f"Adapter configuration written to {adapter_config_path}")
+        return True
+
+
 class AdapterConfigGenerator:
     def __init__(self, adapter_config_path: Path, precice_config_path: Path, topology_path: Path, target_participant: str) -> None:
         """
@@ -16,7 +167,7 @@ class AdapterConfigGenerator:
             target_participant (str): Name of the target participant.
         """
         self.adapter_config_path = adapter_config_path
-        self.adapter_config_schema_path = Path(__file__).parent.parent / "templates" / "adapter-config-template.json"
+        self.adapter_config_schema_path = ADAPTER_CONFIG_TEMPLATE_PATH
         self.logger = Logger()
         self.precice_config_path = precice_config_path
         self.topology_path = topology_path
@@ -45,135 +196,35 @@ class AdapterConfigGenerator:
             self.logger.error(f"Error decoding JSON from the adapter-config template: {jsonDecodeError}")
             raise
 
-    def _get_generated_precice_config(self):
+    def _fill_out_adapter_schema(self):
         """
-        Parses the precice-config.xml file, removes namespaces, and stores the root element.
+        Fills out the adapter configuration schema based on the precice-config.xml and topology data.
         """
-        try:
-            with open(self.precice_config_path, 'r', encoding='utf-8') as precice_config_file:
-                precice_config = precice_config_file.read()
-        except FileNotFoundError:
-            self.logger.error(f"PreCICE config file not found at {self.precice_config_path}")
-            raise
-
-        # Parse with lxml and clean namespaces
-        parser = etree.XMLParser(ns_clean=True, recover=True)
-        try:
-            doc = etree.fromstring(precice_config.encode('utf-8'), parser=parser)
-        except etree.XMLSyntaxError as e:
-            self.logger.error(f"Error parsing XML: {e}")
-            raise
-
-        # Strip namespace prefixes from tags
-        for elem in doc.iter():
-            if isinstance(elem.tag, str) and '}' in elem.tag:
-                elem.tag = elem.tag.split('}', 1)[1]
-
-        self.root = doc
-        self.logger.info("Parsed precice-config.xml successfully.")
+        topology = self._load_topology()
+        index = AdapterConfigIndex(self.precice_config_path, topology, template=self.adapter_config_schema)
+        adapter_config = index.adapter_config(self.target_participant)
+        if adapter_config is None:
+            return
+        self.adapter_config_schema = adapter_config
+        self.logger.info("Adapter configuration schema filled out successfully.")
 
     def _load_topology(self):
         """
-        Loads the topology YAML file and extracts patch information for the target participant.
+        Loads the topology YAML file, the exchanges provide the patches of the interfaces.
 
         Returns:
-            dict: Patch information for the target participant.
+            dict: The topology or None if it can not be loaded.
         """
         try:
-            with open(self.topology_path, 'r', encoding='utf-8') as topology_file:
-                topology = yaml.safe_load(topology_file)
-            
-            # Find the exchange for the target participant
-            for exchange in topology.get('exchanges', []):
-                if exchange.get('to') == self.target_participant:
-                    return {
-                        'from_participant': exchange.get('from'),
-                        'from_patch': exchange.get('from-patch'),
-                        'to_patch': exchange.get('to-patch')
-                    }
-            
-            self.logger.warning(f"No exchange found for participant {self.target_participant}")
-            return None
-        
+            # the topology was validated by the generator already, here we only need the resolved exchanges
+            return TopologyLoader().load(self.topology_path, validate=False)
         except FileNotFoundError:
             self.logger.error(f"Topology file not found at {self.topology_path}")
             return None
-        except yaml.YAMLError as e:
+        except (yaml.YAMLError, ValueError) as e:
             self.logger.error(f"Error parsing topology YAML: {e}")
             return None
 
-    def _fill_out_adapter_schema(self):
-        """
-        Fills out the adapter configuration schema based on the precice-config.xml and topology data.
-        """
-        self._get_generated_precice_config()
-
-        # Load topology information
-        topology_info = self._load_topology()
-
-        participant_elem = None
-        for participant in self.root.findall(".//participant"):
-            if participant.get("name") == self.target_participant:
-                participant_elem = participant
-                break
-
-        if participant_elem is None:
-            self.logger.error(f"Participant '{self.target_participant}' not found in precice-config.xml.")
-            return
-
-        # Attempt to find read-data and write-data elements
-        read_data_elem = participant_elem.find("read-data")
-        write_data_elem = participant_elem.find("write-data")
-
-        # Log warnings if certain elements are missing
-        if read_data_elem is None:
-            self.logger.warning(f"Participant '{self.target_participant}' is missing a 'read-data' element.")
-        if write_data_elem is None:
-            self.logger.warning(f"Participant '{self.target_participant}' is missing a 'write-data' element.")
-
-        # Update the adapter_config_schema dictionary according to the new template
-        self.adapter_config_schema["participant_name"] = self.target_participant
-
-        # Access the first interface in the interfaces list
-        interface_dict = self.adapter_config_schema["interfaces"][0]
-
-        # Initialize write_data_names and read_data_names lists
-        interface_dict["write_data_names"] = []
-        interface_dict["read_data_names"] = []
-
-        # If read_data_elem exists, set mesh_name and read_data_names
-        if read_data_elem is not None:
-            interface_dict["mesh_name"] = read_data_elem.get("mesh")
-            read_data_name = read_data_elem.get("name")
-            if read_data_name:
-                interface_dict["read_data_names"].append(read_data_name)
-
-        # If write_data_elem exists, set write_data_names
-        if write_data_elem is not None:
-            write_data_name = write_data_elem.get("name")
-            if write_data_name:
-                interface_dict["write_data_names"].append(write_data_name)
-
-        # Add patch information from topology if available
-        if topology_info:
-            # Use the to-patch value from topology
-            interface_dict["patches"] = [topology_info.get('to_patch')]
-            
-            # Remove previously added keys
-            interface_dict.pop("from_participant", None)
-            interface_dict.pop("from_patch", None)
-            interface_dict.pop("patch_name", None)  # Remove patch_name if it was added previously
-
-        # Remove keys if their lists are empty
-        if not interface_dict["write_data_names"]:
-            interface_dict.pop("write_data_names")
-        if not interface_dict["read_data_names"]:
-            interface_dict.pop("read_data_names")
-
-        self.logger.info("Adapter configuration schema filled out successfully.")
-
-
-        
     def write_to_file(self) -> None:
         """
         Writes the filled adapter configuration schema to the specified JSON file.
@@ -187,3 +238,38 @@ class AdapterConfigGenerator:
         except IOError as e:
             self.logger.error(f"Failed to write adapter configuration to file: {e}")
             raise
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="precice-genesis adapter-configs",
+                                     description="Writes the adapter-config.json of every participant of a precice-config.xml.")
+    parser.add_argument("precice_config", type=Path, help="The precice-config.xml file.")
+    parser.add_argument("-t", "--topology", type=Path, default=None,
+                        help="Topology the config was generated from, its exchanges provide the patches.")
+    parser.add_argument("-o", "--output-dir", type=Path, default=None,
+                        help="Directory for the <participant>/adapter-config.json files (default: next to the config).")
+    parser.add_argument("--participant", action="append", default=[],
+                        help="Only write the config of this participant, can be given more than once.")
+    args = parser.parse_args(argv)
+
+    logger = Logger()
+    try:
+        topology = TopologyLoader().load(args.topology, validate=False) if args.topology else None
+        index = AdapterConfigIndex(args.precice_config, topology)
+    except (OSError, ValueError, yaml.YAMLError, etree.XMLSyntaxError) as e:
+        logger.error(f"Could not read the input files: {e}")
+        return 2
+
+    output_dir = args.output_dir or args.precice_config.parent
+    written = 0
+    for participant in args.participant or list(index.participants):
+        participant_dir = output_dir / participant
+        participant_dir.mkdir(parents=True, exist_ok=True)
+        relative_config = os.path.relpath(args.precice_config.resolve(), participant_dir.resolve())
+        written += index.write(participant, participant_dir / "adapter-config.json", relative_config)
+    requested = len(args.participant or index.participants)
+    return 0 if written == requested else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
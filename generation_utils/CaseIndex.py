@@ -0,0 +1,244 @@
+from pathlib import Path
+from generation_utils.Logger import Logger
+from generation_utils.file_batch import file_digest
+from lxml import etree
+from datetime import datetime
+from importlib import metadata
+import argparse
+import json
+import re
+import sqlite3
+import sys
+
+# Default location of the case index, relative to the current working directory
+DEFAULT_INDEX_DB = Path("precice-genesis-index.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    case_path TEXT PRIMARY KEY,
+    topology_path TEXT,
+    topology_hash TEXT,
+    generator_version TEXT,
+    generated_at TEXT,
+    generation_seconds REAL,
+    timings TEXT
+);
+CREATE TABLE IF NOT EXISTS participants (
+    case_path TEXT NOT NULL REFERENCES cases(case_path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    solver TEXT COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS exchanges (
+    case_path TEXT NOT NULL REFERENCES cases(case_path) ON DELETE CASCADE,
+    from_participant TEXT,
+    to_participant TEXT,
+    data TEXT,
+    type TEXT
+);
+CREATE TABLE IF NOT EXISTS coupling_schemes (
+    case_path TEXT NOT NULL REFERENCES cases(case_path) ON DELETE CASCADE,
+    scheme TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    case_path TEXT NOT NULL REFERENCES cases(case_path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cases_version ON cases(generator_version);
+CREATE INDEX IF NOT EXISTS idx_cases_seconds ON cases(generation_seconds);
+CREATE INDEX IF NOT EXISTS idx_participants_solver ON participants(solver, case_path);
+CREATE INDEX IF NOT EXISTS idx_participants_case ON participants(case_path);
+CREATE INDEX IF NOT EXISTS idx_exchanges_data ON exchanges(data, case_path);
+CREATE INDEX IF NOT EXISTS idx_exchanges_case ON exchanges(case_path);
+CREATE INDEX IF NOT EXISTS idx_schemes_scheme ON coupling_schemes(scheme, case_path);
+CREATE INDEX IF NOT EXISTS idx_schemes_case ON coupling_schemes(case_path);
+CREATE INDEX IF NOT EXISTS idx_artifacts_case ON artifacts(case_path);
+"""
+
+
+def generator_version() -> str:
+    """
+    Returns the version of the generator, either from the installed package metadata or from pyproject.toml.
+    """
+    try:
+        return metadata.version("PreCICE-Genesis")
+    except metadata.PackageNotFoundError:
+        pass
+    pyproject = Path(__file__).parent.parent / "pyproject.toml"
+    try:
+        match = re.search(r'^version\s*=\s*"([^"]+)"', pyproject.read_text(encoding="utf-8"), re.MULTILINE)
+        if match:
+            return match.group(1)
+    except OSError:
+        pass
+    return "unknown"
+
+
+def coupling_schemes_of(precice_config_path: Path) -> list[str]:
+    """
+    Returns the coupling scheme types (e.g. parallel-implicit) of a precice-config.xml without building the tree.
+    """
+    schemes = []
+    for _, element in etree.iterparse(str(precice_config_path), events=("start",), recover=True):
+        if isinstance(element.tag, str) and element.tag.startswith("coupling-scheme:"):
+            schemes.append(element.tag.split(":", 1)[1])
+    return schemes
+
+
+class CaseIndex:
+    def __init__(self, db_path: Path = DEFAULT_INDEX_DB) -> None:
+        """
+        SQLite index over a library of generated cases, one row per case.
+
+        Args:
+            db_path (Path): Path to the SQLite database, it is created if it does not exist.
+        """
+        self.db_path = Path(db_path)
+        self.logger = Logger()
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def upsert_case(self, case_path: Path, topology_path: Path, participants: dict, exchanges: list[dict],
+                    timings: dict = None, version: str = None) -> None:
+        """
+        Inserts or replaces the row of one generated case.
+
+        Args:
+            case_path (Path): The generated case folder (the _generated/ folder).
+            topology_path (Path): The topology the case was generated from.
+            participants (dict): Participant name -> solver name.
+            exchanges (list[dict]): Exchanges with the keys from, to, data and type.
+            timings (dict): Generation stage -> seconds. Nested stages (parent/stage) are part of their parent
+                and do not count again for the generation time.
+            version (str): Generator version, defaults to the version of this generator.
+        """
+        case_path = Path(case_path).resolve()
+        case_key = str(case_path)
+        timings = timings or {}
+        generation_seconds = sum(seconds for stage, seconds in timings.items() if "/" not in stage)
+        precice_config = case_path / "precice-config.xml"
+        schemes = coupling_schemes_of(precice_config) if precice_config.exists() else []
+        artifacts = [(str(path.relative_to(case_path)), file_digest(path))
+                     for path in sorted(case_path.rglob("*")) if path.is_file()]
+        topology_hash = file_digest(topology_path) if Path(topology_path).exists() else None
+
+        with self.connection:
+            # the cascade removes the participants, exchanges, ... of a previous generation of this case
+            self.connection.execute("DELETE FROM cases WHERE case_path = ?", (case_key,))
+            self.connection.execute(
+                "INSERT INTO cases VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (case_key, str(Path(topology_path).resolve()), topology_hash, version or generator_version(),
+                 datetime.now().isoformat(timespec="seconds"), generation_seconds, json.dumps(timings)))
+            self.connection.executemany(
+                "INSERT INTO participants VALUES (?, ?, ?)",
+                [(case_key, name, solver) for name, solver in participants.items()])
+            self.connection.executemany(
+                "INSERT INTO exchanges VALUES (?, ?, ?, ?, ?)",
+                [(case_key, ex.get("from"), ex.get("to"), ex.get("data"), ex.get("type")) for ex in exchanges])
+            self.connection.executemany(
+                "INSERT INTO coupling_schemes VALUES (?, ?)", [(case_key, scheme) for scheme in schemes])
+            self.connection.executemany(
+                "INSERT INTO artifacts VALUES (?, ?, ?)", [(case_key, name, sha) for name, sha in artifacts])
+
+    def query(self, solvers: list[str] = (), scheme: str = None, data: str = None, version: str = None,
+              slowest: int = None) -> list[dict]:
+        """
+        Returns the cases that match all given filters.
+
+        Args:
+            solvers (list[str]): Solvers that must all take part in the case (case insensitive).
+            scheme (str): Coupling scheme type, e.g. parallel-implicit.
+            data (str): Name of data that must be exchanged.
+            version (str): Generator version.
+            slowest (int): If set, only the given number of cases with the longest generation time.
+
+        Returns:
+            list[dict]: One dictionary per case.
+        """
+        conditions = []
+        parameters = []
+        for solver in solvers:
+            conditions.append("c.case_path IN (SELECT case_path FROM participants WHERE solver = ?)")
+            parameters.append(solver)
+        if scheme:
+            conditions.append("c.case_path IN (SELECT case_path FROM coupling_schemes WHERE scheme = ?)")
+            parameters.append(scheme)
+        if data:
+            conditions.append("c.case_path IN (SELECT case_path FROM exchanges WHERE data = ?)")
+            parameters.append(data)
+        if version:
+            conditions.append("c.generator_version = ?")
+            parameters.append(version)
+
+        sql = "SELECT c.case_path, c.generator_version, c.generation_seconds, c.generated_at FROM cases c"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if slowest:
+            sql += " ORDER BY c.generation_seconds DESC LIMIT ?"
+            parameters.append(slowest)
+        else:
+            sql += " ORDER BY c.case_path"
+
+        results = []
+        for case_path, case_version, seconds, generated_at in self.connection.execute(sql, parameters).fetchall():
+            participants = self.connection.execute(
+                "SELECT name, solver FROM participants WHERE case_path = ? ORDER BY name", (case_path,)).fetchall()
+            schemes = self.connection.execute(
+                "SELECT scheme FROM coupling_schemes WHERE case_path = ?", (case_path,)).fetchall()
+            results.append({
+                "case": case_path,
+                "participants": {name: solver for name, solver in participants},
+                "coupling_schemes": [row[0] for row in schemes],
+                "generator_version": case_version,
+                "generation_seconds": seconds,
+                "generated_at": generated_at,
+            })
+        return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="precice-genesis query",
+                                     description="Queries the SQLite index of generated cases.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_INDEX_DB, help="Path to the case index database.")
+    parser.add_argument("--solver", action="append", default=[],
+                        help="Solver that takes part in the case, can be given more than once.")
+    parser.add_argument("--scheme", help="Coupling scheme type, e.g. parallel-implicit.")
+    parser.add_argument("--data", help="Name of exchanged data, e.g. Force.")
+    parser.add_argument("--generator-version", help="Version of the generator that produced the case.")
+    parser.add_argument("--slowest", type=int, help="Only show the N cases that took longest to generate.")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON.")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        Logger().warning(f"Case index {args.db} does not exist yet, generate cases with --index-db first.")
+        return 1
+
+    with CaseIndex(args.db) as index:
+        results = index.query(solvers=args.solver, scheme=args.scheme, data=args.data,
+                              version=args.generator_version, slowest=args.slowest)
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return 0
+    for result in results:
+        participants = ", ".join(f"{name} ({solver})" for name, solver in result["participants"].items())
+        print(f"{result['case']}\n    participants: {participants}\n"
+              f"    coupling: {', '.join(result['coupling_schemes'])}\n"
+              f"    generator: {result['generator_version']}, {result['generation_seconds']:.3f}s")
+    print(f"{len(results)} case(s) found.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
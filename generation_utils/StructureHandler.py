@@ -34,9 +34,10 @@ class StructureHandler:
             self.generated_root / "clean.sh",
             self.generated_root / "README.md",
             self.generated_root / "precice-config.xml",
+            self.generated_root / "placement.md",
         ]
 
-        self.clean, self.README, self.precice_config = files
+        self.clean, self.README, self.precice_config, self.placement = files
 
         for file in files:
             try:
@@ -0,0 +1,279 @@
+from pathlib import Path
+from generation_utils.Logger import Logger
+import copy
+import hashlib
+import json
+import jsonschema
+import os
+import tempfile
+import yaml
+
+# Use the libyaml based loader if PyYAML was built against libyaml. Both loaders
+# implement the same safe schema, the C version is just considerably faster.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Environment variable that enables the on-disk topology cache without a CLI flag
+CACHE_DIR_ENV = "PRECICE_GENESIS_CACHE_DIR"
+
+# Environment variable with the path of the site config, the defaults of a cluster for all of its cases
+SITE_CONFIG_ENV = "PRECICE_GENESIS_SITE_CONFIG"
+# Sections of a topology that the site config provides defaults for
+SITE_CONFIG_KEYS = ("communication",)
+
+TOPOLOGY_SCHEMA_PATH = Path(__file__).parent.parent / "schemas" / "topology-schema.json"
+
+# Keys of a topology file that pull in shared fragments, they are removed during resolution
+EXTENDS_KEY = "extends"
+INCLUDE_KEY = "include"
+
+
+def deep_merge(base: dict, override: dict) -> dict:
+    """
+    Merges two topology mappings without modifying them.
+    Nested mappings are merged recursively, every other value (including lists) of the override replaces the base value.
+
+    Args:
+        base (dict): The mapping that is extended.
+        override (dict): The mapping whose values take precedence.
+
+    Returns:
+        dict: The merged mapping.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_yaml(content):
+    """
+    Parses YAML content with the fastest available safe loader.
+
+    Args:
+        content (str | bytes | IO): The YAML document or an open stream.
+
+    Returns:
+        The parsed YAML document.
+    """
+    return yaml.load(content, Loader=YAML_LOADER)
+
+
+class TopologyLoader:
+    # Bump this if the normalized representation changes, old cache entries are ignored then
+    CACHE_FORMAT_VERSION = 1
+
+    # Parsed files shared by all loaders of the process: resolved path -> (content hash, topology).
+    # A batch of topologies that include the same fragment parses that fragment only once.
+    _fragment_cache = {}
+    _schema = None
+
+    def __init__(self, cache_dir: Path = None, site_config: Path = None) -> None:
+        """
+        Loads topology.yaml files, optionally through an on-disk cache of parsed topologies.
+
+        Args:
+            cache_dir (Path): Directory for the parsed topology cache. If None, the
+                PRECICE_GENESIS_CACHE_DIR environment variable is used, if that is not
+                set either the cache is disabled.
+            site_config (Path): YAML file with the site defaults of the SITE_CONFIG_KEYS sections. If None,
+                the PRECICE_GENESIS_SITE_CONFIG environment variable is used, if that is not set either
+                there are no site defaults.
+        """
+        self.logger = Logger()
+        if cache_dir is None and os.environ.get(CACHE_DIR_ENV):
+            cache_dir = Path(os.environ[CACHE_DIR_ENV])
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if site_config is None and os.environ.get(SITE_CONFIG_ENV):
+            site_config = Path(os.environ[SITE_CONFIG_ENV])
+        self.site_config = Path(site_config).resolve() if site_config is not None else None
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Returns the hash which is used as the cache key for the given file content."""
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def normalize(topology) -> dict:
+        """
+        Brings a parsed topology into the form that is stored in the cache.
+        The JSON round trip guarantees that a cached and a freshly parsed topology are identical.
+
+        Raises:
+            ValueError: If the document is not a mapping.
+            TypeError: If the document contains values that have no JSON representation, or keys that are not
+                strings (e.g. numeric participant names), which JSON would silently turn into strings.
+        """
+        if not isinstance(topology, dict):
+            raise ValueError("The topology must be a YAML mapping.")
+        pending = [topology]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, dict):
+                if not all(isinstance(key, str) for key in node):
+                    raise TypeError("The topology contains keys that are not strings.")
+                pending.extend(node.values())
+            elif isinstance(node, list):
+                pending.extend(node)
+        return json.loads(json.dumps(topology))
+
+    def _cache_file(self, digest: str) -> Path:
+        """Returns the cache file for the given content hash."""
+        return self.cache_dir / f"topology-v{self.CACHE_FORMAT_VERSION}-{digest}.json"
+
+    def _read_cache(self, digest: str):
+        """Returns the cached topology or None if there is no usable entry."""
+        if self.cache_dir is None:
+            return None
+        cache_file = self._cache_file(digest)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as cached:
+                return json.load(cached)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Ignoring unreadable topology cache entry {cache_file}: {e}")
+            return None
+
+    def _write_cache(self, digest: str, topology: dict) -> None:
+        """Stores the normalized topology, the file is replaced atomically so parallel runs never see partial entries."""
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                json.dump(topology, tmp_file)
+            os.replace(tmp_name, self._cache_file(digest))
+        except OSError as e:
+            self.logger.warning(f"Could not write topology cache entry to {self.cache_dir}: {e}")
+
+    def loads(self, content: bytes, digest: str = None) -> dict:
+        """
+        Parses the content of a single topology file, using the cache if it is enabled.
+        Fragments referenced with include/extends are not resolved here.
+
+        Args:
+            content (bytes): Raw content of the topology file.
+            digest (str): Content hash if it is already known.
+
+        Returns:
+            dict: The parsed topology, normalized if the cache is enabled.
+        """
+        if self.cache_dir is None:
+            return load_yaml(content)
+        digest = digest or self.content_hash(content)
+        topology = self._read_cache(digest)
+        if topology is not None:
+            return topology
+
+        topology = load_yaml(content)
+        try:
+            topology = self.normalize(topology)
+        except TypeError:
+            # e.g. YAML timestamps or numeric keys, these can not be cached without changing their meaning
+            return topology
+        self._write_cache(digest, topology)
+        return topology
+
+    def _parse_file(self, path: Path) -> dict:
+        """Returns the parsed content of one topology file or fragment, served from the fragment cache if unchanged."""
+        with open(path, 'rb') as topology_file:
+            content = topology_file.read()
+        digest = self.content_hash(content)
+        cached = self._fragment_cache.get(path)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+        topology = self.loads(content, digest)
+        if not isinstance(topology, dict):
+            raise ValueError(f"The topology file {path} must contain a YAML mapping.")
+        self._fragment_cache[path] = (digest, topology)
+        return topology
+
+    def _resolve(self, path: Path, parents: tuple) -> dict:
+        """
+        Resolves include/extends of a topology file recursively.
+        The extended file is the base, included fragments are merged on top of it in the given order
+        and the content of the file itself is merged last.
+        """
+        if path in parents:
+            chain = " -> ".join(str(p) for p in parents + (path,))
+            raise ValueError(f"Cyclic include/extends in topology files: {chain}")
+
+        # the cached topology is shared, never modify it
+        topology = dict(self._parse_file(path))
+        references = []
+        extends = topology.pop(EXTENDS_KEY, None)
+        if extends is not None:
+            references.append(extends)
+        includes = topology.pop(INCLUDE_KEY, None)
+        if includes is not None:
+            references.extend(includes if isinstance(includes, list) else [includes])
+
+        resolved = {}
+        for reference in references:
+            if not isinstance(reference, str):
+                raise ValueError(f"Invalid include/extends entry in {path}: {reference!r}")
+            fragment = self._resolve((path.parent / reference).resolve(), parents + (path,))
+            resolved = deep_merge(resolved, fragment)
+        return copy.deepcopy(deep_merge(resolved, topology))
+
+    @classmethod
+    def validate(cls, topology: dict) -> None:
+        """
+        Validates a resolved topology against schemas/topology-schema.json.
+
+        Raises:
+            jsonschema.ValidationError: If the topology does not match the schema.
+        """
+        if cls._schema is None:
+            with open(TOPOLOGY_SCHEMA_PATH, 'r', encoding='utf-8') as schema_file:
+                cls._schema = json.load(schema_file)
+        jsonschema.validate(instance=topology, schema=cls._schema)
+
+    def apply_site_config(self, topology: dict) -> dict:
+        """
+        Merges the topology on top of the site defaults, the topology takes precedence.
+
+        Raises:
+            FileNotFoundError: If the site config does not exist.
+            ValueError: If the site config is not a mapping.
+        """
+        if self.site_config is None:
+            return topology
+        site = self._parse_file(self.site_config)
+        ignored = sorted(set(site) - set(SITE_CONFIG_KEYS))
+        if ignored:
+            self.logger.warning(f"Ignoring sections {', '.join(ignored)} of the site config {self.site_config}, "
+                                f"it provides defaults for {', '.join(SITE_CONFIG_KEYS)} only")
+        defaults = {key: site[key] for key in SITE_CONFIG_KEYS if key in site}
+        return copy.deepcopy(deep_merge(defaults, topology))
+
+    def load(self, topology_path: Path, validate: bool = None) -> dict:
+        """
+        Loads the topology file at the given path and resolves the fragments it includes or extends.
+
+        Args:
+            topology_path (Path): Path to the topology YAML file.
+            validate (bool): Validate the resolved topology against the topology schema.
+                By default only composed topologies (using include/extends) are validated.
+
+        Returns:
+            dict: The resolved, normalized topology, on top of the site defaults.
+
+        Raises:
+            FileNotFoundError: If the topology file, one of its fragments or the site config does not exist.
+            yaml.YAMLError: If a file is not valid YAML.
+            ValueError: If the include/extends references are invalid or cyclic.
+            jsonschema.ValidationError: If the resolved topology does not match the schema.
+        """
+        topology_path = Path(topology_path).resolve()
+        topology = self.apply_site_config(self._resolve(topology_path, ()))
+        if validate is None:
+            root = self._fragment_cache[topology_path][1]
+            validate = EXTENDS_KEY in root or INCLUDE_KEY in root
+        if validate:
+            self.validate(topology)
+        return topology
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Semantic diff of preCICE configuration files.
+
+Both files are canonicalized (comments, formatting, attribute order and the order of children
+are ignored) and every subtree is hashed bottom-up. Subtrees with equal hashes are skipped, so
+only the regions that actually differ are compared. Children are matched by their identity
+(e.g. a participant by its name, an exchange by data, mesh, from and to), the differences are
+reported as added, removed and changed elements with their paths.
+"""
+from generation_utils.file_batch import DEFAULT_PATTERN, expand_paths, map_parallel
+from generation_utils.format_precice_config import PrettyPrinter
+from pathlib import Path
+import argparse
+import hashlib
+import sys
+
+# Attributes that identify an element among its siblings, matched by tag or by tag prefix (e.g. 'mapping:')
+IDENTITY_ATTRIBUTES = {
+    "data:": ("name",),
+    "mesh": ("name",),
+    "use-data": ("name",),
+    "participant": ("name",),
+    "provide-mesh": ("name",),
+    "receive-mesh": ("name",),
+    "read-data": ("name", "mesh"),
+    "write-data": ("name", "mesh"),
+    "mapping:": ("direction", "from", "to"),
+    "m2n:": ("acceptor", "connector"),
+    "participants": ("name",),
+    "exchange": ("data", "mesh", "from", "to"),
+    "data": ("name", "mesh"),
+    "watch-point": ("name",),
+    "watch-integral": ("name",),
+}
+CONVERGENCE_IDENTITY = ("data", "mesh")
+
+
+def identity_attributes(tag: str) -> tuple:
+    """Attributes that identify an element with the given tag among its siblings."""
+    if tag in IDENTITY_ATTRIBUTES:
+        return IDENTITY_ATTRIBUTES[tag]
+    if ":" in tag:
+        return IDENTITY_ATTRIBUTES.get(tag.split(":", 1)[0] + ":", ())
+    if tag.endswith("convergence-measure"):
+        return CONVERGENCE_IDENTITY
+    return ()
+
+
+class CanonicalNode:
+    def __init__(self, element) -> None:
+        """
+        Canonical form of an XML element and its subtree, with the hash of the subtree.
+
+        Args:
+            element: The lxml element, comments below it are ignored.
+        """
+        self.tag = element.tag
+        self.attrib = dict(element.attrib)
+        self.text = (element.text or "").strip()
+        self.line = element.sourceline
+        self.children = [CanonicalNode(child) for child in element if isinstance(child.tag, str)]
+        identity = identity_attributes(self.tag)
+        self.key = (self.tag,) + tuple(self.attrib.get(name) for name in identity)
+        self.label = self.tag + "".join(f"[@{name}='{self.attrib[name]}']" for name in identity if name in self.attrib)
+
+        digest = hashlib.sha1()
+        digest.update(self.tag.encode())
+        for name, value in sorted(self.attrib.items()):
+            digest.update(b"\0" + name.encode() + b"=" + value.encode())
+        digest.update(b"\1" + self.text.encode())
+        # the order of the children carries no meaning, their hashes are combined in sorted order
+        for child_digest in sorted(child.digest for child in self.children):
+            digest.update(child_digest)
+        self.digest = digest.digest()
+
+
+class Change:
+    def __init__(self, kind: str, path: str, details: list = None, line: int = None) -> None:
+        """
+        A semantic difference between two configurations.
+
+        Args:
+            kind (str): "added", "removed" or "changed".
+            path (str): Path of the element, e.g. /precice-configuration/participant[@name='Fluid'].
+            details (list[str]): For changed elements the changed attributes or text.
+            line (int): Line of the element in the new file (in the old file for removed elements).
+        """
+        self.kind = kind
+        self.path = path
+        self.details = details or []
+        self.line = line
+
+    def __str__(self) -> str:
+        symbol = {"added": "+", "removed": "-", "changed": "~"}[self.kind]
+        text = f"{symbol} {self.path}"
+        if self.details:
+            text += "\n" + "\n".join(f"    {detail}" for detail in self.details)
+        return text
+
+    def __repr__(self) -> str:
+        return f"Change({self.kind!r}, {self.path!r}, {self.details!r})"
+
+
+def _attribute_changes(old: CanonicalNode, new: CanonicalNode) -> list:
+    details = []
+    for name in sorted(old.attrib.keys() | new.attrib.keys()):
+        before, after = old.attrib.get(name), new.attrib.get(name)
+        if before == after:
+            continue
+        if before is None:
+            details.append(f"{name}: added \"{after}\"")
+        elif after is None:
+            details.append(f"{name}: removed \"{before}\"")
+        else:
+            details.append(f"{name}: \"{before}\" -> \"{after}\"")
+    if old.text != new.text:
+        details.append(f"text: \"{old.text}\" -> \"{new.text}\"")
+    return details
+
+
+def _match_children(old_children: list, new_children: list):
+    """
+    Pairs the children of two elements by their identity key. Among siblings with the same key,
+    identical subtrees are paired first, the rest in document order.
+
+    Yields:
+      tuple: (old child or None, new child or None)
+    """
+    old_by_key, new_by_key = {}, {}
+    for child in old_children:
+        old_by_key.setdefault(child.key, []).append(child)
+    for child in new_children:
+        new_by_key.setdefault(child.key, []).append(child)
+
+    for key, olds in old_by_key.items():
+        news = new_by_key.pop(key, [])
+        new_digests = {}
+        for child in news:
+            new_digests.setdefault(child.digest, []).append(child)
+        matched = set()
+        unmatched_old = []
+        for child in olds:
+            same = new_digests.get(child.digest)
+            if same:
+                # identical subtrees, which of them is paired does not matter
+                matched.add(id(same.pop()))
+            else:
+                unmatched_old.append(child)
+        news = [child for child in news if id(child) not in matched]
+        for index, child in enumerate(unmatched_old):
+            yield child, news[index] if index < len(news) else None
+        for child in news[len(unmatched_old):]:
+            yield None, child
+    for news in new_by_key.values():
+        for child in news:
+            yield None, child
+
+
+def diff_nodes(old: CanonicalNode, new: CanonicalNode, path: str = "") -> list:
+    """
+    Differences between two canonical subtrees, identical subtrees are skipped by their hash.
+
+    Returns:
+      list[Change]: The differences.
+    """
+    path = f"{path}/{new.label}"
+    if old.digest == new.digest:
+        return []
+    changes = []
+    details = _attribute_changes(old, new)
+    if details:
+        changes.append(Change("changed", path, details, new.line))
+    for old_child, new_child in _match_children(old.children, new.children):
+        if old_child is None:
+            changes.append(Change("added", f"{path}/{new_child.label}", line=new_child.line))
+        elif new_child is None:
+            changes.append(Change("removed", f"{path}/{old_child.label}", line=old_child.line))
+        else:
+            changes.extend(diff_nodes(old_child, new_child, path))
+    return changes
+
+
+def canonicalize(file_path) -> CanonicalNode:
+    """
+    Parse a configuration file into its canonical form.
+
+    Raises:
+      OSError, etree.XMLSyntaxError: If the file can not be read or parsed.
+    """
+    with open(file_path, 'rb') as xml_file:
+        content = xml_file.read()
+    return CanonicalNode(PrettyPrinter.parse_xml(content).getroot())
+
+
+def diff_files(old_path, new_path) -> list:
+    """
+    Semantic differences between two preCICE configuration files.
+
+    Returns:
+      list[Change]: The differences, empty if the files are semantically equal.
+    """
+    old, new = canonicalize(old_path), canonicalize(new_path)
+    if old.tag != new.tag:
+        return [Change("removed", f"/{old.label}", line=old.line), Change("added", f"/{new.label}", line=new.line)]
+    return sorted(diff_nodes(old, new), key=lambda change: change.path)
+
+
+def _diffWorker(task):
+    """
+    Diff one pair of files in a worker process.
+
+    Returns:
+      tuple: (old path, new path, changes or None on failure, message)
+    """
+    old_path, new_path = task
+    try:
+        return old_path, new_path, diff_files(old_path, new_path), ""
+    except Exception as e:
+        return old_path, new_path, None, str(e)
+
+
+def pair_files(old, new, pattern: str = DEFAULT_PATTERN):
+    """
+    Pairs the configuration files of two case libraries by their path relative to the library root.
+
+    Returns:
+      tuple: (list of (old, new) pairs, files only in old, files only in new)
+    """
+    old, new = Path(old), Path(new)
+    if old.is_file() and new.is_file():
+        return [(old, new)], [], []
+    old_files = {path.relative_to(old): path for path in expand_paths([old], pattern)}
+    new_files = {path.relative_to(new): path for path in expand_paths([new], pattern)}
+    pairs = [(old_files[name], new_files[name]) for name in sorted(old_files.keys() & new_files.keys())]
+    only_old = [old_files[name] for name in sorted(old_files.keys() - new_files.keys())]
+    only_new = [new_files[name] for name in sorted(new_files.keys() - old_files.keys())]
+    return pairs, only_old, only_new
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="precice-genesis diff",
+                                     description="Reports the semantic differences between preCICE configurations.")
+    parser.add_argument("old", help="Old configuration file or case library directory.")
+    parser.add_argument("new", help="New configuration file or case library directory.")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="File name pattern in directories.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only list the files that differ.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of parallel processes (default: all cores).")
+    args = parser.parse_args(argv)
+
+    pairs, only_old, only_new = pair_files(args.old, args.new, args.pattern)
+    for path in only_old:
+        print(f"Only in {args.old}: {path}")
+    for path in only_new:
+        print(f"Only in {args.new}: {path}")
+
+    differing = failed = 0
+    for old_path, new_path, changes, message in map_parallel(_diffWorker, pairs, args.jobs):
+        if changes is None:
+            failed += 1
+            print(f"Could not compare \"{old_path}\" and \"{new_path}\": {message}")
+        elif changes:
+            differing += 1
+            print(f"--- {old_path}\n+++ {new_path}" if not args.quiet else f"Differ: {new_path}")
+            if not args.quiet:
+                for change in changes:
+                    print(change)
+    if len(pairs) > 1 or only_old or only_new:
+        print("{} file(s) compared, {} differ, {} only in one library, {} could not be compared.".format(
+            len(pairs), differing, len(only_old) + len(only_new), failed))
+    if failed:
+        return 2
+    return 1 if differing or only_old or only_new else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
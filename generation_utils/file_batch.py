@@ -0,0 +1,112 @@
+"""
+Helpers for the precice-genesis commands that process many files at once:
+expanding paths and globs, running a worker over the files on all cores and
+remembering content hashes between runs.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import glob
+import hashlib
+import json
+import os
+import tempfile
+
+# File pattern used when a directory is given instead of a file
+DEFAULT_PATTERN = "precice-config*.xml"
+
+
+def expand_paths(patterns, pattern: str = DEFAULT_PATTERN) -> list[Path]:
+    """
+    Expands files, directories and glob patterns into a sorted list of unique files.
+
+    Args:
+        patterns (list[str]): Files, directories (searched recursively for `pattern`) or glob patterns.
+        pattern (str): File name pattern for directories.
+
+    Returns:
+        list[Path]: The matching files.
+    """
+    files = set()
+    for entry in patterns:
+        path = Path(entry)
+        if path.is_dir():
+            files.update(p for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            files.add(path)
+        else:
+            files.update(Path(p) for p in glob.glob(str(entry), recursive=True) if Path(p).is_file())
+    return sorted(files)
+
+
+def file_digest(path: Path) -> str:
+    """Returns the SHA-256 hex digest of the file content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def map_parallel(worker, items: list, jobs: int = None):
+    """
+    Applies a picklable worker function to all items, in parallel processes if there is more than one item.
+    Results are yielded in the order of the items.
+
+    Args:
+        worker: Module-level function taking one item.
+        items (list): The work items.
+        jobs (int): Number of worker processes, defaults to the number of cores.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) <= 1:
+        for item in items:
+            yield worker(item)
+        return
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as executor:
+        yield from executor.map(worker, items, chunksize=chunksize)
+
+
+class DigestCache:
+    def __init__(self, cache_path: Path, key: str) -> None:
+        """
+        Remembers the content hash of files from the last run, e.g. of files known to be formatted.
+
+        Args:
+            cache_path (Path): JSON file holding the cache, None disables the cache.
+            key (str): Identifies the settings the hashes are valid for, entries of other settings are dropped.
+        """
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.key = key
+        self.entries = {}
+        if self.cache_path is not None and self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as cache_file:
+                    cached = json.load(cache_file)
+                if cached.get("key") == key:
+                    self.entries = cached.get("files", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_current(self, path: Path, digest: str) -> bool:
+        """Returns True if the file had the given content hash at the end of the last run."""
+        return self.entries.get(str(Path(path).resolve())) == digest
+
+    def update(self, path: Path, digest: str) -> None:
+        """Stores the content hash of a file."""
+        self.entries[str(Path(path).resolve())] = digest
+
+    def discard(self, path: Path) -> None:
+        """Removes a file from the cache."""
+        self.entries.pop(str(Path(path).resolve()), None)
+
+    def save(self) -> None:
+        """Writes the cache atomically."""
+        if self.cache_path is None:
+            return
+        directory = self.cache_path.resolve().parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+            json.dump({"key": self.key, "files": self.entries}, tmp_file, indent=1)
+        os.replace(tmp_name, self.cache_path)
@@ -1,9 +1,62 @@
 #!/usr/bin/env python3
 from lxml import etree
+from functools import lru_cache
+from generation_utils.file_batch import DEFAULT_PATTERN, DigestCache, expand_paths, file_digest, map_parallel
+import argparse
+import hashlib
 import itertools
 import sys
 import io
+import os
 import shutil
+import filecmp
+import tempfile
+
+# Rank tables for the ordering of elements, matched by tag prefix (e.g. 'data:' matches data:vector, data:scalar)
+TOP_LEVEL_ORDER = (
+    ('log', 0),
+    ('profiling', 0),
+    ('data:', 1),
+    ('mesh', 2),
+    ('participant', 3),
+    ('m2n:', 4),
+    ('coupling-scheme:', 5),
+)
+PARTICIPANT_ORDER = (
+    ('provide-mesh', 1),
+    ('receive-mesh', 2),
+    ('write-data', 3),
+    ('read-data', 4),
+    ('mapping:', 5),
+)
+UNKNOWN_RANK = 6  # Unknown elements and comments appear last
+
+# Files larger than this are formatted in streaming mode by default
+STREAMING_THRESHOLD = 64 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _rank_of_tag(tag, order):
+    """
+    Returns the rank of a tag in the given rank table. The result is cached per tag,
+    so sorting does not scan the table on every comparison.
+    """
+    for prefix, rank in order:
+        if tag.startswith(prefix):
+            return rank
+    return UNKNOWN_RANK
+
+def topLevelRank(element):
+    """
+    Rank of a top-level element in the canonical order of a preCICE configuration.
+    """
+    return _rank_of_tag(element.tag, TOP_LEVEL_ORDER) if isinstance(element.tag, str) else UNKNOWN_RANK
+
+def participantChildRank(element):
+    """
+    Rank of a child element of a participant.
+    """
+    return _rank_of_tag(element.tag, PARTICIPANT_ORDER) if isinstance(element.tag, str) else UNKNOWN_RANK
 
 def isEmptyTag(element):
     """
@@ -56,15 +109,6 @@ class PrettyPrinter():
         self.maxwidth = maxwidth  # Maximum width for a single line
         self.maxgrouplevel = maxgrouplevel  # Maximum depth to group elements on one line
         self.global_newline_between_groups = True  # Add newline between top-level groups
-        
-        # Specific ordering for top-level elements
-        self.top_level_order = [
-            'data:vector',
-            'mesh',
-            'participant',
-            'm2n:sockets',
-            'coupling-scheme:'
-        ]
 
     def print(self, text='', end='\n'):
         """
@@ -117,6 +161,14 @@ class PrettyPrinter():
             else:
                 self.print("{}<{}>".format(self.indent * level, element.tag))
 
+    def fmtTagOpen(self, element, level):
+        """
+        Format the opening tag of a non-empty element.
+        """
+        if element.attrib:
+            return "{}<{} {}>".format(self.indent * level, element.tag, self.fmtAttrH(element))
+        return "{}<{}>".format(self.indent * level, element.tag)
+
     def printTagEnd(self, element, level):
         """
         Print the end tag of an element.
@@ -165,193 +217,182 @@ class PrettyPrinter():
                 self.printElement(child, level=level)
             return
 
-        # Custom sorting for top-level elements
-        def custom_sort_key(elem):
-            tag = str(elem.tag)
-            # Predefined order for top-level elements with prefix matching
-            order = {
-                'data:': 1,  # Matches data:vector, data:scalar, etc.
-                'mesh': 2,
-                'participant': 3,
-                'm2n:': 4,
-                'coupling-scheme:': 5
-            }
-            # Find the first matching key
-            for prefix, rank in order.items():
-                if tag.startswith(prefix):
-                    return rank
-            return 6  # Unknown elements appear last
-
         # Sort children based on the predefined order
-        sorted_children = sorted(element.getchildren(), key=custom_sort_key)
+        sorted_children = sorted(element.getchildren(), key=topLevelRank)
 
         last = len(sorted_children)
         for i, group in enumerate(sorted_children, start=1):
-            # Special handling for participants to reorder child elements
-            if 'participant' in str(group.tag):
-                # Define order for participant child elements with more generalized matching
-                participant_order = {
-                    'provide-mesh': 1,
-                    'receive-mesh': 2,
-                    'write-data': 3,
-                    'read-data': 4,
-                    'mapping:': 5  # Matches mapping:nearest-neighbor, mapping:rbf, etc.
-                }
-                
-                # Sort participant's children based on the defined order
-                sorted_participant_children = sorted(
-                    group.getchildren(), 
-                    key=lambda child: next(
-                        (rank for prefix, rank in participant_order.items() 
-                         if str(child.tag).startswith(prefix)), 
-                        6  # Unknown elements appear last
-                    )
-                )
-                
-                # Separate different types of elements
-                mesh_elements = []
-                data_elements = []
-                mapping_elements = []
-                
-                for child in sorted_participant_children:
-                    if str(child.tag) in ['provide-mesh', 'receive-mesh']:
-                        mesh_elements.append(child)
-                    elif str(child.tag) in ['write-data', 'read-data']:
-                        data_elements.append(child)
-                    elif str(child.tag).startswith('mapping:'):
-                        mapping_elements.append(child)
-                
-                # Construct participant tag with attributes
-                participant_tag = "<{}".format(group.tag)
-                for attr, value in group.items():
-                    participant_tag += ' {}="{}"'.format(attr, value)
-                participant_tag += ">"
-                
-                # Print participant opening tag
-                self.print(self.indent * level + participant_tag)
-                
-                # Print mesh elements
-                for child in mesh_elements:
-                    self.printElement(child, level + 1)
-                
-                # Add newline between mesh and data
-                if mesh_elements and data_elements:
-                    self.print()
-                
-                # Print data elements
-                for child in data_elements:
-                    self.printElement(child, level + 1)
-                
-                # Add newline before mapping
-                if data_elements and mapping_elements:
-                    self.print()
-                
-                # Print mapping elements with multi-line formatting
-                for mapping_elem in mapping_elements:
-                    # Check if the mapping element has multiple attributes
-                    if len(mapping_elem.items()) > 2:
-                        self.print("{}<{}".format(self.indent * (level + 1), mapping_elem.tag))
-                        for k, v in mapping_elem.items():
-                            self.print("{}{}=\"{}\"".format(self.indent * (level + 2), k, v))
+            self.printGroup(group, level)
+
+            # Add an extra newline between top-level groups
+            if i < last:
+                self.print()
+
+    def printGroup(self, group, level):
+        """
+        Print one top-level element (a group) with the special formatting of participants and coupling schemes.
+        """
+        # Special handling for participants to reorder child elements
+        if 'participant' in str(group.tag):
+            # Sort participant's children based on the defined order
+            sorted_participant_children = sorted(group.getchildren(), key=participantChildRank)
+            
+            # Separate different types of elements
+            mesh_elements = []
+            data_elements = []
+            mapping_elements = []
+            other_elements = []  # e.g. intra-comm, export, watch-point, action
+            
+            for child in sorted_participant_children:
+                if str(child.tag) in ['provide-mesh', 'receive-mesh']:
+                    mesh_elements.append(child)
+                elif str(child.tag) in ['write-data', 'read-data']:
+                    data_elements.append(child)
+                elif str(child.tag).startswith('mapping:'):
+                    mapping_elements.append(child)
+                else:
+                    other_elements.append(child)
+            
+            # Construct participant tag with attributes
+            participant_tag = "<{}".format(group.tag)
+            for attr, value in group.items():
+                participant_tag += ' {}="{}"'.format(attr, value)
+            participant_tag += ">"
+            
+            # Print participant opening tag
+            self.print(self.indent * level + participant_tag)
+            
+            # Print mesh elements
+            for child in mesh_elements:
+                self.printElement(child, level + 1)
+            
+            # Add newline between mesh and data
+            if mesh_elements and data_elements:
+                self.print()
+            
+            # Print data elements
+            for child in data_elements:
+                self.printElement(child, level + 1)
+            
+            # Add newline before mapping
+            if data_elements and mapping_elements:
+                self.print()
+            
+            # Print mapping elements with multi-line formatting
+            for mapping_elem in mapping_elements:
+                # Check if the mapping element has multiple attributes
+                if len(mapping_elem.items()) > 2:
+                    self.print("{}<{}".format(self.indent * (level + 1), mapping_elem.tag))
+                    for k, v in mapping_elem.items():
+                        self.print("{}{}=\"{}\"".format(self.indent * (level + 2), k, v))
+                    if isEmptyTag(mapping_elem):
                         self.print("{} />".format(self.indent * (level + 1)))
                     else:
-                        # Single-line formatting for simple mappings
-                        self.printElement(mapping_elem, level + 1)
-                
-                # Close participant tag
-                self.print("{}</participant>".format(self.indent * level))
-                
-                # Add newline after participant if not the last element
-                if i < last:
+                        # Mappings with a basis function
+                        self.print("{}>".format(self.indent * (level + 1)))
+                        self.printChildren(mapping_elem, level + 2)
+                        self.printTagEnd(mapping_elem, level + 1)
+                else:
+                    # Single-line formatting for simple mappings
+                    self.printElement(mapping_elem, level + 1)
+
+            # Print the remaining elements
+            if other_elements and (mesh_elements or data_elements or mapping_elements):
+                self.print()
+            for child in other_elements:
+                self.printElement(child, level + 1)
+            
+            # Close participant tag
+            self.print("{}</participant>".format(self.indent * level))
+            return
+        
+        # Special handling for coupling-scheme elements
+        if 'coupling-scheme' in str(group.tag):
+            # Sort children of coupling-scheme
+            sorted_scheme_children = sorted(
+                group.getchildren(),
+                key=lambda child: 0 if str(child.tag).endswith('convergence-measure') else 
+                                  1 if str(child.tag) == 'exchange' else 2
+            )
+            
+            # Separate different types of elements
+            other_elements = []
+            exchange_elements = []
+            convergence_elements = []
+            acceleration_elements = []
+            
+            for child in sorted_scheme_children:
+                tag = str(child.tag)
+                if tag == 'exchange':
+                    exchange_elements.append(child)
+                elif tag.endswith('convergence-measure'):
+                    convergence_elements.append(child)
+                elif tag.startswith('acceleration'):
+                    acceleration_elements.append(child)
+                else:
+                    other_elements.append(child)
+            
+            # Print coupling-scheme opening tag
+            self.print(self.indent * level + "<{}>".format(group.tag))
+            
+            # Print initial elements
+            initial_elements = [
+                elem for elem in other_elements 
+                if str(elem.tag) in ['participants', 'participant', 'max-time', 'max-time-windows', 'time-window-size']
+            ]
+            for child in initial_elements:
+                self.printElement(child, level + 1)
+            
+            # Print convergence measures first
+            if convergence_elements:
+                if initial_elements:
                     self.print()
-                
-                continue
+                for conv in convergence_elements:
+                    self.printElement(conv, level + 1)
             
-            # Special handling for coupling-scheme elements
-            elif 'coupling-scheme' in str(group.tag):
-                # Sort children of coupling-scheme
-                sorted_scheme_children = sorted(
-                    group.getchildren(),
-                    key=lambda child: 0 if str(child.tag) == 'relative-convergence-measure' else 
-                                      1 if str(child.tag) == 'exchange' else 2
-                )
-                
-                # Separate different types of elements
-                other_elements = []
-                exchange_elements = []
-                convergence_elements = []
-                acceleration_elements = []
-                
-                for child in sorted_scheme_children:
-                    tag = str(child.tag)
-                    if tag == 'exchange':
-                        exchange_elements.append(child)
-                    elif tag == 'relative-convergence-measure':
-                        convergence_elements.append(child)
-                    elif tag.startswith('acceleration'):
-                        acceleration_elements.append(child)
-                    else:
-                        other_elements.append(child)
-                
-                # Print coupling-scheme opening tag
-                self.print(self.indent * level + "<{}>".format(group.tag))
-                
-                # Print initial elements
-                initial_elements = [
-                    elem for elem in other_elements 
-                    if str(elem.tag) in ['participants', 'max-time', 'time-window-size']
-                ]
-                for child in initial_elements:
-                    self.printElement(child, level + 1)
-                
-                # Print convergence measures first
-                if convergence_elements:
-                    if initial_elements:
-                        self.print()
-                    for conv in convergence_elements:
-                        self.printElement(conv, level + 1)
-                
-                # Print exchanges
-                if exchange_elements:
-                    if initial_elements or convergence_elements:
-                        self.print()
-                    for exchange in exchange_elements:
-                        self.printElement(exchange, level + 1)
-                
-                # Print max-iterations if present
-                max_iterations = [
-                    elem for elem in other_elements 
-                    if str(elem.tag) == 'max-iterations'
-                ]
-                if max_iterations:
-                    if exchange_elements or convergence_elements or initial_elements:
-                        self.print()
-                    for child in max_iterations:
-                        self.printElement(child, level + 1)
-                
-                # Print acceleration elements
-                if acceleration_elements:
-                    if exchange_elements or convergence_elements or max_iterations or initial_elements:
-                        self.print()
-                    for child in acceleration_elements:
-                        self.printElement(child, level + 1)
-                
-                # Close coupling-scheme tag
-                self.print("{}</{}>"
-                    .format(self.indent * level, group.tag))
-                
-                # Add newline after coupling-scheme if not the last element
-                if i < last:
+            # Print exchanges
+            if exchange_elements:
+                if initial_elements or convergence_elements:
                     self.print()
-                
-                continue
+                for exchange in exchange_elements:
+                    self.printElement(exchange, level + 1)
             
-            # Print the element normally
-            self.printElement(group, level=level)
+            # Print max-iterations (and min-iterations) if present
+            max_iterations = [
+                elem for elem in other_elements 
+                if str(elem.tag) in ['max-iterations', 'min-iterations']
+            ]
+            if max_iterations:
+                if exchange_elements or convergence_elements or initial_elements:
+                    self.print()
+                for child in max_iterations:
+                    self.printElement(child, level + 1)
             
-            # Add an extra newline between top-level groups
-            if i < last:
-                self.print()
+            # Print acceleration elements
+            if acceleration_elements:
+                if exchange_elements or convergence_elements or max_iterations or initial_elements:
+                    self.print()
+                for child in acceleration_elements:
+                    self.printElement(child, level + 1)
+
+            # Print the remaining elements, nothing of the scheme is dropped
+            remaining_elements = [
+                elem for elem in other_elements
+                if elem not in initial_elements and elem not in max_iterations
+            ]
+            if remaining_elements:
+                if exchange_elements or convergence_elements or max_iterations or initial_elements or acceleration_elements:
+                    self.print()
+                for child in remaining_elements:
+                    self.printElement(child, level + 1)
+            
+            # Close coupling-scheme tag
+            self.print("{}</{}>"
+                .format(self.indent * level, group.tag))
+            return
+        
+        # Print the element normally
+        self.printElement(group, level=level)
 
     @staticmethod
     def parse_xml(content):
@@ -367,53 +408,298 @@ class PrettyPrinter():
         parser = etree.XMLParser(recover=True, remove_comments=False, remove_blank_text=True)
         return etree.fromstring(content, parser).getroottree()
 
-    def prettify_file(self, file_path):
+    def _streamGroups(self, file_path, spools):
         """
-        Prettify the XML file at the given path and overwrite the file with the prettified content.
+        Parse the file incrementally and print every top-level element into the spool of its rank.
+        Each element is released as soon as it is printed, so only one top-level group is held in memory.
 
-        Parameters:
-          file_path (str): Path to the XML file.
-        
         Returns:
-          bool: True if the file was processed (even if no changes were made), False if an error occurred.
+          tuple: (root element, number of printed groups per spool)
         """
-        try:
-            # Open and read the file as bytes.
-            with open(file_path, 'rb') as xml_file:
-                content = xml_file.read()
-        except Exception as e:
-            print(f"Unable to open file: \"{file_path}\"")
-            print(e)
-            return False
+        counts = [0] * len(spools)
+        root = None
+        depth = 0
+        sort_groups = self.maxgrouplevel >= 1
+        context = etree.iterparse(str(file_path), events=("start", "end", "comment"),
+                                  remove_blank_text=True, remove_comments=False, recover=True)
+        for event, element in context:
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = element
+                continue
+            if event == "end":
+                depth -= 1
+                if depth != 1:
+                    continue
+            elif depth != 1:
+                # comments within a group are printed together with the group
+                continue
+
+            rank = topLevelRank(element) if sort_groups else 0
+            printer = PrettyPrinter(stream=spools[rank], indent=self.indent,
+                                    maxwidth=self.maxwidth, maxgrouplevel=self.maxgrouplevel)
+            if sort_groups and counts[rank]:
+                printer.print()
+            if sort_groups:
+                printer.printGroup(element, level=1)
+            else:
+                printer.printElement(element, level=1)
+            counts[rank] += 1
 
+            # release the printed group and everything before it
+            if event == "end":
+                element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+                if event == "comment":
+                    parent.remove(element)
+        return root, counts
+
+    def _renderStreaming(self, file_path):
+        """
+        Render the prettified file into a temporary file next to it without building the whole tree.
+        Every top-level group is printed into a temporary spool file of its rank and the spools are
+        concatenated in rank order, so peak memory is bounded by the largest top-level group.
+
+        Returns:
+          str: Path of the temporary file, the caller is responsible for it.
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        spools = [tempfile.TemporaryFile(mode="w+", encoding="utf-8") for _ in range(UNKNOWN_RANK + 1)]
+        tmp_name = None
         try:
-            # Parse the XML content using the static method.
-            xml_tree = PrettyPrinter.parse_xml(content)
-        except Exception as e:
-            print(f"Error occurred while parsing file: \"{file_path}\"")
-            print(e)
-            return False
+            root, counts = self._streamGroups(file_path, spools)
+            if root is None:
+                raise ValueError("Document is empty")
+
+            fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as output:
+                printer = PrettyPrinter(stream=output, indent=self.indent,
+                                        maxwidth=self.maxwidth, maxgrouplevel=self.maxgrouplevel)
+                printer.printXMLDeclaration(root.getroottree())
+                printer.print()
+                if not any(counts):
+                    printer.printTagEmpty(root, level=0)
+                else:
+                    printer.print(printer.fmtTagOpen(root, level=0))
+                    first = True
+                    for spool, count in zip(spools, counts):
+                        if not count:
+                            continue
+                        # Add an extra newline between top-level groups
+                        if not first and self.maxgrouplevel >= 1:
+                            printer.print()
+                        first = False
+                        spool.seek(0)
+                        shutil.copyfileobj(spool, output)
+                    printer.print("</{}>".format(root.tag))
+            result, tmp_name = tmp_name, None
+            return result
+        finally:
+            for spool in spools:
+                spool.close()
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+    def render(self, content):
+        """
+        Render XML content in prettified format.
 
+        Parameters:
+          content (bytes): The XML content in bytes.
+
+        Returns:
+          str: The prettified content.
+        """
+        xml_tree = PrettyPrinter.parse_xml(content)
         # Create an in-memory text stream to hold the prettified XML.
         buffer = io.StringIO()
         # Use a temporary PrettyPrinter instance with the buffer as output.
         temp_printer = PrettyPrinter(stream=buffer, indent=self.indent,
                                      maxwidth=self.maxwidth, maxgrouplevel=self.maxgrouplevel)
         temp_printer.printRoot(xml_tree)
+        return buffer.getvalue()
 
-        # Get the prettified content from the buffer.
-        new_content = buffer.getvalue()
-        # Compare with the original content (decoded from bytes).
-        if new_content != content.decode("utf-8"):
+    def format_file(self, file_path, write=True, streaming=None):
+        """
+        Format the XML file at the given path.
+
+        Parameters:
+          file_path (str): Path to the XML file.
+          write (bool): Overwrite the file if the formatting changes it, otherwise only check.
+          streaming (bool): Use the bounded-memory streaming mode. The output is identical, by default
+            it is used for files larger than STREAMING_THRESHOLD.
+
+        Returns:
+          bool: True if the formatted content differs from the file content.
+
+        Raises:
+          OSError, etree.XMLSyntaxError, ValueError: If the file can not be read, parsed or written.
+        """
+        if streaming is None:
+            streaming = os.path.getsize(file_path) > STREAMING_THRESHOLD
+
+        if streaming:
+            tmp_name = self._renderStreaming(file_path)
             try:
-                # Overwrite the original file with the prettified content.
-                with open(file_path, "w") as xml_file:
-                    buffer.seek(0)
-                    shutil.copyfileobj(buffer, xml_file)
-            except Exception as e:
-                print(f"Failed to write prettified content to file: \"{file_path}\"")
-                print(e)
-                return False
-        else:
+                changed = not filecmp.cmp(tmp_name, file_path, shallow=False)
+                if changed and write:
+                    # atomic swap, readers never see a partially written config, mkstemp creates it as 0600
+                    shutil.copymode(file_path, tmp_name)
+                    os.replace(tmp_name, file_path)
+            finally:
+                if os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+            return changed
+
+        # Open and read the file as bytes.
+        with open(file_path, 'rb') as xml_file:
+            content = xml_file.read()
+        new_content = self.render(content)
+        # Compare with the original content (decoded from bytes).
+        changed = new_content != content.decode("utf-8")
+        if changed and write:
+            # Overwrite the original file with the prettified content.
+            with open(file_path, "w") as xml_file:
+                xml_file.write(new_content)
+        return changed
+
+    def prettify_file_streaming(self, file_path):
+        """
+        Prettify a (very large) XML file without building the whole tree in memory.
+
+        The file is parsed with iterparse and formatted incrementally into a temporary file, which
+        atomically replaces the original if the content changed. The output is identical to prettify_file().
+
+        Parameters:
+          file_path (str): Path to the XML file.
+
+        Returns:
+          bool: True if the file was processed (even if no changes were made), False if an error occurred.
+        """
+        return self.prettify_file(file_path, streaming=True)
+
+    def prettify_file(self, file_path, streaming=None):
+        """
+        Prettify the XML file at the given path and overwrite the file with the prettified content.
+
+        Parameters:
+          file_path (str): Path to the XML file.
+          streaming (bool): Use the bounded-memory streaming mode, see format_file().
+        
+        Returns:
+          bool: True if the file was processed (even if no changes were made), False if an error occurred.
+        """
+        try:
+            changed = self.format_file(file_path, write=True, streaming=streaming)
+        except Exception as e:
+            print(f"Failed to prettify file: \"{file_path}\"")
+            print(e)
+            return False
+        if not changed:
             print(f"No changes required for file: \"{file_path}\"")
         return True
+
+
+# Default cache of files known to be formatted, relative to the current working directory
+DEFAULT_FORMAT_CACHE = ".precice-genesis-format-cache.json"
+
+
+def _formatterKey(indent, maxwidth):
+    """
+    Identifies the formatter settings and implementation, cached results of other settings are not reused.
+    """
+    with open(__file__, 'rb') as source:
+        source_hash = hashlib.sha256(source.read()).hexdigest()[:16]
+    return "{!r}|{}|{}".format(indent, maxwidth, source_hash)
+
+
+def _formatWorker(task):
+    """
+    Format one file in a worker process.
+
+    Returns:
+      tuple: (path, status, digest of the formatted content, message) with status one of
+        "changed", "unchanged" or "failed".
+    """
+    file_path, write, indent, maxwidth = task
+    printer = PrettyPrinter(indent=indent, maxwidth=maxwidth)
+    try:
+        changed = printer.format_file(file_path, write=write)
+    except Exception as e:
+        return file_path, "failed", None, str(e)
+    digest = file_digest(file_path) if (write or not changed) else None
+    return file_path, "changed" if changed else "unchanged", digest, ""
+
+
+def format_files(paths, check=False, jobs=None, cache_path=DEFAULT_FORMAT_CACHE, indent='    ', maxwidth=120):
+    """
+    Format many preCICE configuration files in parallel.
+
+    Parameters:
+      paths (list): Files, directories or glob patterns.
+      check (bool): Only report files that would change, do not write them.
+      jobs (int): Number of worker processes, defaults to the number of cores.
+      cache_path (str): Cache of content hashes of formatted files, files that did not change since
+        the last run are skipped. None disables the cache.
+
+    Returns:
+      dict: status -> list of files, the statuses are "changed", "unchanged", "cached" and "failed".
+    """
+    cache = DigestCache(cache_path, _formatterKey(indent, maxwidth))
+    results = {"changed": [], "unchanged": [], "cached": [], "failed": []}
+
+    tasks = []
+    for file_path in expand_paths(paths):
+        if cache.is_current(file_path, file_digest(file_path)):
+            results["cached"].append(file_path)
+        else:
+            tasks.append((file_path, not check, indent, maxwidth))
+
+    for file_path, status, digest, message in map_parallel(_formatWorker, tasks, jobs):
+        results[status].append(file_path)
+        if digest is not None:
+            cache.update(file_path, digest)
+        else:
+            cache.discard(file_path)
+        if status == "failed":
+            print(f"Failed to format file: \"{file_path}\"")
+            print(message)
+        elif status == "changed":
+            print(("Would reformat: \"{}\"" if check else "Reformatted: \"{}\"").format(file_path))
+    cache.save()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="precice-genesis format",
+                                     description="Formats preCICE configuration files in the canonical layout.")
+    parser.add_argument("paths", nargs="+",
+                        help=f"Files, directories (searched for {DEFAULT_PATTERN}) or glob patterns.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true",
+                      help="Only report files that would change and exit non-zero if there are any.")
+    mode.add_argument("--write", action="store_true", help="Rewrite files in place (default).")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of parallel processes (default: all cores).")
+    parser.add_argument("--cache", default=DEFAULT_FORMAT_CACHE,
+                        help="Cache of content hashes of already formatted files.")
+    parser.add_argument("--no-cache", action="store_true", help="Format all files, ignore and do not write the cache.")
+    args = parser.parse_args(argv)
+
+    results = format_files(args.paths, check=args.check, jobs=args.jobs,
+                           cache_path=None if args.no_cache else args.cache)
+    verb = "would be reformatted" if args.check else "reformatted"
+    print("{} file(s) {}, {} unchanged, {} skipped (unchanged since last run), {} failed.".format(
+        len(results["changed"]), verb, len(results["unchanged"]), len(results["cached"]), len(results["failed"])))
+    if results["failed"]:
+        return 2
+    if args.check and results["changed"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Performance linter for preCICE configuration files.
+
+Each rule detects a configuration pattern that is known to make coupled runs slow and
+suggests a fix. Findings carry a severity (high, medium, low), the location of the
+offending element and the suggested fix.
+"""
+from controller_utils.precice_struct.PS_Mapping import GLOBAL_RBF_MAX_VERTICES
+from generation_utils.file_batch import DEFAULT_PATTERN, expand_paths, map_parallel
+from generation_utils.format_precice_config import PrettyPrinter
+from generation_utils.validate_precice_config import ConfigIndex
+import argparse
+import sys
+
+# Severities of findings, ordered by their expected impact on the run time
+SEVERITIES = ("high", "medium", "low")
+
+# Global RBF mappings solve a dense system, above this number of vertices they dominate the coupling time,
+# the same limit up to which the generator chooses them (see PS_Mapping.select_mapping())
+GLOBAL_RBF_VERTEX_LIMIT = GLOBAL_RBF_MAX_VERTICES
+
+# Directories that are shared by all cases next to each other (and usually on a network file system)
+SHARED_EXCHANGE_DIRECTORIES = ("..", "../", "./..", "./../")
+
+
+class LintFinding:
+    def __init__(self, rule: str, severity: str, element, message: str, fix: str) -> None:
+        """
+        A performance anti-pattern found in a preCICE configuration.
+
+        Args:
+            rule (str): Name of the rule, e.g. implicit-without-acceleration.
+            severity (str): One of SEVERITIES.
+            element: The offending lxml element, used for the location.
+            message (str): What was found and why it is slow.
+            fix (str): Suggested change of the configuration.
+        """
+        self.rule = rule
+        self.severity = severity
+        self.line = element.sourceline
+        self.path = element_path(element)
+        self.message = message
+        self.fix = fix
+
+    @property
+    def location(self) -> str:
+        return f"line {self.line} ({self.path})" if self.line else self.path
+
+    def __str__(self) -> str:
+        return f"{self.severity}: {self.location}: {self.message} [{self.rule}]\n    fix: {self.fix}"
+
+    def __repr__(self) -> str:
+        return f"LintFinding({self.rule!r}, {self.severity!r}, {self.path!r})"
+
+
+def element_path(element) -> str:
+    """Path of an element from the root, named elements are identified by their name attribute."""
+    parts = []
+    while element is not None:
+        name = element.get("name")
+        parts.append(f"{element.tag}[@name='{name}']" if name else str(element.tag))
+        element = element.getparent()
+    return "/" + "/".join(reversed(parts))
+
+
+def rule_global_rbf(index, mesh_vertices):
+    """Global RBF mappings on large meshes, their cost grows with the square (iterative) or cube (direct) of the size."""
+    for participant, mapping in index.mappings:
+        tag = mapping.tag
+        is_global = tag.startswith("mapping:rbf-global-") or (
+            tag.startswith("mapping:rbf-") and not tag.startswith("mapping:rbf-pum-"))
+        if not is_global:
+            continue
+        vertices = max(mesh_vertices.get(mapping.get("from"), 0), mesh_vertices.get(mapping.get("to"), 0))
+        if vertices and vertices <= GLOBAL_RBF_VERTEX_LIMIT:
+            continue
+        size = f"meshes with up to {vertices} vertices" if vertices else "meshes of unknown size"
+        yield LintFinding("global-rbf", "high" if vertices else "medium", mapping,
+                          f"global RBF mapping of participant \"{participant}\" on {size}",
+                          "use mapping:rbf-pum-direct (partition of unity), it scales linearly with the mesh size")
+
+
+def rule_implicit_without_acceleration(index, mesh_vertices):
+    """Implicit coupling without acceleration converges slowly or not at all."""
+    for scheme in index.schemes:
+        if not (scheme.tag.endswith("-implicit") or scheme.tag == "coupling-scheme:multi"):
+            continue
+        if not any(isinstance(child.tag, str) and child.tag.startswith("acceleration:") for child in scheme):
+            yield LintFinding("implicit-without-acceleration", "high", scheme,
+                              "implicit coupling without acceleration needs many iterations per time window",
+                              "add an acceleration:IQN-ILS block with the exchanged data of the second participant")
+
+
+def rule_one_way_implicit(index, mesh_vertices):
+    """Implicit coupling where all data flow in one direction, there is nothing to iterate on."""
+    for scheme in index.schemes:
+        if not scheme.tag.endswith("-implicit"):
+            continue
+        directions = {(child.get("from"), child.get("to")) for child in scheme if child.tag == "exchange"}
+        if len(directions) == 1:
+            sender, receiver = next(iter(directions))
+            yield LintFinding("one-way-implicit", "high", scheme,
+                              f"{scheme.tag} with data flowing only from \"{sender}\" to \"{receiver}\" iterates "
+                              "without any feedback",
+                              f"use coupling-scheme:serial-explicit with \"{sender}\" as first participant")
+
+
+def rule_duplicate_m2n(index, mesh_vertices):
+    """More than one m2n between the same participants opens redundant connections."""
+    seen = set()
+    for m2n in index.m2n:
+        pair = frozenset((m2n.get("acceptor"), m2n.get("connector")))
+        if pair in seen:
+            yield LintFinding("duplicate-m2n", "medium", m2n,
+                              "second m2n between \"{}\" and \"{}\"".format(m2n.get("acceptor"), m2n.get("connector")),
+                              "keep a single m2n per participant pair, it carries the data of all directions")
+        seen.add(pair)
+
+
+def rule_shared_exchange_directory(index, mesh_vertices):
+    """Socket connection files in a directory shared by many cases, slow on network file systems."""
+    for m2n in index.m2n:
+        if m2n.tag == "m2n:sockets" and m2n.get("exchange-directory") in SHARED_EXCHANGE_DIRECTORIES:
+            yield LintFinding("shared-exchange-directory", "low", m2n,
+                              "connection information is exchanged through the parent directory, which is shared "
+                              "by all neighbouring cases and polled over the (network) file system",
+                              "point exchange-directory to a case-specific directory on a local file system")
+
+
+def rule_export_every_window(index, mesh_vertices):
+    """Exports in every time window write the meshes in every window, which is expensive for production runs."""
+    for participant in index.participants.values():
+        for export in participant:
+            if not (isinstance(export.tag, str) and export.tag.startswith("export:")):
+                continue
+            if export.get("every-iteration") == "true":
+                yield LintFinding("export-every-window", "high", export,
+                                  f"participant \"{participant.get('name')}\" exports its meshes in every iteration",
+                                  "remove every-iteration=\"true\" for production runs")
+            elif export.get("every-n-time-windows", "1") == "1":
+                yield LintFinding("export-every-window", "medium", export,
+                                  f"participant \"{participant.get('name')}\" exports its meshes in every time window",
+                                  "set every-n-time-windows or remove the export for production runs")
+
+
+def rule_unbounded_quasi_newton(index, mesh_vertices):
+    """Quasi-Newton acceleration without max-used-iterations keeps all columns and gets slower every iteration."""
+    for scheme in index.schemes:
+        for acceleration in scheme:
+            if acceleration.tag not in ("acceleration:IQN-ILS", "acceleration:IQN-IMVJ"):
+                continue
+            if not any(child.tag == "max-used-iterations" for child in acceleration):
+                yield LintFinding("missing-max-used-iterations", "medium", acceleration,
+                                  f"{acceleration.tag} without max-used-iterations",
+                                  "add <max-used-iterations value=\"100\"/> and <time-windows-reused value=\"10\"/>")
+
+
+# Rule sets selectable on the command line
+RULE_SETS = {
+    "perf": (
+        rule_global_rbf,
+        rule_implicit_without_acceleration,
+        rule_one_way_implicit,
+        rule_duplicate_m2n,
+        rule_shared_exchange_directory,
+        rule_export_every_window,
+        rule_unbounded_quasi_newton,
+    ),
+}
+
+
+def lint_tree(xml_tree, mesh_vertices=None, rule_set="perf") -> list:
+    """
+    Apply a rule set to a parsed preCICE configuration.
+
+    Parameters:
+      mesh_vertices (dict): Optional mesh name -> number of vertices, sharpens the size dependent rules.
+      rule_set (str): Key of RULE_SETS.
+
+    Returns:
+      list[LintFinding]: The findings ordered by severity.
+    """
+    index = ConfigIndex(xml_tree.getroot())
+    findings = []
+    for rule in RULE_SETS[rule_set]:
+        findings.extend(rule(index, mesh_vertices or {}))
+    return sorted(findings, key=lambda finding: SEVERITIES.index(finding.severity))
+
+
+def lint_file(file_path, mesh_vertices=None, rule_set="perf") -> list:
+    """
+    Lint the preCICE configuration file at the given path, see lint_tree().
+
+    Raises:
+      OSError, etree.XMLSyntaxError: If the file can not be read or parsed.
+    """
+    with open(file_path, 'rb') as xml_file:
+        content = xml_file.read()
+    return lint_tree(PrettyPrinter.parse_xml(content), mesh_vertices, rule_set)
+
+
+def _lintWorker(task):
+    """
+    Lint one file in a worker process.
+
+    Returns:
+      tuple: (path, findings or None if the file could not be parsed, message)
+    """
+    file_path, mesh_vertices, rule_set = task
+    try:
+        return file_path, lint_file(file_path, mesh_vertices, rule_set), ""
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def _parse_mesh_vertices(values):
+    mesh_vertices = {}
+    for value in values:
+        mesh, _, vertices = value.rpartition("=")
+        if not mesh or not vertices.isdigit():
+            raise argparse.ArgumentTypeError(f"expected MESH=VERTICES, got {value!r}")
+        mesh_vertices[mesh] = int(vertices)
+    return mesh_vertices
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="precice-genesis lint",
+                                     description="Reports configuration patterns that make preCICE runs slow.")
+    parser.add_argument("paths", nargs="+",
+                        help=f"Files, directories (searched for {DEFAULT_PATTERN}) or glob patterns.")
+    parser.add_argument("--perf", action="store_true", help="Apply the performance rules (default).")
+    parser.add_argument("--mesh-vertices", action="append", default=[], metavar="MESH=VERTICES",
+                        help="Number of vertices of a mesh, can be given more than once.")
+    parser.add_argument("--fail-on", choices=SEVERITIES, default="high",
+                        help="Exit non-zero if there are findings of this or a higher severity (default: high).")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of parallel processes (default: all cores).")
+    args = parser.parse_args(argv)
+    try:
+        mesh_vertices = _parse_mesh_vertices(args.mesh_vertices)
+    except argparse.ArgumentTypeError as e:
+        parser.exit(2, f"{parser.prog}: {e}\n")
+
+    tasks = [(file_path, mesh_vertices, "perf") for file_path in expand_paths(args.paths)]
+    counts = dict.fromkeys(SEVERITIES, 0)
+    unparsable = 0
+    for file_path, findings, message in map_parallel(_lintWorker, tasks, args.jobs):
+        if findings is None:
+            unparsable += 1
+            print(f"Could not parse \"{file_path}\": {message}")
+            continue
+        for finding in findings:
+            counts[finding.severity] += 1
+            print(f"{file_path}: {finding}")
+    print("{} file(s) linted: {} high, {} medium, {} low, {} could not be parsed.".format(
+        len(tasks), counts["high"], counts["medium"], counts["low"], unparsable))
+    if unparsable:
+        return 2
+    failing = SEVERITIES[:SEVERITIES.index(args.fail_on) + 1]
+    return 1 if any(counts[severity] for severity in failing) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Ports preCICE v2 configuration files to preCICE v3.
+
+Every rewrite is a named rule, the rules that fired are reported per file. The ported
+configuration is printed with the PrettyPrinter of format_precice_config, so ported files
+share the canonical layout of generated files.
+"""
+from lxml import etree
+from generation_utils.file_batch import DEFAULT_PATTERN, expand_paths, map_parallel
+from generation_utils.format_precice_config import PrettyPrinter
+import argparse
+import io
+import re
+import sys
+
+# Valid element names, only these are ever created by the rules
+_TAG_PATTERN = re.compile(r"^[A-Za-z_][\w.\-]*(:[\w.\-]+)?$")
+
+# v2 values of the geometric-filter attribute of use-mesh and their v3 spelling
+GEOMETRIC_FILTERS = {
+    "on-master": "on-primary-rank",
+    "on-slaves": "on-secondary-ranks",
+}
+
+# v2 intra-participant communication (master:*) and its v3 counterpart
+INTRA_COMMS = {
+    "master:mpi-single": "intra-comm:mpi",
+    "master:mpi": "intra-comm:mpi",
+    "master:sockets": "intra-comm:sockets",
+}
+
+# Attributes of the v2 rbf mappings that belong to the basis function in v3
+BASIS_FUNCTION_ATTRIBUTES = ("support-radius", "shape-parameter")
+# Attributes of the v2 rbf mappings that no longer exist
+REMOVED_RBF_ATTRIBUTES = ("use-qr-decomposition", "preallocation")
+
+
+def _parser():
+    return etree.XMLParser(recover=True, remove_comments=False, remove_blank_text=True)
+
+
+def _new_element(tag, attrib=None):
+    """
+    Create an element with the given tag. lxml refuses to create prefixed tags without a
+    namespace declaration (e.g. mapping:rbf), the recovering parser does create them.
+    """
+    if not _TAG_PATTERN.match(tag):
+        raise ValueError(f"Invalid tag name: {tag}")
+    element = etree.fromstring("<{}/>".format(tag), _parser())
+    for key, value in (attrib or {}).items():
+        element.set(key, value)
+    return element
+
+
+def _rename(element, tag, attrib=None):
+    """
+    Replace an element by a copy with another tag, keeping position, children and tail.
+
+    Returns:
+      The new element.
+    """
+    renamed = _new_element(tag, element.attrib if attrib is None else attrib)
+    renamed.text = element.text
+    renamed.tail = element.tail
+    renamed.extend(list(element))
+    element.getparent().replace(element, renamed)
+    return renamed
+
+
+def _elements(root, predicate):
+    """List (not iterator, the rules modify the tree) of all elements whose tag matches the predicate."""
+    return [element for element in root.iter() if isinstance(element.tag, str) and predicate(element.tag)]
+
+
+def rule_solver_interface(root):
+    """Remove the solver-interface wrapper, its dimensions move to the meshes."""
+    fired = 0
+    for interface in _elements(root, lambda tag: tag == "solver-interface"):
+        parent = interface.getparent()
+        dimensions = interface.get("dimensions")
+        if dimensions is not None:
+            for mesh in interface.iter("mesh"):
+                if mesh.get("dimensions") is None:
+                    mesh.set("dimensions", dimensions)
+        if interface.get("experimental") is not None:
+            parent.set("experimental", interface.get("experimental"))
+        if interface.get("sync-mode") in ("on", "yes", "true", "1"):
+            parent.append(_new_element("profiling", {"synchronize": "true"}))
+        position = parent.index(interface)
+        for offset, child in enumerate(list(interface)):
+            parent.insert(position + offset, child)
+        parent.remove(interface)
+        fired += 1
+    return fired
+
+
+def rule_m2n_acceptor_connector(root):
+    """m2n:* from/to become acceptor/connector."""
+    fired = 0
+    for m2n in _elements(root, lambda tag: tag.startswith("m2n:")):
+        if m2n.get("from") is None and m2n.get("to") is None:
+            continue
+        attrib = {}
+        for key, value in m2n.items():
+            attrib[{"from": "acceptor", "to": "connector"}.get(key, key)] = value
+        m2n.attrib.clear()
+        m2n.attrib.update(attrib)
+        fired += 1
+    return fired
+
+
+def rule_use_mesh(root):
+    """use-mesh becomes provide-mesh (provide="yes") or receive-mesh (from="...")."""
+    fired = 0
+    for use_mesh in _elements(root, lambda tag: tag == "use-mesh"):
+        attrib = dict(use_mesh.attrib)
+        provide = attrib.pop("provide", "no") in ("yes", "true", "on", "1")
+        if provide or "from" not in attrib:
+            tag = "provide-mesh"
+            attrib = {"name": attrib["name"]} if "name" in attrib else attrib
+        else:
+            tag = "receive-mesh"
+            if "direct-access" in attrib:
+                attrib["api-access"] = attrib.pop("direct-access")
+            if attrib.get("geometric-filter") in GEOMETRIC_FILTERS:
+                attrib["geometric-filter"] = GEOMETRIC_FILTERS[attrib["geometric-filter"]]
+        _rename(use_mesh, tag, attrib)
+        fired += 1
+    return fired
+
+
+def rule_extrapolation_order(root):
+    """Remove extrapolation-order, v3 uses waveforms instead."""
+    fired = 0
+    for element in _elements(root, lambda tag: tag == "extrapolation-order"):
+        element.getparent().remove(element)
+        fired += 1
+    return fired
+
+
+def rule_mapping_timing(root):
+    """Remove the timing attribute of mappings, v3 maps on demand."""
+    fired = 0
+    for mapping in _elements(root, lambda tag: tag.startswith("mapping:")):
+        if mapping.get("timing") is not None:
+            del mapping.attrib["timing"]
+            fired += 1
+    return fired
+
+
+def rule_mapping_constraint(root):
+    """The scaled-consistent constraint is called scaled-consistent-surface in v3."""
+    fired = 0
+    for mapping in _elements(root, lambda tag: tag.startswith("mapping:")):
+        if mapping.get("constraint") == "scaled-consistent":
+            mapping.set("constraint", "scaled-consistent-surface")
+            fired += 1
+    return fired
+
+
+def rule_rbf_basis_function(root):
+    """
+    mapping:rbf-<basis function> becomes a global rbf mapping with a basis-function:<basis function> child.
+    QR decomposition was the direct solver of v2, otherwise the iterative solver was used.
+    """
+    fired = 0
+    v3_rbf = ("mapping:rbf-global-", "mapping:rbf-pum-")
+    for mapping in _elements(root, lambda tag: tag.startswith("mapping:rbf-") and not tag.startswith(v3_rbf)):
+        basis_function = mapping.tag[len("mapping:rbf-"):]
+        attrib = dict(mapping.attrib)
+        solver = "direct" if attrib.get("use-qr-decomposition") in ("true", "yes", "on", "1") else "iterative"
+        for key in REMOVED_RBF_ATTRIBUTES:
+            attrib.pop(key, None)
+        basis_attrib = {key: attrib.pop(key) for key in BASIS_FUNCTION_ATTRIBUTES if key in attrib}
+        if solver == "direct":
+            attrib.pop("solver-rtol", None)
+        renamed = _rename(mapping, "mapping:rbf-global-" + solver, attrib)
+        renamed.append(_new_element("basis-function:" + basis_function, basis_attrib))
+        fired += 1
+    return fired
+
+
+def rule_intra_comm(root):
+    """master:* becomes intra-comm:*."""
+    fired = 0
+    for master in _elements(root, lambda tag: tag in INTRA_COMMS):
+        _rename(master, INTRA_COMMS[master.tag])
+        fired += 1
+    return fired
+
+
+def rule_min_iterations(root):
+    """min-iteration-convergence-measure becomes the min-iterations of the coupling scheme."""
+    fired = 0
+    for measure in _elements(root, lambda tag: tag == "min-iteration-convergence-measure"):
+        _rename(measure, "min-iterations", {"value": measure.get("min-iterations", "1")})
+        fired += 1
+    return fired
+
+
+def rule_waveform_degree(root):
+    """The waveform-order of read-data becomes the waveform-degree of the data."""
+    fired = 0
+    data_elements = {element.get("name"): element for element in _elements(root, lambda tag: tag.startswith("data:"))}
+    for read_data in _elements(root, lambda tag: tag == "read-data"):
+        order = read_data.get("waveform-order")
+        if order is None:
+            continue
+        del read_data.attrib["waveform-order"]
+        data = data_elements.get(read_data.get("name"))
+        if data is not None:
+            data.set("waveform-degree", order)
+        fired += 1
+    return fired
+
+
+def rule_export_normals(root):
+    """Exports always contain the normals in v3, the normals attribute was removed."""
+    fired = 0
+    for export in _elements(root, lambda tag: tag.startswith("export:")):
+        if export.get("normals") is not None:
+            del export.attrib["normals"]
+            fired += 1
+    return fired
+
+
+# Rules in the order they are applied: name, function
+PORT_RULES = (
+    ("solver-interface", rule_solver_interface),
+    ("m2n-acceptor-connector", rule_m2n_acceptor_connector),
+    ("use-mesh", rule_use_mesh),
+    ("extrapolation-order", rule_extrapolation_order),
+    ("mapping-timing", rule_mapping_timing),
+    ("mapping-constraint", rule_mapping_constraint),
+    ("rbf-basis-function", rule_rbf_basis_function),
+    ("intra-comm", rule_intra_comm),
+    ("min-iterations", rule_min_iterations),
+    ("waveform-degree", rule_waveform_degree),
+    ("export-normals", rule_export_normals),
+)
+
+
+def port_tree(xml_tree):
+    """
+    Apply all port rules to a parsed configuration in place.
+
+    Returns:
+      dict: rule name -> number of rewrites, only rules that fired are contained.
+    """
+    root = xml_tree.getroot()
+    fired = {}
+    for name, rule in PORT_RULES:
+        count = rule(root)
+        if count:
+            fired[name] = count
+    return fired
+
+
+def port_content(content, indent='    ', maxwidth=120):
+    """
+    Port the content of a v2 configuration file.
+
+    Parameters:
+      content (bytes): The XML content.
+
+    Returns:
+      tuple: (ported and prettified content, dict of the rules that fired)
+    """
+    xml_tree = PrettyPrinter.parse_xml(content)
+    fired = port_tree(xml_tree)
+    buffer = io.StringIO()
+    PrettyPrinter(stream=buffer, indent=indent, maxwidth=maxwidth).printRoot(xml_tree)
+    return buffer.getvalue(), fired
+
+
+def port_file(file_path, write=True):
+    """
+    Port the configuration file at the given path.
+
+    Parameters:
+      file_path (str): Path to the XML file.
+      write (bool): Overwrite the file with the ported content if any rule fired.
+
+    Returns:
+      dict: rule name -> number of rewrites.
+
+    Raises:
+      OSError, etree.XMLSyntaxError, ValueError: If the file can not be read, parsed or written.
+    """
+    with open(file_path, 'rb') as xml_file:
+        content = xml_file.read()
+    new_content, fired = port_content(content)
+    if fired and write:
+        with open(file_path, "w") as xml_file:
+            xml_file.write(new_content)
+    return fired
+
+
+def _portWorker(task):
+    """
+    Port one file in a worker process.
+
+    Returns:
+      tuple: (path, fired rules or None on failure, message)
+    """
+    file_path, write = task
+    try:
+        return file_path, port_file(file_path, write=write), ""
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def port_files(paths, check=False, jobs=None):
+    """
+    Port many preCICE configuration files in parallel.
+
+    Parameters:
+      paths (list): Files, directories or glob patterns.
+      check (bool): Only report the rules that would fire, do not write the files.
+      jobs (int): Number of worker processes, defaults to the number of cores.
+
+    Returns:
+      dict: status -> {file: fired rules}, the statuses are "ported", "current" and "failed".
+    """
+    results = {"ported": {}, "current": {}, "failed": {}}
+    tasks = [(file_path, not check) for file_path in expand_paths(paths)]
+    for file_path, fired, message in map_parallel(_portWorker, tasks, jobs):
+        if fired is None:
+            results["failed"][file_path] = {}
+            print(f"Failed to port file: \"{file_path}\"")
+            print(message)
+        elif fired:
+            results["ported"][file_path] = fired
+            rules = ", ".join("{} ({})".format(name, count) for name, count in fired.items())
+            print(("Would port \"{}\": {}" if check else "Ported \"{}\": {}").format(file_path, rules))
+        else:
+            results["current"][file_path] = fired
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="precice-genesis port",
+                                     description="Ports preCICE v2 configuration files to preCICE v3.")
+    parser.add_argument("paths", nargs="+",
+                        help=f"Files, directories (searched for {DEFAULT_PATTERN}) or glob patterns.")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report the rules that would fire and exit non-zero if any file needs porting.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of parallel processes (default: all cores).")
+    args = parser.parse_args(argv)
+
+    results = port_files(args.paths, check=args.check, jobs=args.jobs)
+    verb = "would be ported" if args.check else "ported"
+    print("{} file(s) {}, {} already v3, {} failed.".format(
+        len(results["ported"]), verb, len(results["current"]), len(results["failed"])))
+    if results["failed"]:
+        return 2
+    if args.check and results["ported"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
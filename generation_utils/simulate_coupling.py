@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Discrete-event simulation of the coupling schedule of a topology, before any cluster hours are spent.
+
+The model is the PS_PreCICEConfig that the generator builds from the topology: the coupling schemes (type, order
+of the participants), the data flows with their placement (bytes and estimated mapping and transfer seconds per
+exchange, see PS_Placement) and the acceleration. Every participant solves each time window once per coupling
+iteration, which takes its cost-per-window hint (UNKNOWN_COST_PER_WINDOW seconds without one). A solve starts once
+the participant has finished its previous solve and the data it reads have arrived, i.e. the solve of the sender
+is finished and the data are mapped and transferred:
+
+ - serial schemes: the second participant waits for the data of the first one of the same iteration, the first
+   one for the data of the second one of the previous iteration (or time window).
+ - parallel and multi schemes: all participants solve an iteration with the data of the previous iteration.
+ - explicit schemes exchange once per time window, after the last iteration of the sender.
+
+Implicit schemes take the EXPECTED_ITERATIONS of their acceleration per time window, PARALLEL_ITERATIONS_RATIO
+times as many in parallel and multi schemes, STEADY_ITERATIONS_RATIO times as many in the single window of a
+steady state, within their min-iterations and max-iterations. The m2n volume counts the bytes of every exchange,
+the values of all time steps of the sender if substeps are exchanged.
+
+The result is the predicted wall time, the idle fraction of every participant, the bytes per m2n and time window
+and a Gantt-style timeline, as text or SVG. With --alternatives the serial and the parallel variant of every
+bi-scheme is simulated as well, so scheme alternatives can be compared offline.
+"""
+from pathlib import Path
+from xml.sax.saxutils import escape
+from controller_utils.myutils.UT_PCErrorLogging import UT_PCErrorLogging
+from controller_utils.precice_struct import PS_PreCICEConfig, PS_ImplicitCoupling
+from controller_utils.precice_struct.PS_CouplingScheme import PARALLEL_ITERATIONS_RATIO
+from controller_utils.precice_struct.PS_Waveform import steps_per_window
+from controller_utils.ui_struct.UI_UserInput import UI_UserInput
+from generation_utils.TopologyLoader import TopologyLoader
+import argparse
+import heapq
+import math
+import sys
+import tempfile
+
+# Time windows simulated by default
+DEFAULT_WINDOWS = 10
+# Seconds of one solve of a time window of participants without a cost-per-window hint
+UNKNOWN_COST_PER_WINDOW = 1.0
+# Iterations per time window of a serial implicit scheme, by its acceleration
+EXPECTED_ITERATIONS = {"IQN-ILS": 4, "IQN-IMVJ": 4, "aitken": 7, "constant": 12}
+# The steady state converges in a single window, from the initial guess instead of the previous window
+STEADY_ITERATIONS_RATIO = 10
+# Characters of the text timeline, and the symbols of the solves of even and odd time windows
+TIMELINE_WIDTH = 72
+WINDOW_SYMBOLS = "#="
+# Size of the SVG timeline in pixels
+SVG_WIDTH = 800
+SVG_ROW_HEIGHT = 24
+SVG_LABEL_WIDTH = 120
+SVG_WINDOW_COLORS = ("#4c72b0", "#8fb0de")
+
+
+class SimulatedSolve(object):
+    """ One solve of a participant: one coupling iteration of one time window """
+    def __init__(self, participant: str, window: int, iteration: int, seconds: float):
+        self.participant = participant
+        self.window = window
+        self.iteration = iteration
+        self.seconds = seconds
+        self.start = None
+        self.end = None
+        self.outputs = [] # (SimulatedSolve, delay) that wait for this solve, the delay is mapping and transfer
+        self.pending = 0 # number of solves and data this solve still waits for
+        self.ready = 0.0 # time at which everything this solve waits for has arrived
+        pass
+
+    def precedes(self, solve, delay: float = 0.0):
+        """ lets the given solve wait for this one, and for its data to arrive after delay seconds """
+        self.outputs.append((solve, delay))
+        solve.pending += 1
+        pass
+
+
+class CouplingSchedule(object):
+    """ The simulated solves of all participants, with the m2n volume and the schemes they were simulated with """
+    def __init__(self, windows: int):
+        self.windows = windows
+        self.participants = [] # names of the participants, in the order of the config
+        self.solves = [] # SimulatedSolve, in the order they start
+        self.schemes = [] # (participant names, coupling type, iterations per window) of every scheme
+        self.m2n_bytes = {} # m2n label -> bytes per time window
+        self.assumed_costs = [] # participants without a cost-per-window hint
+        pass
+
+    @property
+    def wall_time(self) -> float:
+        return max((solve.end for solve in self.solves), default=0.0)
+
+    def busy_seconds(self, participant: str) -> float:
+        return sum(solve.seconds for solve in self.solves if solve.participant == participant)
+
+    def idle_fraction(self, participant: str) -> float:
+        """ share of the wall time in which the participant waits for data """
+        wall_time = self.wall_time
+        return (wall_time - self.busy_seconds(participant)) / wall_time if wall_time else 0.0
+
+
+def build_model(topology_path: Path, site_config: Path = None) -> PS_PreCICEConfig:
+    """
+    Builds the model of the generator from a topology. The preCICE config is written into a temporary directory,
+    the coupling modes, placements and m2n connections are chosen while writing.
+
+    Args:
+        topology_path (Path): Path to the topology YAML file.
+        site_config (Path): Optional site config with the defaults of the cluster.
+
+    Returns:
+        PS_PreCICEConfig: The model of the generated configuration.
+    """
+    topology = TopologyLoader(site_config=site_config).load(Path(topology_path))
+    mylog = UT_PCErrorLogging()
+    user_input = UI_UserInput()
+    user_input.init_from_yaml(topology, mylog)
+    config = PS_PreCICEConfig()
+    config.create_config(user_input)
+    with tempfile.TemporaryDirectory() as directory:
+        target = Path(directory) / "_generated" / "precice-config.xml"
+        target.parent.mkdir()
+        config.write_precice_xml_config(str(target), mylog, sync_mode=user_input.sim_info.sync_mode,
+                                        mode=user_input.sim_info.mode)
+    return config
+
+
+def expected_iterations(scheme, coupling_str: str, iterations: int = None) -> int:
+    """
+    Iterations per time window of a coupling scheme, see the module documentation.
+
+    Args:
+        scheme (PS_CouplingScheme): The coupling scheme.
+        coupling_str (str): The simulated type of the scheme, e.g. serial-implicit.
+        iterations (int): Iterations per window of a serial scheme, overrides the expected ones of the acceleration.
+
+    Returns:
+        int: The expected iterations, 1 for explicit schemes.
+    """
+    if not isinstance(scheme, PS_ImplicitCoupling):
+        return 1
+    expected = iterations if iterations is not None else EXPECTED_ITERATIONS.get(scheme.postProcessing.name,
+                                                                                  EXPECTED_ITERATIONS["constant"])
+    if not coupling_str.startswith("serial") or scheme.firstSolver is None:
+        expected *= PARALLEL_ITERATIONS_RATIO
+    if scheme.steady:
+        expected *= STEADY_ITERATIONS_RATIO
+    return max(scheme.minIteration or 1, min(math.ceil(expected), scheme.maxIteration))
+
+
+def _m2n_labels(config) -> dict:
+    """ returns pair of participant names -> label of its m2n """
+    labels = {}
+    for m2n in config.m2ns:
+        pair = frozenset((m2n.acceptor.name, m2n.connector.name))
+        labels[pair] = "{} - {} ({})".format(m2n.acceptor.name, m2n.connector.name, m2n.tag)
+    return labels
+
+
+def simulate_schedule(config, windows: int = DEFAULT_WINDOWS, iterations: int = None,
+                      coupling_modes: dict = None) -> CouplingSchedule:
+    """
+    Simulates the solves of all participants over a number of time windows, see the module documentation.
+
+    Args:
+        config (PS_PreCICEConfig): The model of the generated configuration, see build_model().
+        windows (int): Number of simulated time windows, a steady state has a single one.
+        iterations (int): Iterations per window of a serial implicit scheme, the expected ones if None.
+        coupling_modes (dict): Index of a scheme in config.couplingSchemes -> simulated type (e.g. serial-implicit)
+            instead of the chosen one.
+
+    Returns:
+        CouplingSchedule: The simulated schedule.
+
+    Raises:
+        ValueError: If the participants wait for each other in a cycle.
+    """
+    coupling_modes = coupling_modes or {}
+    schedule = CouplingSchedule(1 if config.steady else windows)
+    schedule.participants = list(config.solvers)
+    schedule.assumed_costs = [name for name, solver in config.solvers.items() if solver.cost_per_window is None]
+    m2n_labels = _m2n_labels(config)
+
+    # the iterations of every scheme, each participant iterates as often as its implicit scheme
+    schemes = []
+    iterations_of = dict.fromkeys(config.solvers, 1)
+    for index, scheme in enumerate(config.couplingSchemes):
+        coupling_str = coupling_modes.get(index, scheme.coupling_str)
+        scheme_iterations = expected_iterations(scheme, coupling_str, iterations)
+        serial = coupling_str.startswith("serial") and scheme.firstSolver is not None
+        schemes.append((scheme, serial, scheme_iterations))
+        names = scheme.participant_names(config)
+        schedule.schemes.append((names, "multi" if len(names) > 2 else coupling_str, scheme_iterations))
+        for name in names:
+            iterations_of[name] = max(iterations_of[name], scheme_iterations)
+
+    solves = {}
+    for window in range(schedule.windows):
+        for name, solver in config.solvers.items():
+            seconds = solver.cost_per_window if solver.cost_per_window is not None else UNKNOWN_COST_PER_WINDOW
+            for iteration in range(iterations_of[name]):
+                solves[(name, window, iteration)] = SimulatedSolve(name, window, iteration, float(seconds))
+                previous = solves.get((name, window, iteration - 1)) or solves.get(
+                    (name, window - 1, iterations_of[name] - 1))
+                if previous is not None:
+                    previous.precedes(solves[(name, window, iteration)])
+
+    def last(name, window):
+        return solves.get((name, window, iterations_of[name] - 1))
+
+    # every data flow lets the reader wait for the solve of the writer it reads the data of
+    for scheme, serial, scheme_iterations in schemes:
+        implicit = isinstance(scheme, PS_ImplicitCoupling)
+        for placement in scheme.placements_of(config):
+            sender, receiver = placement.sender.name, placement.receiver.name
+            substeps = 1
+            if placement.waveform is not None and placement.waveform.substeps:
+                substeps = steps_per_window(placement.sender, config.time_window_size) or 1
+            label = m2n_labels.get(frozenset((sender, receiver)), "{} - {}".format(sender, receiver))
+            exchanges = scheme_iterations if implicit else 1
+            schedule.m2n_bytes[label] = schedule.m2n_bytes.get(label, 0) + \
+                placement.exchange_bytes * substeps * exchanges
+            first_sender = serial and sender == scheme.firstSolver
+            for window in range(schedule.windows):
+                for iteration in range(exchanges):
+                    reader = solves[(receiver, window, iteration)]
+                    if first_sender:
+                        writer = solves[(sender, window, iteration)] if implicit else last(sender, window)
+                    elif iteration > 0:
+                        writer = solves[(sender, window, iteration - 1)]
+                    else:
+                        writer = last(sender, window - 1)
+                    if writer is not None:
+                        writer.precedes(reader, placement.estimated_seconds)
+
+    # discrete events: a solve starts as soon as everything it waits for has arrived
+    events = [(solve.ready, order, solve) for order, solve in enumerate(solves.values()) if solve.pending == 0]
+    heapq.heapify(events)
+    order = len(solves)
+    while events:
+        ready, _, solve = heapq.heappop(events)
+        solve.start, solve.end = ready, ready + solve.seconds
+        schedule.solves.append(solve)
+        for output, delay in solve.outputs:
+            output.ready = max(output.ready, solve.end + delay)
+            output.pending -= 1
+            if output.pending == 0:
+                heapq.heappush(events, (output.ready, order, output))
+                order += 1
+    if len(schedule.solves) != len(solves):
+        raise ValueError("The participants wait for each other's data in a cycle.")
+    return schedule
+
+
+def timeline_text(schedule: CouplingSchedule, width: int = TIMELINE_WIDTH) -> str:
+    """ Gantt-style timeline, one row per participant, its solves alternate the WINDOW_SYMBOLS per window """
+    wall_time = schedule.wall_time
+    label_width = max([len(name) for name in schedule.participants] or [0])
+    lines = []
+    for name in schedule.participants:
+        cells = ["."] * width
+        for solve in schedule.solves:
+            if solve.participant != name or not wall_time:
+                continue
+            begin = min(width - 1, int(solve.start / wall_time * width))
+            end = max(begin + 1, int(round(solve.end / wall_time * width)))
+            cells[begin:end] = WINDOW_SYMBOLS[solve.window % len(WINDOW_SYMBOLS)] * (end - begin)
+        lines.append("{} |{}|".format(name.ljust(label_width), "".join(cells[:width])))
+    axis = "0s".ljust(width - 4) + "{:.3g}s".format(wall_time).rjust(6)
+    lines.append("{}  {}".format(" " * label_width, axis))
+    return "\n".join(lines)
+
+
+def timeline_svg(schedule: CouplingSchedule) -> str:
+    """ Gantt-style SVG timeline, one row per participant, one rectangle per solve """
+    wall_time = schedule.wall_time or 1.0
+    scale = SVG_WIDTH / wall_time
+    height = SVG_ROW_HEIGHT * (len(schedule.participants) + 1)
+    rows = {name: row for row, name in enumerate(schedule.participants)}
+    elements = ['<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}" font-family="sans-serif" '
+                'font-size="12">'.format(SVG_LABEL_WIDTH + SVG_WIDTH, height)]
+    for name, row in rows.items():
+        elements.append('<text x="4" y="{}">{}</text>'.format(row * SVG_ROW_HEIGHT + 16, escape(name)))
+    for solve in schedule.solves:
+        elements.append(
+            '<rect x="{:.2f}" y="{}" width="{:.2f}" height="{}" fill="{}"><title>{} window {} iteration {}: '
+            '{:.4g}s - {:.4g}s</title></rect>'.format(
+                SVG_LABEL_WIDTH + solve.start * scale, rows[solve.participant] * SVG_ROW_HEIGHT + 4,
+                max(solve.seconds * scale, 0.5), SVG_ROW_HEIGHT - 8,
+                SVG_WINDOW_COLORS[solve.window % len(SVG_WINDOW_COLORS)],
+                escape(solve.participant), solve.window, solve.iteration, solve.start, solve.end))
+    elements.append('<text x="{}" y="{}">0s</text>'.format(SVG_LABEL_WIDTH, height - 6))
+    elements.append('<text x="{}" y="{}" text-anchor="end">{:.4g}s</text>'.format(
+        SVG_LABEL_WIDTH + SVG_WIDTH, height - 6, schedule.wall_time))
+    elements.append("</svg>")
+    return "\n".join(elements) + "\n"
+
+
+def format_report(schedule: CouplingSchedule) -> str:
+    """ The predicted wall time, idle fractions and m2n volume of a schedule, with its text timeline """
+    wall_time = schedule.wall_time
+    lines = ["Predicted wall time: {:.4g}s for {} time window(s), {:.4g}s per window".format(
+        wall_time, schedule.windows, wall_time / schedule.windows if schedule.windows else 0.0), "",
+        "Coupling schemes:"]
+    lines += ["  {}: {} - {} iteration(s) per window".format(coupling_str, ", ".join(names), scheme_iterations)
+              for names, coupling_str, scheme_iterations in schedule.schemes] or ["  none"]
+    lines += ["", "| Participant | Solves | Busy [s] | Idle [s] | Idle fraction |", "| --- | --- | --- | --- | --- |"]
+    for name in schedule.participants:
+        busy = schedule.busy_seconds(name)
+        solves = sum(1 for solve in schedule.solves if solve.participant == name)
+        lines.append("| {} | {} | {:.4g} | {:.4g} | {:.1%} |".format(
+            name, solves, busy, wall_time - busy, schedule.idle_fraction(name)))
+    lines += ["", "Bytes per m2n and time window:"]
+    lines += ["  {}: {}".format(label, volume) for label, volume in schedule.m2n_bytes.items()] or ["  none"]
+    if schedule.assumed_costs:
+        lines += ["", "No cost-per-window hint, assumed {:g}s per solve: {}".format(
+            UNKNOWN_COST_PER_WINDOW, ", ".join(schedule.assumed_costs))]
+    lines += ["", timeline_text(schedule)]
+    return "\n".join(lines)
+
+
+def alternative_modes(config) -> list:
+    """ returns (description, coupling_modes) of the chosen schemes and of the serial or parallel variant of
+    every bi-scheme """
+    alternatives = [("chosen", {})]
+    for index, scheme in enumerate(config.couplingSchemes):
+        if scheme.firstSolver is None:
+            continue
+        kind, mode = scheme.coupling_str.split("-", 1)
+        alternative = "{}-{}".format("parallel" if kind == "serial" else "serial", mode)
+        alternatives.append(("{} instead of {} ({}, {})".format(
+            alternative, scheme.coupling_str, scheme.firstSolver, scheme.secondSolver), {index: alternative}))
+    return alternatives
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="precice-genesis simulate",
+                                     description="Predicts the wall time, idle time and m2n volume of the coupling "
+                                                 "schedule of a topology.")
+    parser.add_argument("topology", type=Path, help="Topology YAML file.")
+    parser.add_argument("-n", "--windows", type=int, default=DEFAULT_WINDOWS,
+                        help=f"Number of simulated time windows (default: {DEFAULT_WINDOWS}).")
+    parser.add_argument("--iterations", type=int, default=None,
+                        help="Iterations per time window of serial implicit schemes "
+                             "(default: expected from the acceleration).")
+    parser.add_argument("--svg", type=Path, default=None, help="Writes the timeline as SVG to this file.")
+    parser.add_argument("--alternatives", action="store_true",
+                        help="Also simulates the serial or parallel variant of every bi-scheme.")
+    parser.add_argument("--site-config", type=Path, default=None,
+                        help="YAML file with the site defaults (default: $PRECICE_GENESIS_SITE_CONFIG).")
+    args = parser.parse_args(argv)
+    if args.windows < 1 or (args.iterations is not None and args.iterations < 1):
+        parser.exit(2, f"{parser.prog}: the windows and iterations must be positive\n")
+
+    try:
+        config = build_model(args.topology, args.site_config)
+        schedule = simulate_schedule(config, args.windows, args.iterations)
+    except Exception as e:
+        print(f"Could not simulate \"{args.topology}\": {e}")
+        return 2
+    print(format_report(schedule))
+
+    if args.alternatives:
+        print("\n| Variant | Wall time [s] | Highest idle fraction |\n| --- | --- | --- |")
+        for description, coupling_modes in alternative_modes(config):
+            alternative = simulate_schedule(config, args.windows, args.iterations, coupling_modes)
+            idle = max((alternative.idle_fraction(name) for name in alternative.participants), default=0.0)
+            print("| {} | {:.4g} | {:.1%} |".format(description, alternative.wall_time, idle))
+
+    if args.svg is not None:
+        args.svg.write_text(timeline_svg(schedule), encoding="utf-8")
+        print(f"Timeline written to {args.svg}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
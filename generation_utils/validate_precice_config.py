@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Structural validation of preCICE v3 configuration files.
+
+The configuration is parsed once and indexed (data, meshes, participants, provided and
+received meshes, mappings, m2n pairs, exchanges). Every check is a lookup in these indexes,
+so validating a file is linear in its size.
+"""
+from generation_utils.file_batch import DEFAULT_PATTERN, expand_paths, map_parallel
+from generation_utils.format_precice_config import PrettyPrinter
+import argparse
+import sys
+
+
+class ValidationIssue:
+    def __init__(self, rule: str, message: str, line: int = None) -> None:
+        """
+        A violated structural rule of a preCICE configuration.
+
+        Args:
+            rule (str): Name of the violated rule, e.g. read-data-path.
+            message (str): Human readable description.
+            line (int): Line of the offending element in the file, if known.
+        """
+        self.rule = rule
+        self.message = message
+        self.line = line
+
+    def __str__(self) -> str:
+        location = f"line {self.line}: " if self.line else ""
+        return f"{location}{self.message} [{self.rule}]"
+
+    def __repr__(self) -> str:
+        return f"ValidationIssue({self.rule!r}, {self.message!r}, {self.line!r})"
+
+
+class ConfigIndex:
+    def __init__(self, root) -> None:
+        """
+        Indexes of a parsed preCICE configuration, built in a single pass over the tree.
+
+        Args:
+            root: Root element (precice-configuration) of the lxml tree.
+        """
+        self.data = {}              # data name -> element
+        self.meshes = {}            # mesh name -> element
+        self.mesh_data = {}         # mesh name -> set of data names used by the mesh
+        self.participants = {}      # participant name -> element
+        self.provided = {}          # mesh name -> list of (participant, element)
+        self.received = []          # (participant, element)
+        self.uses_mesh = set()      # (participant, mesh) provided or received
+        self.read_data = []         # (participant, element)
+        self.write_data = []        # (participant, element)
+        self.mappings = []          # (participant, element)
+        self.read_mappings = {}     # (participant, to mesh) -> set of from meshes
+        self.write_mappings = {}    # (participant, from mesh) -> set of to meshes
+        self.m2n = []               # element
+        self.schemes = []           # element
+        self.exchanges = []         # (scheme, element)
+        self.exchanges_to = {}      # (participant, data) -> set of meshes
+        self.exchanges_from = {}    # (participant, data) -> set of meshes
+        self.duplicates = []        # (kind, element)
+
+        for element in root:
+            if not isinstance(element.tag, str):
+                continue
+            tag = element.tag
+            if tag.startswith("data:"):
+                self._add_unique(self.data, "data", element)
+            elif tag == "mesh":
+                self._add_unique(self.meshes, "mesh", element)
+                self.mesh_data[element.get("name")] = {
+                    child.get("name") for child in element if child.tag == "use-data"}
+            elif tag == "participant":
+                self._add_unique(self.participants, "participant", element)
+                self._index_participant(element)
+            elif tag.startswith("m2n:"):
+                self.m2n.append(element)
+            elif tag.startswith("coupling-scheme:"):
+                self._index_scheme(element)
+
+    def _add_unique(self, index, kind, element):
+        name = element.get("name")
+        if name in index:
+            self.duplicates.append((kind, element))
+        else:
+            index[name] = element
+
+    def _index_participant(self, participant):
+        name = participant.get("name")
+        for child in participant:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue
+            if tag == "provide-mesh":
+                self.provided.setdefault(child.get("name"), []).append((name, child))
+                self.uses_mesh.add((name, child.get("name")))
+            elif tag == "receive-mesh":
+                self.received.append((name, child))
+                self.uses_mesh.add((name, child.get("name")))
+            elif tag == "read-data":
+                self.read_data.append((name, child))
+            elif tag == "write-data":
+                self.write_data.append((name, child))
+            elif tag.startswith("mapping:"):
+                self.mappings.append((name, child))
+                if child.get("direction") == "read":
+                    self.read_mappings.setdefault((name, child.get("to")), set()).add(child.get("from"))
+                elif child.get("direction") == "write":
+                    self.write_mappings.setdefault((name, child.get("from")), set()).add(child.get("to"))
+
+    def _index_scheme(self, scheme):
+        self.schemes.append(scheme)
+        for child in scheme:
+            if child.tag == "exchange":
+                self.exchanges.append((scheme, child))
+                data = child.get("data")
+                self.exchanges_to.setdefault((child.get("to"), data), set()).add(child.get("mesh"))
+                self.exchanges_from.setdefault((child.get("from"), data), set()).add(child.get("mesh"))
+
+
+def _scheme_participants(scheme):
+    """Names of the participants of a coupling scheme (first/second or the multi list)."""
+    names = []
+    for child in scheme:
+        if child.tag == "participants":
+            names.extend(value for key, value in child.items() if key in ("first", "second", "name"))
+        elif child.tag == "participant":
+            names.append(child.get("name"))
+    return names
+
+
+def check_definitions(index):
+    """Names are unique and every referenced data, mesh and participant is defined."""
+    for kind, element in index.duplicates:
+        yield ValidationIssue("duplicate-name", f"{kind} \"{element.get('name')}\" is defined more than once",
+                              element.sourceline)
+    for mesh, used in index.mesh_data.items():
+        for data in sorted(used - index.data.keys()):
+            yield ValidationIssue("unknown-data", f"mesh \"{mesh}\" uses undefined data \"{data}\"",
+                                  index.meshes[mesh].sourceline)
+    for mesh, providers in index.provided.items():
+        if mesh not in index.meshes:
+            yield ValidationIssue("unknown-mesh", f"participant \"{providers[0][0]}\" provides undefined mesh \"{mesh}\"",
+                                  providers[0][1].sourceline)
+        if len(providers) > 1:
+            names = ", ".join(participant for participant, _ in providers)
+            yield ValidationIssue("mesh-provided-twice", f"mesh \"{mesh}\" is provided by {names}",
+                                  providers[1][1].sourceline)
+
+
+def check_meshes(index):
+    """Every mesh is provided by one participant and received only from its provider."""
+    for mesh, element in index.meshes.items():
+        if mesh not in index.provided:
+            yield ValidationIssue("mesh-not-provided", f"mesh \"{mesh}\" is not provided by any participant",
+                                  element.sourceline)
+    for participant, receive in index.received:
+        mesh = receive.get("name")
+        providers = [name for name, _ in index.provided.get(mesh, [])]
+        if mesh not in index.meshes:
+            yield ValidationIssue("unknown-mesh", f"participant \"{participant}\" receives undefined mesh \"{mesh}\"",
+                                  receive.sourceline)
+        elif providers and receive.get("from") not in providers:
+            yield ValidationIssue("receive-from",
+                                  f"participant \"{participant}\" receives mesh \"{mesh}\" from "
+                                  f"\"{receive.get('from')}\", but it is provided by \"{providers[0]}\"",
+                                  receive.sourceline)
+
+
+def check_data_access(index):
+    """Read and write data are used on meshes of the participant that carry the data."""
+    for participant, access in index.read_data + index.write_data:
+        mesh = access.get("mesh")
+        data = access.get("name")
+        if (participant, mesh) not in index.uses_mesh:
+            yield ValidationIssue("participant-mesh",
+                                  f"participant \"{participant}\" accesses data \"{data}\" on mesh \"{mesh}\" "
+                                  "which it neither provides nor receives", access.sourceline)
+        elif data not in index.mesh_data.get(mesh, ()):
+            yield ValidationIssue("data-on-mesh", f"mesh \"{mesh}\" does not use data \"{data}\"", access.sourceline)
+
+    for participant, mapping in index.mappings:
+        for mesh in (mapping.get("from"), mapping.get("to")):
+            if (participant, mesh) not in index.uses_mesh:
+                yield ValidationIssue("participant-mesh",
+                                      f"mapping of participant \"{participant}\" uses mesh \"{mesh}\" "
+                                      "which the participant neither provides nor receives", mapping.sourceline)
+
+
+def check_data_paths(index):
+    """
+    Every read-data is reached by an exchange, directly or through a read mapping of the participant,
+    and written data leave the participant the same way.
+    """
+    for participant, read in index.read_data:
+        mesh, data = read.get("mesh"), read.get("name")
+        exchanged = index.exchanges_to.get((participant, data), set())
+        # the data arrive on the mesh itself (possibly after a write mapping of the sender) or on a mapped mesh
+        if mesh in exchanged or exchanged & index.read_mappings.get((participant, mesh), set()):
+            continue
+        yield ValidationIssue("read-data-path",
+                              f"participant \"{participant}\" reads data \"{data}\" on mesh \"{mesh}\", but no "
+                              "exchange or mapping provides it there", read.sourceline)
+
+    for participant, write in index.write_data:
+        mesh, data = write.get("mesh"), write.get("name")
+        exchanged = index.exchanges_from.get((participant, data), set())
+        if not exchanged or mesh in exchanged or exchanged & index.write_mappings.get((participant, mesh), set()):
+            continue
+        yield ValidationIssue("write-data-path",
+                              f"participant \"{participant}\" writes data \"{data}\" on mesh \"{mesh}\", but "
+                              "neither that mesh nor a mapping of it is exchanged", write.sourceline)
+
+
+def check_exchanges(index):
+    """Exchanges connect scheme participants on a mesh that both sides use."""
+    for scheme, exchange in index.exchanges:
+        participants = _scheme_participants(scheme)
+        mesh, data = exchange.get("mesh"), exchange.get("data")
+        for side in ("from", "to"):
+            participant = exchange.get(side)
+            if participant not in index.participants:
+                yield ValidationIssue("unknown-participant", f"exchange of \"{data}\" {side} undefined participant "
+                                      f"\"{participant}\"", exchange.sourceline)
+            elif participants and participant not in participants:
+                yield ValidationIssue("scheme-participant", f"exchange of \"{data}\" {side} \"{participant}\" who is "
+                                      f"not a participant of {scheme.tag}", exchange.sourceline)
+            elif (participant, mesh) not in index.uses_mesh:
+                yield ValidationIssue("exchange-mesh", f"exchange of \"{data}\" on mesh \"{mesh}\": participant "
+                                      f"\"{participant}\" neither provides nor receives the mesh", exchange.sourceline)
+        if data not in index.mesh_data.get(mesh, ()):
+            yield ValidationIssue("data-on-mesh", f"exchanged data \"{data}\" is not used by mesh \"{mesh}\"",
+                                  exchange.sourceline)
+
+
+def check_m2n(index):
+    """There is exactly one m2n per pair of participants that exchange data."""
+    pairs = {}
+    for m2n in index.m2n:
+        pair = frozenset((m2n.get("acceptor"), m2n.get("connector")))
+        if pair in pairs:
+            yield ValidationIssue("duplicate-m2n", "more than one m2n between \"{}\" and \"{}\"".format(
+                m2n.get("acceptor"), m2n.get("connector")), m2n.sourceline)
+        pairs[pair] = m2n
+        for side in ("acceptor", "connector"):
+            if m2n.get(side) not in index.participants:
+                yield ValidationIssue("unknown-participant", f"m2n {side} \"{m2n.get(side)}\" is not defined",
+                                      m2n.sourceline)
+    reported = set()
+    for _, exchange in index.exchanges:
+        pair = frozenset((exchange.get("from"), exchange.get("to")))
+        if pair not in pairs and pair not in reported:
+            reported.add(pair)
+            yield ValidationIssue("missing-m2n", "no m2n between \"{}\" and \"{}\", which exchange data".format(
+                exchange.get("from"), exchange.get("to")), exchange.sourceline)
+
+
+def check_multi_control(index):
+    """A multi scheme has one control participant, which takes part in every exchange of the scheme."""
+    for scheme in index.schemes:
+        if scheme.tag != "coupling-scheme:multi":
+            continue
+        controls = [child.get("name") for child in scheme if child.tag == "participant" and child.get("control") == "yes"]
+        if len(controls) != 1:
+            yield ValidationIssue("multi-control", f"{scheme.tag} has {len(controls)} control participants instead of one",
+                                  scheme.sourceline)
+            continue
+        for child in scheme:
+            if child.tag == "exchange" and controls[0] not in (child.get("from"), child.get("to")):
+                yield ValidationIssue("multi-control", f"exchange of \"{child.get('data')}\" from \"{child.get('from')}\" "
+                                      f"to \"{child.get('to')}\" does not involve the control participant "
+                                      f"\"{controls[0]}\"", child.sourceline)
+
+
+def check_scheme_data(index):
+    """Acceleration data and convergence measures refer to data exchanged in the same scheme."""
+    for scheme in index.schemes:
+        exchanged = {(child.get("data"), child.get("mesh")) for child in scheme if child.tag == "exchange"}
+        for child in scheme:
+            if not isinstance(child.tag, str):
+                continue
+            if child.tag.endswith("convergence-measure") and child.get("data") is not None:
+                if (child.get("data"), child.get("mesh")) not in exchanged:
+                    yield ValidationIssue("convergence-data", f"convergence measure of \"{child.get('data')}\" on "
+                                          f"mesh \"{child.get('mesh')}\" which is not exchanged in {scheme.tag}",
+                                          child.sourceline)
+            elif child.tag.startswith("acceleration:"):
+                for data in child:
+                    if data.tag == "data" and (data.get("name"), data.get("mesh")) not in exchanged:
+                        yield ValidationIssue("acceleration-data", f"acceleration of \"{data.get('name')}\" on mesh "
+                                              f"\"{data.get('mesh')}\" which is not exchanged in {scheme.tag}",
+                                              data.sourceline)
+
+
+# Checks in the order their issues are reported
+CHECKS = (
+    check_definitions,
+    check_meshes,
+    check_data_access,
+    check_data_paths,
+    check_exchanges,
+    check_m2n,
+    check_multi_control,
+    check_scheme_data,
+)
+
+
+def validate_tree(xml_tree) -> list:
+    """
+    Check the structural rules of a parsed preCICE configuration.
+
+    Returns:
+      list[ValidationIssue]: The violated rules, empty if the configuration is consistent.
+    """
+    index = ConfigIndex(xml_tree.getroot())
+    issues = []
+    for check in CHECKS:
+        issues.extend(check(index))
+    return issues
+
+
+def validate_file(file_path) -> list:
+    """
+    Check the structural rules of the preCICE configuration file at the given path.
+
+    Returns:
+      list[ValidationIssue]: The violated rules.
+
+    Raises:
+      OSError, etree.XMLSyntaxError: If the file can not be read or parsed.
+    """
+    with open(file_path, 'rb') as xml_file:
+        content = xml_file.read()
+    return validate_tree(PrettyPrinter.parse_xml(content))
+
+
+def _validateWorker(file_path):
+    """
+    Validate one file in a worker process.
+
+    Returns:
+      tuple: (path, issues or None if the file could not be parsed, message)
+    """
+    try:
+        return file_path, validate_file(file_path), ""
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def validate_files(paths, jobs=None):
+    """
+    Validate many preCICE configuration files in parallel.
+
+    Parameters:
+      paths (list): Files, directories or glob patterns.
+      jobs (int): Number of worker processes, defaults to the number of cores.
+
+    Returns:
+      dict: file -> list of issues, None for files that could not be parsed.
+    """
+    results = {}
+    for file_path, issues, message in map_parallel(_validateWorker, expand_paths(paths), jobs):
+        results[file_path] = issues
+        if issues is None:
+            print(f"Could not parse \"{file_path}\": {message}")
+            continue
+        for issue in issues:
+            print(f"{file_path}:{issue}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="precice-genesis validate",
+                                     description="Checks the structure of preCICE configuration files.")
+    parser.add_argument("paths", nargs="+",
+                        help=f"Files, directories (searched for {DEFAULT_PATTERN}) or glob patterns.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of parallel processes (default: all cores).")
+    args = parser.parse_args(argv)
+
+    results = validate_files(args.paths, jobs=args.jobs)
+    unparsable = sum(1 for issues in results.values() if issues is None)
+    invalid = sum(1 for issues in results.values() if issues)
+    print("{} file(s) checked, {} with issues, {} could not be parsed.".format(len(results), invalid, unparsable))
+    if unparsable:
+        return 2
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
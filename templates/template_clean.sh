@@ -8,6 +8,7 @@
 #                - clean.sh
 #                - README.md
 #                - precice-config.xml
+#                - placement.md
 #                - *-*/adapter-config.json
 #                - *-*/run.sh
 # Usage: ./clean.sh [--dry-run]
@@ -24,6 +25,7 @@ PRESERVE_FILES=(
     "clean.sh"
     "README.md"
     "precice-config.xml"
+    "placement.md"
     "*-*/adapter-config.json"
     "*-*/run.sh"
 )
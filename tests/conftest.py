@@ -0,0 +1,48 @@
+import copy
+import xml.parsers.expat
+
+import pytest
+import yaml
+from lxml import etree
+
+from FileGenerator import FileGenerator
+
+# A strongly coupled fluid-structure pair, the tests change the parts of it they are about
+TOPOLOGY = {
+    "coupling-scheme": {"max-time": 1e-1, "time-window-size": 1e-3, "relative-accuracy": 1e-4},
+    "participants": {"Fluid": "SU2", "Solid": "Calculix"},
+    "exchanges": [
+        {"from": "Fluid", "from-patch": "interface", "to": "Solid", "to-patch": "surface",
+         "data": "Force", "type": "strong"},
+        {"from": "Solid", "from-patch": "surface", "to": "Fluid", "to-patch": "interface",
+         "data": "Displacement", "type": "strong"},
+    ],
+}
+
+
+def parse_config(path):
+    """ parses a generated preCICE config, which has to be well-formed XML. preCICE does not declare the namespace
+    prefixes of its tags (data:, m2n:, ...), lxml keeps them in the tag names when it recovers from that only. """
+    content = path.read_bytes()
+    xml.parsers.expat.ParserCreate().Parse(content, True)
+    return etree.fromstring(content, etree.XMLParser(recover=True))
+
+
+@pytest.fixture
+def topology():
+    """ a copy of TOPOLOGY, which the test may change """
+    return copy.deepcopy(TOPOLOGY)
+
+
+@pytest.fixture
+def generate(tmp_path, topology):
+    """ returns a function that writes a topology (the topology fixture by default) into tmp_path and generates
+    its preCICE config into output_path (tmp_path by default), the keyword arguments are passed to the
+    FileGenerator. The function returns the generator and the root of the parsed config. """
+    def generate_config(topology=topology, output_path=tmp_path, **options):
+        topology_file = tmp_path / "topology.yaml"
+        topology_file.write_text(yaml.safe_dump(topology))
+        generator = FileGenerator(topology_file, output_path, **options)
+        generator._generate_precice_config()
+        return generator, parse_config(generator.structure.precice_config)
+    return generate_config
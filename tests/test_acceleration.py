@@ -0,0 +1,51 @@
+def _acceleration(root):
+    scheme = next(child for child in root if child.tag.startswith("coupling-scheme:"))
+    acceleration_tag = next(child for child in scheme if child.tag.startswith("acceleration:"))
+    children = {child.tag: dict(child.attrib) for child in acceleration_tag if child.tag != "data"}
+    data = [(child.get("name"), child.get("mesh")) for child in acceleration_tag if child.tag == "data"]
+    return acceleration_tag.tag, children, data
+
+
+def test_default_acceleration_is_tuned(generate):
+    tag, children, data = _acceleration(generate()[1])
+    assert tag == "acceleration:IQN-ILS"
+    assert data == [("Force", "Solid-Mesh"), ("Displacement", "Solid-Mesh")]
+    assert children["initial-relaxation"] == {"value": "0.1"}
+    assert children["max-used-iterations"] == {"value": "100"}
+    assert children["time-windows-reused"] == {"value": "10"}
+    assert children["filter"] == {"type": "QR2", "limit": "0.01"}
+    # data of different magnitude need a preconditioner
+    assert children["preconditioner"] == {"type": "residual-sum"}
+
+
+def test_small_interface_limits_the_used_iterations(topology, generate):
+    topology["participants"] = {"Fluid": {"solver": "SU2", "vertices": 20}, "Solid": {"solver": "Calculix", "vertices": 20}}
+    tag, children, data = _acceleration(generate()[1])
+    # two vector data on 20 vertices are 120 unknowns
+    assert children["max-used-iterations"] == {"value": "60"}
+
+
+def test_imvj_settings_from_topology(topology, generate):
+    topology["coupling-scheme"]["acceleration"] = {
+        "type": "IQN-IMVJ", "initial-relaxation": 0.5, "filter": {"type": "QR3"},
+        "preconditioner": {"type": "residual", "freeze-after": 20},
+        "imvj-restart-mode": {"type": "RS-SVD", "chunk-size": 8}}
+    tag, children, data = _acceleration(generate()[1])
+    assert tag == "acceleration:IQN-IMVJ"
+    assert children["initial-relaxation"] == {"value": "0.5"}
+    assert children["time-windows-reused"] == {"value": "0"}
+    assert children["filter"] == {"type": "QR3", "limit": "0.01"}
+    assert children["preconditioner"] == {"type": "residual", "freeze-after": "20"}
+    assert children["imvj-restart-mode"] == {"type": "RS-SVD", "chunk-size": "8"}
+
+
+def test_constant_and_aitken_acceleration(topology, generate):
+    topology["coupling-scheme"]["acceleration"] = {"type": "constant", "relaxation": 0.3}
+    tag, children, data = _acceleration(generate()[1])
+    assert tag == "acceleration:constant"
+    assert children == {"relaxation": {"value": "0.3"}} and data == []
+
+    topology["coupling-scheme"]["acceleration"] = {"type": "aitken"}
+    tag, children, data = _acceleration(generate()[1])
+    assert tag == "acceleration:aitken"
+    assert children == {"initial-relaxation": {"value": "0.1"}} and len(data) == 2
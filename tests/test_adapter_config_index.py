@@ -0,0 +1,72 @@
+import json
+
+from generation_utils.AdapterConfigGenerator import AdapterConfigIndex, main
+
+MULTI_MESH_CONFIG = """<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+    <data:vector name="Force"/>
+    <data:vector name="Displacement"/>
+    <data:scalar name="Temperature"/>
+    <data:scalar name="Heat-Flux"/>
+    <mesh name="Fluid-Wall" dimensions="3"><use-data name="Force"/><use-data name="Displacement"/></mesh>
+    <mesh name="Fluid-Inlet" dimensions="3"><use-data name="Temperature"/><use-data name="Heat-Flux"/></mesh>
+    <mesh name="Solid-Mesh" dimensions="3"><use-data name="Force"/><use-data name="Displacement"/></mesh>
+    <mesh name="Heater-Mesh" dimensions="3"><use-data name="Temperature"/><use-data name="Heat-Flux"/></mesh>
+    <participant name="Fluid">
+        <provide-mesh name="Fluid-Wall"/>
+        <provide-mesh name="Fluid-Inlet"/>
+        <receive-mesh name="Solid-Mesh" from="Solid"/>
+        <write-data name="Force" mesh="Fluid-Wall"/>
+        <read-data name="Displacement" mesh="Fluid-Wall"/>
+        <write-data name="Heat-Flux" mesh="Fluid-Inlet"/>
+        <read-data name="Temperature" mesh="Fluid-Inlet"/>
+    </participant>
+    <participant name="Solid">
+        <provide-mesh name="Solid-Mesh"/>
+        <write-data name="Displacement" mesh="Solid-Mesh"/>
+        <read-data name="Force" mesh="Solid-Mesh"/>
+    </participant>
+    <participant name="Heater">
+        <provide-mesh name="Heater-Mesh"/>
+        <write-data name="Temperature" mesh="Heater-Mesh"/>
+        <read-data name="Heat-Flux" mesh="Heater-Mesh"/>
+    </participant>
+</precice-configuration>
+"""
+
+TOPOLOGY = {
+    "exchanges": [
+        {"from": "Fluid", "from-patch": "wall", "to": "Solid", "to-patch": "surface", "data": "Force"},
+        {"from": "Solid", "from-patch": "surface", "to": "Fluid", "to-patch": "wall", "data": "Displacement"},
+        {"from": "Heater", "from-patch": "coil", "to": "Fluid", "to-patch": "inlet", "data": "Temperature"},
+        {"from": "Fluid", "from-patch": "inlet", "to": "Heater", "to-patch": "coil", "data": "Heat-Flux"},
+    ]
+}
+
+
+def test_participant_with_several_meshes_gets_several_interfaces(tmp_path):
+    config = tmp_path / "precice-config.xml"
+    config.write_text(MULTI_MESH_CONFIG)
+    index = AdapterConfigIndex(config, TOPOLOGY)
+
+    fluid = index.adapter_config("Fluid")
+    assert fluid["participant_name"] == "Fluid"
+    assert fluid["interfaces"] == [
+        {"mesh_name": "Fluid-Wall", "patches": ["wall"],
+         "write_data_names": ["Force"], "read_data_names": ["Displacement"]},
+        {"mesh_name": "Fluid-Inlet", "patches": ["inlet"],
+         "write_data_names": ["Heat-Flux"], "read_data_names": ["Temperature"]},
+    ]
+    assert index.adapter_config("Heater")["interfaces"][0]["patches"] == ["coil"]
+    assert index.adapter_config("Unknown") is None
+
+
+def test_command_writes_all_participants(tmp_path):
+    config = tmp_path / "precice-config.xml"
+    config.write_text(MULTI_MESH_CONFIG)
+    assert main([str(config), "-o", str(tmp_path / "adapters")]) == 0
+    written = sorted(path.parent.name for path in (tmp_path / "adapters").glob("*/adapter-config.json"))
+    assert written == ["Fluid", "Heater", "Solid"]
+    solid = json.loads((tmp_path / "adapters" / "Solid" / "adapter-config.json").read_text())
+    assert solid["precice_config_file_name"] == "../../precice-config.xml"
+    assert solid["interfaces"][0]["patches"] == []
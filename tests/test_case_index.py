@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from generation_utils.CaseIndex import CaseIndex
+
+PARTICIPANTS = {"Fluid": "SU2", "Solid": "Calculix"}
+EXCHANGES = [
+    {"from": "Fluid", "to": "Solid", "data": "Force", "type": "strong"},
+    {"from": "Solid", "to": "Fluid", "data": "Displacement", "type": "strong"},
+]
+
+
+def _write_case(case_dir: Path, scheme: str) -> Path:
+    case_dir.mkdir(parents=True)
+    (case_dir / "precice-config.xml").write_text(
+        f"<precice-configuration><coupling-scheme:{scheme}/></precice-configuration>")
+    return case_dir
+
+
+def test_upsert_and_query(tmp_path):
+    topology = tmp_path / "topology.yaml"
+    topology.write_text("participants: {}")
+    with CaseIndex(tmp_path / "index.sqlite") as index:
+        index.upsert_case(_write_case(tmp_path / "a", "parallel-implicit"), topology, PARTICIPANTS, EXCHANGES,
+                          timings={"level_0": 0.5}, version="1.0")
+        index.upsert_case(_write_case(tmp_path / "b", "parallel-explicit"), topology,
+                          {"Fluid": "OpenFOAM", "Solid": "Calculix"}, EXCHANGES, timings={"level_0": 2.0},
+                          version="2.0")
+        # regenerating a case replaces its row instead of adding a second one
+        index.upsert_case(tmp_path / "a", topology, PARTICIPANTS, EXCHANGES,
+                          timings={"level_0": 1.0, "level_0/validate": 0.4}, version="1.0")
+
+        assert [r["case"] for r in index.query(solvers=["su2", "CALCULIX"])] == [str((tmp_path / "a").resolve())]
+        assert len(index.query(solvers=["Calculix"])) == 2
+        assert [r["coupling_schemes"] for r in index.query(scheme="parallel-explicit")] == [["parallel-explicit"]]
+        assert [r["generator_version"] for r in index.query(version="1.0")] == ["1.0"]
+        assert index.query(slowest=1)[0]["case"] == str((tmp_path / "b").resolve())
+        # the validation is part of level_0 and does not count twice
+        assert [r["generation_seconds"] for r in index.query(slowest=2)] == [2.0, 1.0]
+        assert index.query(data="Temperature") == []
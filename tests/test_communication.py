@@ -0,0 +1,56 @@
+import yaml
+
+
+def _m2n(generated):
+    _, root = generated
+    m2n = [child for child in root if child.tag.startswith("m2n:")]
+    intra_comm = [child.tag for participant in root.iter("participant") for child in participant
+                  if child.tag.startswith("intra-comm:")]
+    assert len(m2n) == 1
+    return m2n[0].tag, dict(m2n[0].attrib), intra_comm
+
+
+def test_default_communication(tmp_path, generate):
+    tag, attributes, intra_comm = _m2n(generate(output_path=tmp_path / "case"))
+    assert tag == "m2n:sockets"
+    assert attributes == {"acceptor": "Fluid", "connector": "Solid", "exchange-directory": "../"}
+    assert intra_comm == []
+
+
+def test_socket_settings_and_case_exchange_directory(tmp_path, topology, generate):
+    topology["communication"] = {
+        "network": "ib0", "port": 50000, "exchange-directory": "/tmp/precice/{case}", "intra-comm": "mpi"}
+    tag, attributes, intra_comm = _m2n(generate(output_path=tmp_path / "case"))
+    assert attributes["network"] == "ib0" and attributes["port"] == "50000"
+    assert attributes["exchange-directory"].startswith("/tmp/precice/case-")
+    assert intra_comm == ["intra-comm:mpi", "intra-comm:mpi"]
+
+
+def test_mpi_m2n_from_site_config(tmp_path, topology, generate):
+    site_config = tmp_path / "site.yaml"
+    site_config.write_text(yaml.safe_dump(
+        {"communication": {"type": "mpi", "network": "ib0", "exchange-directory": "/scratch/local"}}))
+    tag, attributes, intra_comm = _m2n(generate(output_path=tmp_path / "case", site_config=site_config))
+    assert tag == "m2n:mpi"
+    assert "network" not in attributes and attributes["exchange-directory"].startswith("/scratch/local/case-")
+    # the topology takes precedence over the site config
+    topology["communication"] = {"type": "sockets"}
+    tag, attributes, intra_comm = _m2n(generate(output_path=tmp_path / "case", site_config=site_config))
+    assert tag == "m2n:sockets" and attributes["network"] == "ib0"
+
+
+def test_initialization_follows_ranks_and_interface_size(topology, generate):
+    topology["participants"] = {"Fluid": {"solver": "SU2", "ranks": 480}, "Solid": {"solver": "Calculix", "ranks": 64}}
+    tag, attributes, _ = _m2n(generate())
+    assert attributes["use-two-level-initialization"] == "true"
+    assert "enforce-gather-scatter" not in attributes
+
+    topology["participants"] = {"Fluid": {"solver": "SU2", "ranks": 8, "vertices": 200},
+                                "Solid": {"solver": "Calculix", "vertices": 300}}
+    tag, attributes, _ = _m2n(generate())
+    assert attributes["enforce-gather-scatter"] == "true"
+    assert "use-two-level-initialization" not in attributes
+
+    topology["communication"] = {"enforce-gather-scatter": False}
+    tag, attributes, _ = _m2n(generate())
+    assert "enforce-gather-scatter" not in attributes
@@ -0,0 +1,30 @@
+def _scheme(root):
+    return next(child for child in root if child.tag.startswith("coupling-scheme:"))
+
+
+def _measures(scheme):
+    return {child.get("data"): (child.tag, {k: v for k, v in child.attrib.items() if k.endswith("limit")})
+            for child in scheme if child.tag.endswith("-convergence-measure")}
+
+
+def test_measures_follow_the_quantities(generate):
+    measures = _measures(_scheme(generate()[1]))
+    assert measures["Force"] == ("relative-convergence-measure", {"limit": "0.0001"})
+    assert measures["Displacement"] == ("absolute-or-relative-convergence-measure",
+                                        {"abs-limit": "1e-09", "rel-limit": "0.0001"})
+
+
+def test_scheme_settings_are_honored(topology, generate):
+    topology["coupling-scheme"].update({"relative-accuracy": "1e-3", "max-iterations": 30, "min-iterations": 2})
+    scheme = _scheme(generate()[1])
+    assert scheme.find("max-iterations").get("value") == "30"
+    assert scheme.find("min-iterations").get("value") == "2"
+    assert _measures(scheme)["Force"][1] == {"limit": "0.001"}
+
+
+def test_exchange_convergence_overrides_the_defaults(topology, generate):
+    topology["exchanges"][0]["convergence"] = {"measure": "residual-relative", "limit": 1e-2}
+    topology["exchanges"][1]["convergence"] = {"measure": "absolute", "limit": 1e-6}
+    measures = _measures(_scheme(generate()[1]))
+    assert measures["Force"] == ("residual-relative-convergence-measure", {"limit": "0.01"})
+    assert measures["Displacement"] == ("absolute-convergence-measure", {"limit": "1e-06"})
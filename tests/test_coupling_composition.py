@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import yaml
+from lxml import etree
+
+from FileGenerator import FileGenerator
+from controller_utils.precice_struct.PS_CouplingScheme import PS_ImplicitCoupling
+from generation_utils.validate_precice_config import validate_file
+
+
+def _topology(fsi_type, cht_type):
+    return {
+        "coupling-scheme": {"max-time": 1e-1, "time-window-size": 1e-3, "relative-accuracy": 1e-4},
+        "participants": {"Fluid": "OpenFOAM", "Solid": "Calculix", "Heat": "FEniCS"},
+        "exchanges": [
+            {"from": "Fluid", "from-patch": "interface", "to": "Solid", "to-patch": "surface",
+             "data": "Force", "type": fsi_type},
+            {"from": "Solid", "from-patch": "surface", "to": "Fluid", "to-patch": "interface",
+             "data": "Displacement", "type": fsi_type},
+            {"from": "Fluid", "from-patch": "interface", "to": "Heat", "to-patch": "surface",
+             "data": "Temperature", "type": cht_type},
+            {"from": "Heat", "from-patch": "surface", "to": "Fluid", "to-patch": "interface",
+             "data": "Heat-Flux", "type": cht_type},
+        ],
+    }
+
+
+def _schemes(tmp_path, topology):
+    """ returns (type, participants, exchanged pairs, converged data) of every coupling scheme """
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(yaml.safe_dump(topology, sort_keys=False))
+    generator = FileGenerator(topology_file, tmp_path)
+    generator._generate_precice_config()
+    root = etree.parse(str(generator.structure.precice_config), etree.XMLParser(recover=True)).getroot()
+    schemes = []
+    for scheme in root:
+        if not scheme.tag.startswith("coupling-scheme:"):
+            continue
+        names = {value for child in scheme if child.tag in ("participant", "participants")
+                 for key, value in child.attrib.items() if key in ("first", "second", "name")}
+        exchanged = {frozenset((child.get("from"), child.get("to"))) for child in scheme if child.tag == "exchange"}
+        converged = [child.get("data") for child in scheme if child.tag.endswith("convergence-measure")]
+        schemes.append((scheme.tag.split(":", 1)[1], names, exchanged, converged))
+    return schemes
+
+
+def test_weak_pair_gets_its_own_explicit_scheme(tmp_path):
+    schemes = _schemes(tmp_path, _topology("strong", "weak"))
+    assert len(schemes) == 2
+    implicit, explicit = sorted(schemes, key=lambda scheme: scheme[0].endswith("-explicit"))
+    assert implicit[0] == "parallel-implicit" and implicit[1] == {"Fluid", "Solid"}
+    assert implicit[2] == {frozenset(("Fluid", "Solid"))}
+    assert sorted(implicit[3]) == ["Displacement", "Force"]
+    assert explicit[0].endswith("-explicit") and explicit[1] == {"Fluid", "Heat"}
+    assert explicit[2] == {frozenset(("Fluid", "Heat"))}
+    assert explicit[3] == []
+
+
+def test_several_strong_pairs_share_one_multi_scheme(tmp_path):
+    schemes = _schemes(tmp_path, _topology("strong", "strong"))
+    assert len(schemes) == 1
+    scheme_type, names, exchanged, converged = schemes[0]
+    assert scheme_type == "multi" and names == {"Fluid", "Solid", "Heat"}
+    assert exchanged == {frozenset(("Fluid", "Solid")), frozenset(("Fluid", "Heat"))}
+    assert len(converged) == 4
+
+
+def test_weak_pairs_only_are_explicit(tmp_path):
+    schemes = _schemes(tmp_path, _topology("weak", "weak"))
+    assert [scheme[0].split("-")[1] for scheme in schemes] == ["explicit", "explicit"]
+
+
+def _cycle(bytes_ab, bytes_bc, bytes_ca, ranks):
+    solvers = {name: SimpleNamespace(name=name, ranks=ranks.get(name)) for name in "ABC"}
+    flows = [("A", "B", bytes_ab), ("B", "C", bytes_bc), ("C", "A", bytes_ca)]
+    config = SimpleNamespace(solvers=solvers, placements=[
+        SimpleNamespace(sender=solvers[sender], receiver=solvers[receiver], exchange_bytes=exchange_bytes)
+        for sender, receiver, exchange_bytes in flows])
+    scheme = PS_ImplicitCoupling()
+    for sender, receiver, _ in flows:
+        scheme.add_pair(solvers[sender], solvers[receiver], True)
+    return scheme, config
+
+
+def test_control_participant_gathers_the_fewest_bytes():
+    # A takes part in the two expensive exchanges and leaves only the small one from B to C
+    scheme, config = _cycle(1000, 10, 1000, {"C": 64})
+    assert scheme.choose_control_participant(config) == "A"
+    # on a tie the acceleration is computed on the participant with the most ranks
+    scheme, config = _cycle(100, 100, 100, {"A": 2, "C": 64})
+    assert scheme.choose_control_participant(config) == "C"
+    assert "runs on 64 ranks" in scheme.describe(config)
+
+
+def test_chain_is_controlled_by_a_participant_of_every_exchange(tmp_path, capsys):
+    exchanges = []
+    for first, second in [("A", "B"), ("B", "C"), ("C", "D")]:
+        exchanges += [{"from": first, "from-patch": "interface", "to": second, "to-patch": "interface",
+                       "data": "Force", "type": "strong"},
+                      {"from": second, "from-patch": "interface", "to": first, "to-patch": "interface",
+                       "data": "Displacement", "type": "strong"}]
+    topology = {"coupling-scheme": {"max-time": 1e-1, "time-window-size": 1e-3, "relative-accuracy": 1e-4},
+                "participants": {"A": "OpenFOAM", "B": "Calculix", "C": "FEniCS", "D": "SU2"},
+                "exchanges": exchanges}
+    schemes = _schemes(tmp_path, topology)
+    root = etree.parse(str(tmp_path / "_generated" / "precice-config.xml"), etree.XMLParser(recover=True)).getroot()
+    multi = next(scheme for scheme in root if scheme.tag == "coupling-scheme:multi")
+    assert [child.get("name") for child in multi.iter("participant") if child.get("control") == "yes"] == ["B"]
+    m2n_pairs = {frozenset((m2n.get("acceptor"), m2n.get("connector"))) for m2n in root if m2n.tag.startswith("m2n:")}
+    assert frozenset(("B", "A")) in m2n_pairs and frozenset(("B", "C")) in m2n_pairs
+    # C and D exchange data without B, they can not iterate in the scheme B controls
+    assert schemes[0][1:3] == ({"A", "B", "C"}, {frozenset(("A", "B")), frozenset(("B", "C"))})
+    assert schemes[1][:3] == ("parallel-explicit", {"C", "D"}, {frozenset(("C", "D"))})
+    assert validate_file(tmp_path / "_generated" / "precice-config.xml") == []
+    assert "[WARNING] The strongly coupled participants C and D are coupled explicitly" in capsys.readouterr().out
@@ -0,0 +1,56 @@
+def _scheme(root):
+    return next(child for child in root if child.tag.startswith("coupling-scheme:"))
+
+
+def _set_costs(topology, costs):
+    topology["participants"] = {name: {"solver": solver, "cost-per-window": costs[name]}
+                                for name, solver in topology["participants"].items()}
+
+
+def _set_type(topology, exchange_type):
+    for exchange in topology["exchanges"]:
+        exchange["type"] = exchange_type
+
+
+def _order(scheme):
+    participants = scheme.find("participants")
+    return participants.get("first"), participants.get("second")
+
+
+def test_without_costs_two_way_pairs_stay_parallel(topology, generate):
+    assert _scheme(generate()[1]).tag == "coupling-scheme:parallel-implicit"
+    _set_type(topology, "weak")
+    assert _scheme(generate()[1]).tag == "coupling-scheme:parallel-explicit"
+
+
+def test_one_way_exchange_is_serial_explicit(topology, generate):
+    topology["exchanges"] = topology["exchanges"][:1]
+    scheme = _scheme(generate()[1])
+    assert scheme.tag == "coupling-scheme:serial-explicit"
+    assert _order(scheme) == ("Fluid", "Solid")
+    assert scheme.find("max-iterations") is None
+
+
+def test_cheap_participant_makes_implicit_coupling_serial(topology, generate):
+    # 10s + 1s serial against 1.5 * 10s parallel per time window
+    _set_costs(topology, {"Fluid": 1.0, "Solid": 10.0})
+    scheme = _scheme(generate()[1])
+    assert scheme.tag == "coupling-scheme:serial-implicit"
+    assert _order(scheme) == ("Solid", "Fluid")
+    # only the data of the second participant are accelerated
+    acceleration = next(child for child in scheme if child.tag.startswith("acceleration:"))
+    assert [data.get("name") for data in acceleration.findall("data")] == ["Force"]
+
+
+def test_similar_costs_keep_parallel_coupling(topology, generate):
+    _set_costs(topology, {"Fluid": 8.0, "Solid": 10.0})
+    assert _scheme(generate()[1]).tag == "coupling-scheme:parallel-implicit"
+    _set_costs(topology, {"Fluid": 1.0, "Solid": 10.0})
+    _set_type(topology, "weak")
+    assert _scheme(generate()[1]).tag == "coupling-scheme:parallel-explicit"
+
+
+def test_untyped_two_way_pair_is_implicit(topology, generate):
+    for exchange in topology["exchanges"]:
+        del exchange["type"]
+    assert _scheme(generate()[1]).tag == "coupling-scheme:parallel-implicit"
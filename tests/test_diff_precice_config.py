@@ -0,0 +1,77 @@
+from generation_utils.diff_precice_config import diff_files, pair_files
+
+OLD_CONFIG = """<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+    <data:vector name="Force"/>
+    <data:vector name="Displacement"/>
+    <participant name="Fluid">
+        <provide-mesh name="Fluid-Mesh"/>
+        <write-data name="Force" mesh="Fluid-Mesh"/>
+    </participant>
+    <participant name="Solid">
+        <provide-mesh name="Solid-Mesh"/>
+    </participant>
+    <coupling-scheme:parallel-implicit>
+        <exchange data="Force" mesh="Solid-Mesh" from="Fluid" to="Solid"/>
+        <exchange data="Displacement" mesh="Solid-Mesh" from="Solid" to="Fluid"/>
+        <relative-convergence-measure limit="1e-4" data="Force" mesh="Solid-Mesh"/>
+    </coupling-scheme:parallel-implicit>
+</precice-configuration>
+"""
+
+# same content: reordered children and attributes, other formatting and a comment
+REORDERED_CONFIG = """<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+  <!-- generated -->
+  <participant name="Solid"><provide-mesh name="Solid-Mesh"/></participant>
+  <participant name="Fluid"><write-data mesh="Fluid-Mesh" name="Force"/><provide-mesh name="Fluid-Mesh"/></participant>
+  <data:vector name="Displacement"/>
+  <data:vector name="Force"/>
+  <coupling-scheme:parallel-implicit>
+    <relative-convergence-measure mesh="Solid-Mesh" data="Force" limit="1e-4"/>
+    <exchange from="Solid" to="Fluid" data="Displacement" mesh="Solid-Mesh"/>
+    <exchange data="Force" mesh="Solid-Mesh" from="Fluid" to="Solid"/>
+  </coupling-scheme:parallel-implicit>
+</precice-configuration>
+"""
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def test_formatting_and_order_are_not_differences(tmp_path):
+    old = write(tmp_path / "old.xml", OLD_CONFIG)
+    new = write(tmp_path / "new.xml", REORDERED_CONFIG)
+    assert diff_files(old, new) == []
+
+
+def test_changes_are_reported_with_paths(tmp_path):
+    old = write(tmp_path / "old.xml", OLD_CONFIG)
+    new = write(tmp_path / "new.xml", OLD_CONFIG.replace('limit="1e-4"', 'limit="1e-5"').replace(
+        '<exchange data="Displacement" mesh="Solid-Mesh" from="Solid" to="Fluid"/>', '').replace(
+        '<provide-mesh name="Solid-Mesh"/>', '<provide-mesh name="Solid-Mesh"/><read-data name="Force" mesh="Solid-Mesh"/>'))
+
+    changes = {(change.kind, change.path): change for change in diff_files(old, new)}
+    scheme = "/precice-configuration/coupling-scheme:parallel-implicit"
+    assert set(changes) == {
+        ("changed", scheme + "/relative-convergence-measure[@data='Force'][@mesh='Solid-Mesh']"),
+        ("removed", scheme + "/exchange[@data='Displacement'][@mesh='Solid-Mesh'][@from='Solid'][@to='Fluid']"),
+        ("added", "/precice-configuration/participant[@name='Solid']/read-data[@name='Force'][@mesh='Solid-Mesh']"),
+    }
+    changed = changes[("changed", scheme + "/relative-convergence-measure[@data='Force'][@mesh='Solid-Mesh']")]
+    assert changed.details == ['limit: "1e-4" -> "1e-5"']
+
+
+def test_case_libraries_are_paired_by_relative_path(tmp_path):
+    write(tmp_path / "v1" / "a" / "precice-config.xml", OLD_CONFIG)
+    write(tmp_path / "v1" / "b" / "precice-config.xml", OLD_CONFIG)
+    write(tmp_path / "v2" / "a" / "precice-config.xml", REORDERED_CONFIG)
+    write(tmp_path / "v2" / "c" / "precice-config.xml", OLD_CONFIG)
+
+    pairs, only_old, only_new = pair_files(tmp_path / "v1", tmp_path / "v2")
+    assert pairs == [(tmp_path / "v1" / "a" / "precice-config.xml", tmp_path / "v2" / "a" / "precice-config.xml")]
+    assert only_old == [tmp_path / "v1" / "b" / "precice-config.xml"]
+    assert only_new == [tmp_path / "v2" / "c" / "precice-config.xml"]
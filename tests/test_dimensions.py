@@ -0,0 +1,51 @@
+import copy
+
+import yaml
+from lxml import etree
+
+from FileGenerator import FileGenerator
+
+TOPOLOGY = {
+    "coupling-scheme": {"max-time": 1e-1, "time-window-size": 1e-3, "relative-accuracy": 1e-4},
+    "participants": {"Fluid": "SU2", "Solid": "Calculix"},
+    "exchanges": [
+        {"from": "Fluid", "from-patch": "interface", "to": "Solid", "to-patch": "surface",
+         "data": "Force", "type": "strong"},
+        {"from": "Solid", "from-patch": "surface", "to": "Fluid", "to-patch": "interface",
+         "data": "Displacement", "type": "strong"},
+    ],
+}
+
+
+def _generate(tmp_path, dimensionality):
+    topology = copy.deepcopy(TOPOLOGY)
+    topology["participants"] = {name: {"solver": solver, "vertices": 1000, **(
+        {"dimensionality": dimensionality[name]} if name in dimensionality else {})}
+        for name, solver in TOPOLOGY["participants"].items()}
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(yaml.safe_dump(topology))
+    generator = FileGenerator(topology_file, tmp_path)
+    generator._generate_precice_config()
+    root = etree.parse(str(generator.structure.precice_config), etree.XMLParser(recover=True)).getroot()
+    return {mesh.get("name"): mesh.get("dimensions") for mesh in root.iter("mesh")}, generator.precice_config
+
+
+def test_two_dimensional_case(tmp_path):
+    meshes, config = _generate(tmp_path, {"Fluid": 2, "Solid": 2})
+    assert meshes == {"Fluid-Mesh": "2", "Solid-Mesh": "2"}
+    # vectors have two components on 2D meshes
+    assert {p.quantity.name: p.exchange_bytes for p in config.placements} == {"Force": 16000, "Displacement": 16000}
+
+
+def test_undeclared_participants_follow_their_partners(tmp_path):
+    meshes, _ = _generate(tmp_path, {"Fluid": 2})
+    assert meshes == {"Fluid-Mesh": "2", "Solid-Mesh": "2"}
+    meshes, _ = _generate(tmp_path, {})
+    assert meshes == {"Fluid-Mesh": "3", "Solid-Mesh": "3"}
+
+
+def test_mixed_dimensions_couple_on_three_dimensional_meshes(tmp_path):
+    meshes, config = _generate(tmp_path, {"Fluid": 2, "Solid": 3})
+    assert meshes == {"Fluid-Mesh": "3", "Solid-Mesh": "3"}
+    (names, dimensionality, reason), = config.dimensions
+    assert dimensionality == 3 and "Fluid (2D)" in reason
@@ -0,0 +1,55 @@
+import yaml
+from lxml import etree
+
+from FileGenerator import FileGenerator
+
+
+def _generate(tmp_path, topology):
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(yaml.safe_dump(topology))
+    generator = FileGenerator(topology_file, tmp_path)
+    generator._generate_precice_config()
+    return etree.parse(str(generator.structure.precice_config), etree.XMLParser(recover=True)).getroot()
+
+
+def _model(root):
+    data = [child.get("name") for child in root if child.tag.startswith("data:")]
+    use_data = {mesh.get("name"): [use.get("name") for use in mesh.iter("use-data")] for mesh in root.iter("mesh")}
+    access = {(participant.get("name"), child.tag, child.get("name")) for participant in root.iter("participant")
+              for child in participant if child.tag in ("read-data", "write-data")}
+    exchanges = [(exchange.get("data"), exchange.get("from"), exchange.get("to")) for exchange in root.iter("exchange")]
+    return data, use_data, access, exchanges
+
+
+def test_only_the_declared_exchanges_are_written(tmp_path):
+    root = _generate(tmp_path, {
+        "coupling-scheme": {"max-time": 1, "time-window-size": 1e-2, "relative-accuracy": 1e-4},
+        "participants": {"Fluid": "OpenFOAM", "Solid": "CalculiX"},
+        "exchanges": [
+            {"from": "Solid", "from-patch": "surface", "to": "Fluid", "to-patch": "interface",
+             "data": "Temperature", "type": "weak"},
+            {"from": "Solid", "from-patch": "surface", "to": "Fluid", "to-patch": "interface",
+             "data": "Temperature", "type": "weak"},
+        ],
+    })
+    data, use_data, access, exchanges = _model(root)
+    assert data == ["Temperature"]
+    assert use_data == {"Solid-Mesh": ["Temperature"], "Fluid-Mesh": ["Temperature"]}
+    assert access == {("Solid", "write-data", "Temperature"), ("Fluid", "read-data", "Temperature")}
+    assert exchanges == [("Temperature", "Solid", "Fluid")]
+    assert len(list(root.iter("mapping:nearest-neighbor"))) == 1
+
+
+def test_legacy_coupling_type_is_a_shorthand_for_exchanges(tmp_path):
+    root = _generate(tmp_path, {
+        "simulation": {"steady-state": False, "timesteps": 100, "time-window-size": 1e-3, "accuracy": "medium"},
+        "participants": {"Fluid": {"solver": "SU2", "solver-type": "fluid"},
+                         "Solid": {"solver": "Calculix", "solver-type": "structure"}},
+        "couplings": [{"cht": {"fluid": {"name": "Fluid", "interface": "inner"},
+                               "structure": {"name": "Solid", "interface": "outer"}}}],
+    })
+    data, _, access, exchanges = _model(root)
+    assert data == ["HeatTransfer", "Temperature"]
+    assert access == {("Fluid", "write-data", "HeatTransfer"), ("Fluid", "read-data", "Temperature"),
+                      ("Solid", "write-data", "Temperature"), ("Solid", "read-data", "HeatTransfer")}
+    assert exchanges == [("HeatTransfer", "Fluid", "Solid"), ("Temperature", "Solid", "Fluid")]
@@ -0,0 +1,71 @@
+from pathlib import Path
+import shutil
+import stat
+import pytest
+
+from generation_utils.format_precice_config import PrettyPrinter
+
+EXAMPLE_CONFIG = Path(__file__).parent.parent / "controller_utils" / "examples" / "1" / "precice-config.xml"
+
+UNSORTED_CONFIG = """<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+  <!-- participants first on purpose -->
+  <participant name="B"><read-data name="T" mesh="B-Mesh"/><provide-mesh name="B-Mesh"/></participant>
+  <m2n:sockets acceptor="A" connector="B"/>
+  <mesh name="B-Mesh" dimensions="2"><!-- inner comment --><use-data name="T"/></mesh>
+  <data:scalar name="T"/>
+  <participant name="A"><provide-mesh name="A-Mesh"/></participant>
+</precice-configuration>
+"""
+
+
+@pytest.mark.parametrize("content", [EXAMPLE_CONFIG.read_text(), UNSORTED_CONFIG])
+def test_streaming_matches_tree_formatting(tmp_path, content):
+    tree_file = tmp_path / "tree.xml"
+    stream_file = tmp_path / "stream.xml"
+    tree_file.write_text(content)
+    stream_file.write_text(content)
+
+    printer = PrettyPrinter(indent='    ', maxwidth=120)
+    assert printer.prettify_file(tree_file, streaming=False)
+    assert printer.prettify_file(stream_file, streaming=True)
+    assert stream_file.read_text() == tree_file.read_text()
+
+
+def test_streaming_leaves_formatted_file_untouched(tmp_path, capsys):
+    config = tmp_path / "precice-config.xml"
+    shutil.copy(EXAMPLE_CONFIG, config)
+    config.chmod(0o644)
+    printer = PrettyPrinter(indent='    ', maxwidth=120)
+    printer.prettify_file(config, streaming=True)
+    assert stat.S_IMODE(config.stat().st_mode) == 0o644
+    mtime = config.stat().st_mtime_ns
+    capsys.readouterr()
+
+    printer.prettify_file(config, streaming=True)
+    assert "No changes required" in capsys.readouterr().out
+    assert config.stat().st_mtime_ns == mtime
+    assert stat.S_IMODE(config.stat().st_mode) == 0o644
+    assert list(tmp_path.iterdir()) == [config]
+
+
+def test_format_files_check_write_and_cache(tmp_path):
+    from generation_utils.format_precice_config import format_files
+
+    for case in ("a", "b"):
+        (tmp_path / case).mkdir()
+        shutil.copy(EXAMPLE_CONFIG, tmp_path / case / "precice-config.xml")
+    cache = tmp_path / "format-cache.json"
+    original = EXAMPLE_CONFIG.read_text()
+
+    results = format_files([tmp_path], check=True, jobs=2, cache_path=cache)
+    assert len(results["changed"]) == 2
+    assert (tmp_path / "a" / "precice-config.xml").read_text() == original
+
+    results = format_files([str(tmp_path / "*" / "precice-config.xml")], jobs=2, cache_path=cache)
+    assert len(results["changed"]) == 2
+    assert (tmp_path / "a" / "precice-config.xml").read_text() != original
+
+    # the second run skips both files based on their content hash
+    results = format_files([tmp_path], check=True, cache_path=cache)
+    assert len(results["cached"]) == 2 and not results["changed"]
@@ -0,0 +1,69 @@
+from generation_utils.format_precice_config import PrettyPrinter
+from generation_utils.lint_precice_config import lint_tree
+
+SLOW_CONFIG = """<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+    <data:scalar name="Temperature"/>
+    <mesh name="A-Mesh" dimensions="3"><use-data name="Temperature"/></mesh>
+    <mesh name="B-Mesh" dimensions="3"><use-data name="Temperature"/></mesh>
+    <participant name="A">
+        <provide-mesh name="A-Mesh"/>
+        <write-data name="Temperature" mesh="A-Mesh"/>
+        <export:vtu directory="output"/>
+    </participant>
+    <participant name="B">
+        <provide-mesh name="B-Mesh"/>
+        <receive-mesh name="A-Mesh" from="A"/>
+        <read-data name="Temperature" mesh="B-Mesh"/>
+        <mapping:rbf-global-direct direction="read" from="A-Mesh" to="B-Mesh" constraint="consistent">
+            <basis-function:thin-plate-splines/>
+        </mapping:rbf-global-direct>
+    </participant>
+    <m2n:sockets acceptor="A" connector="B" exchange-directory="../"/>
+    <m2n:sockets acceptor="B" connector="A"/>
+    <coupling-scheme:parallel-implicit>
+        <participants first="A" second="B"/>
+        <max-time value="1"/>
+        <time-window-size value="0.01"/>
+        <exchange data="Temperature" mesh="A-Mesh" from="A" to="B"/>
+    </coupling-scheme:parallel-implicit>
+</precice-configuration>
+"""
+
+
+def lint(content, mesh_vertices=None):
+    return lint_tree(PrettyPrinter.parse_xml(content.encode()), mesh_vertices)
+
+
+def test_anti_patterns_are_reported_with_location_and_fix():
+    findings = {finding.rule: finding for finding in lint(SLOW_CONFIG)}
+    assert set(findings) == {"global-rbf", "implicit-without-acceleration", "one-way-implicit", "duplicate-m2n",
+                             "shared-exchange-directory", "export-every-window"}
+    one_way = findings["one-way-implicit"]
+    assert one_way.severity == "high" and "serial-explicit" in one_way.fix
+    assert one_way.line == 21 and one_way.path == "/precice-configuration/coupling-scheme:parallel-implicit"
+    assert findings["export-every-window"].path == \
+        "/precice-configuration/participant[@name='A']/export:vtu"
+
+
+def test_findings_are_ordered_by_severity():
+    severities = [finding.severity for finding in lint(SLOW_CONFIG)]
+    assert severities == sorted(severities, key=("high", "medium", "low").index)
+
+
+def test_mesh_sizes_sharpen_the_rbf_rule():
+    assert "global-rbf" not in {f.rule for f in lint(SLOW_CONFIG, {"A-Mesh": 500, "B-Mesh": 800})}
+    assert "global-rbf" in {f.rule for f in lint(SLOW_CONFIG, {"A-Mesh": 6000})}
+    large = [f for f in lint(SLOW_CONFIG, {"A-Mesh": 200000}) if f.rule == "global-rbf"]
+    assert large[0].severity == "high" and "200000" in large[0].message
+
+
+def test_bounded_quasi_newton_is_clean():
+    accelerated = SLOW_CONFIG.replace(
+        '<exchange data="Temperature" mesh="A-Mesh" from="A" to="B"/>',
+        '<exchange data="Temperature" mesh="A-Mesh" from="A" to="B"/>'
+        '<acceleration:IQN-ILS><data name="Temperature" mesh="A-Mesh"/></acceleration:IQN-ILS>')
+    rules = {f.rule for f in lint(accelerated)}
+    assert "implicit-without-acceleration" not in rules and "missing-max-used-iterations" in rules
+    bounded = accelerated.replace('</acceleration:IQN-ILS>', '<max-used-iterations value="50"/></acceleration:IQN-ILS>')
+    assert "missing-max-used-iterations" not in {f.rule for f in lint(bounded)}
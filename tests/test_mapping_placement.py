@@ -0,0 +1,62 @@
+def _placements(generator):
+    return {p.quantity.name: (p.mapper.name, p.direction, p.exchange_mesh)
+            for p in generator.precice_config.placements}
+
+
+def test_default_placement_without_hints(generate):
+    generator, _ = generate()
+    generator._generate_rationale()
+    assert _placements(generator) == {
+        "Displacement": ("Fluid", "read", "Solid-Mesh"),
+        "Force": ("Fluid", "write", "Solid-Mesh"),
+    }
+    rationale = generator.structure.placement.read_text()
+    assert "no rank or vertex hints" in rationale
+    assert "(~240000 bytes per exchange, assuming 10000 vertices)" in rationale
+
+
+def test_serial_participants_exchange_the_smaller_mesh(topology, generate):
+    topology["participants"] = {
+        "Fluid": {"solver": "SU2", "ranks": 1, "vertices": 2000},
+        "Solid": {"solver": "Calculix", "ranks": 1, "vertices": 40000},
+    }
+    generator, _ = generate()
+    assert _placements(generator) == {
+        "Displacement": ("Solid", "write", "Fluid-Mesh"),
+        "Force": ("Solid", "read", "Fluid-Mesh"),
+    }
+    config = generator.structure.precice_config.read_text()
+    # serial participants receive the whole mesh
+    assert '<receive-mesh name="Fluid-Mesh" from="Fluid" geometric-filter="no-filter"/>' in config
+    assert '<exchange data="Force" mesh="Fluid-Mesh" from="Fluid" to="Solid"/>' in config
+    assert config.count("<m2n:sockets") == 1
+
+
+def test_parallel_participants_keep_read_consistent_write_conservative(topology, generate):
+    topology["participants"] = {
+        "Fluid": {"solver": "SU2", "ranks": 64, "vertices": 2000},
+        "Solid": {"solver": "Calculix", "ranks": 4, "vertices": 40000},
+    }
+    generator, _ = generate()
+    generator._generate_rationale()
+    assert _placements(generator) == {
+        "Displacement": ("Fluid", "read", "Solid-Mesh"),
+        "Force": ("Fluid", "write", "Solid-Mesh"),
+    }
+    assert "does not run on a single rank" in generator.structure.placement.read_text()
+
+
+def test_unknown_rank_count_is_not_called_parallel(topology, generate):
+    topology["participants"] = {"Fluid": {"solver": "SU2", "vertices": 2000}, "Solid": "Calculix"}
+    generator, _ = generate()
+    generator._generate_rationale()
+    rationale = generator.structure.placement.read_text()
+    assert "rank count of Solid unknown, so only a write-conservative mapping on Fluid is possible" in rationale
+    assert "does not run on a single rank" not in rationale
+
+
+def test_write_mapping_receives_the_other_mesh(topology, generate):
+    topology["exchanges"] = topology["exchanges"][:1]
+    generator, _ = generate()
+    config = generator.structure.precice_config.read_text()
+    assert '<receive-mesh name="Solid-Mesh" from="Solid"/>' in config
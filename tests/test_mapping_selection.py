@@ -0,0 +1,40 @@
+from controller_utils.precice_struct.PS_Mapping import select_mapping, pum_vertices_per_cluster
+
+
+def test_select_mapping_thresholds():
+    assert select_mapping("consistent").method == "nearest-neighbor"
+    assert select_mapping("consistent", 10000, 10400).method == "nearest-neighbor"
+    assert select_mapping("consistent", 800, 3000).method == "rbf-global-direct"
+    # consistent mappings project on the source mesh, conservative ones on the target mesh
+    assert select_mapping("consistent", 9000, 60000, from_connectivity=True).method == "nearest-projection"
+    assert select_mapping("conservative", 9000, 60000, from_connectivity=True).method == "rbf-pum-direct"
+    assert select_mapping("conservative", to_connectivity=True).method == "nearest-projection"
+
+    pum = select_mapping("consistent", 9000, 60000)
+    assert pum.vertices_per_cluster == pum_vertices_per_cluster(60000) == 80
+    assert pum.basis_function is not None
+    assert select_mapping("consistent", 800, 3000).vertices_per_cluster is None
+
+
+def test_mappings_follow_interface_hints(topology, generate):
+    topology["participants"]["Fluid"] = {"solver": "SU2", "vertices": 200000}
+    topology["exchanges"][0]["to-vertices"] = 40000
+    generator, _ = generate()
+    generator._generate_README()
+
+    assert generator.user_ui.participants["Fluid"].solverName == "SU2"
+    assert generator.user_ui.participants["Solid"].vertices == 40000
+    config = generator.structure.precice_config.read_text()
+    assert "<mapping:rbf-pum-direct" in config
+    assert 'vertices-per-cluster="80"' in config
+    assert "<basis-function:thin-plate-splines" in config
+    assert "nearest-neighbor" not in config
+    readme = generator.structure.README.read_text(encoding="utf-8")
+    assert "rbf-pum-direct - large meshes (up to 200000 vertices)" in readme
+
+
+def test_generated_global_rbf_passes_the_lint(topology, generate, capsys):
+    topology["exchanges"][0].update({"from-vertices": 100, "to-vertices": 4000})
+    generator, _ = generate()
+    assert "<mapping:rbf-global-direct" in generator.structure.precice_config.read_text()
+    assert "[global-rbf]" not in capsys.readouterr().out
@@ -0,0 +1,83 @@
+from lxml import etree
+
+from generation_utils.port_precice_config import port_content, port_files
+
+V2_CONFIG = b"""<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+  <solver-interface dimensions="2">
+    <data:scalar name="Temperature"/>
+    <mesh name="A-Mesh"><use-data name="Temperature"/></mesh>
+    <mesh name="B-Mesh"><use-data name="Temperature"/></mesh>
+    <participant name="A">
+      <use-mesh name="A-Mesh" provide="yes"/>
+      <use-mesh name="B-Mesh" from="B"/>
+      <write-data name="Temperature" mesh="A-Mesh"/>
+      <mapping:rbf-gaussian direction="write" from="A-Mesh" to="B-Mesh" constraint="consistent"
+                            shape-parameter="5" use-qr-decomposition="true" timing="initial"/>
+      <master:sockets/>
+    </participant>
+    <participant name="B">
+      <use-mesh name="B-Mesh" provide="yes"/>
+      <read-data name="Temperature" mesh="B-Mesh"/>
+    </participant>
+    <m2n:sockets from="A" to="B"/>
+    <coupling-scheme:serial-explicit>
+      <participants first="A" second="B"/>
+      <max-time value="1"/>
+      <time-window-size value="0.1"/>
+      <exchange data="Temperature" mesh="B-Mesh" from="A" to="B"/>
+      <extrapolation-order value="1"/>
+    </coupling-scheme:serial-explicit>
+  </solver-interface>
+</precice-configuration>
+"""
+
+
+def child(element, tag):
+    """find() does not support the undeclared prefixes of preCICE tags"""
+    return next((c for c in element.iter() if c.tag == tag), None)
+
+
+def test_v2_constructs_are_ported():
+    ported, fired = port_content(V2_CONFIG)
+    assert set(fired) == {"solver-interface", "use-mesh", "m2n-acceptor-connector", "extrapolation-order",
+                          "mapping-timing", "rbf-basis-function", "intra-comm"}
+    assert fired["use-mesh"] == 3
+    for v2_construct in ("solver-interface", "use-mesh", "<m2n:sockets from=", "extrapolation-order",
+                         "timing=", "master:", "use-qr-decomposition"):
+        assert v2_construct not in ported
+
+    root = etree.fromstring(ported.encode(), etree.XMLParser(recover=True))
+    assert [mesh.get("dimensions") for mesh in root.iter("mesh")] == ["2", "2"]
+    m2n = child(root, "m2n:sockets")
+    assert (m2n.get("acceptor"), m2n.get("connector")) == ("A", "B")
+    participant = root.find("participant")
+    assert participant.find("receive-mesh").get("from") == "B"
+    mapping = child(participant, "mapping:rbf-global-direct")
+    assert mapping is not None and mapping.get("shape-parameter") is None
+    assert mapping[0].tag == "basis-function:gaussian" and mapping[0].get("shape-parameter") == "5"
+    assert child(participant, "intra-comm:sockets") is not None
+
+
+def test_ported_content_is_stable():
+    ported, _ = port_content(V2_CONFIG)
+    again, fired = port_content(ported.encode())
+    assert fired == {}
+    assert again == ported
+
+
+def test_port_files_reports_rules_per_file(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "precice-config.xml").write_bytes(V2_CONFIG)
+    ported, _ = port_content(V2_CONFIG)
+    (tmp_path / "precice-config.xml").write_text(ported)
+
+    results = port_files([tmp_path], check=True, jobs=2)
+    assert list(results["ported"]) == [tmp_path / "a" / "precice-config.xml"]
+    assert results["ported"][tmp_path / "a" / "precice-config.xml"]["solver-interface"] == 1
+    assert list(results["current"]) == [tmp_path / "precice-config.xml"]
+    # check mode does not write
+    assert (tmp_path / "a" / "precice-config.xml").read_bytes() == V2_CONFIG
+
+    port_files([tmp_path], jobs=1)
+    assert (tmp_path / "a" / "precice-config.xml").read_text() == ported
@@ -0,0 +1,78 @@
+import xml.etree.ElementTree as ElementTree
+
+from controller_utils.precice_struct.PS_Profile import configure_profile
+
+
+def _config(generated):
+    generator, root = generated
+    return root, generator.structure.precice_config.read_text()
+
+
+def test_without_profile_nothing_is_written(generate):
+    root, text = _config(generate())
+    assert root.find("log") is None and root.find("profiling") is None
+    assert "export:" not in text
+
+
+def test_debug_profile_exports_and_watches(topology, generate):
+    watch_point = {"name": "Tip", "participant": "Solid", "coordinate": [0.6, 0.2, 0.0]}
+    topology["profile"] = {"name": "debug", "watch-points": [watch_point]}
+    topology["coupling-scheme"]["mode"] = "advanced"
+    root, text = _config(generate())
+    assert root.find("log/sink").get("filter") == "%Severity% >= debug"
+    assert root.find("profiling").attrib == {"mode": "all", "synchronize": "true"}
+    assert text.count('<export:vtu directory="precice-exports" every-n-time-windows="10"') == 2
+    solid = [p for p in root.iter("participant") if p.get("name") == "Solid"][0]
+    watch = solid.find("watch-point")
+    assert watch.get("name") == "Tip" and watch.get("coordinate") == "0.6;0.2;0.0"
+    assert watch.get("mesh") in [mesh.get("name") for mesh in solid.iter("provide-mesh")]
+
+
+def test_watch_point_of_unknown_participant_is_dropped(topology, generate):
+    watch_point = {"name": "Tip", "participant": "Beam", "coordinate": [0.6, 0.2, 0.0]}
+    topology["profile"] = {"name": "debug", "export-every": 5, "watch-points": [watch_point]}
+    _, root = generate()
+    assert not list(root.iter("watch-point"))
+
+
+def test_skipped_watch_points_report_their_cause():
+    class Solver:
+        name, dimensionality, meshes = "Solid", 3, {}
+
+    class Log:
+        messages = []
+
+        def rep_warning(self, message):
+            self.messages.append(message)
+
+    watch_points = [{"name": "Tip", "participant": "Solid", "coordinate": [0.6, 0.2]}]
+    profile = configure_profile({"name": "debug", "watch-points": watch_points}, "on", "fundamental")
+    log, tag = Log(), ElementTree.Element("participant")
+    profile.write_participant(tag, Solver(), log)
+    Solver.meshes = {"Solid-Mesh": None}
+    profile.write_participant(tag, Solver(), log)
+    assert log.messages == ["The watch-point Tip is skipped, Solid provides no mesh.",
+                            "The watch-point Tip needs a coordinate with 3 components."]
+    assert tag.find("watch-point") is None
+
+
+def test_skipped_watch_points_are_shown(topology, generate, capsys):
+    topology["profile"] = {"name": "debug", "watch-points": [
+        {"name": "Tip", "participant": "Solid", "coordinate": [0.6, 0.2]}]}
+    generate()
+    assert "[WARNING] The watch-point Tip needs a coordinate with 3 components." in capsys.readouterr().out
+
+
+def test_production_profile_is_quiet(topology, generate):
+    topology["profile"] = "production"
+    root, text = _config(generate())
+    assert root.find("log/sink").get("filter") == "%Severity% >= warning"
+    assert root.find("profiling").attrib == {"mode": "fundamental", "synchronize": "false"}
+    assert "export:" not in text and not list(root.iter("watch-point"))
+
+
+def test_command_line_profile_overrides_the_topology(topology, generate):
+    topology["profile"] = {"name": "debug", "export-every": 5}
+    root, text = _config(generate(profile="production"))
+    assert root.find("log/sink").get("filter") == "%Severity% >= warning"
+    assert "export:" not in text
@@ -0,0 +1,42 @@
+from generation_utils.AdapterConfigGenerator import AdapterConfigIndex
+
+
+def _received(root):
+    return {mesh.get("name"): dict(mesh.attrib) for mesh in root.iter("receive-mesh")}
+
+
+def test_serial_receiver_receives_the_whole_mesh(topology, generate):
+    topology["participants"] = {"Fluid": {"solver": "SU2", "ranks": 1}, "Solid": "Calculix"}
+    received = _received(generate()[1])
+    assert [mesh["geometric-filter"] for mesh in received.values()] == ["no-filter"]
+
+
+def test_large_mesh_on_many_ranks_is_filtered_on_primary_rank(topology, generate):
+    topology["participants"] = {
+        "Fluid": {"solver": "SU2", "ranks": 1024, "vertices": 100000},
+        "Solid": {"solver": "Calculix", "ranks": 1024, "vertices": 100000}}
+    for mesh in _received(generate()[1]).values():
+        assert mesh["geometric-filter"] == "on-primary-rank"
+
+
+def test_matching_meshes_get_a_small_safety_factor(topology, generate):
+    topology["participants"] = {
+        "Fluid": {"solver": "SU2", "ranks": 8, "vertices": 20000},
+        "Solid": {"solver": "Calculix", "ranks": 8, "vertices": 20000}}
+    for mesh in _received(generate()[1]).values():
+        assert mesh["safety-factor"] == "0.1"
+        assert "geometric-filter" not in mesh
+
+
+def test_topology_settings_and_direct_access(topology, generate):
+    topology["participants"] = {
+        "Fluid": {"solver": "SU2", "ranks": 1, "receive-mesh": {
+            "geometric-filter": "on-secondary-ranks", "safety-factor": 0.3, "api-access": True}},
+        "Solid": "Calculix"}
+    generator, root = generate()
+    received = _received(root)
+    assert list(received.values()) == [{"name": "Solid-Mesh", "from": "Solid", "geometric-filter": "on-secondary-ranks",
+                                        "safety-factor": "0.3", "api-access": "true"}]
+    interfaces = AdapterConfigIndex(generator.structure.precice_config, topology).adapter_config("Fluid")["interfaces"]
+    direct = [interface for interface in interfaces if interface.get("direct_access")]
+    assert [interface["mesh_name"] for interface in direct] == ["Solid-Mesh"]
@@ -0,0 +1,79 @@
+import pytest
+import yaml
+
+from generation_utils.simulate_coupling import build_model, simulate_schedule, alternative_modes, main
+
+
+@pytest.fixture
+def topology(topology):
+    """ participants of equal cost """
+    topology["participants"] = {name: {"solver": solver, "cost-per-window": 2.0}
+                                for name, solver in topology["participants"].items()}
+    return topology
+
+
+def _model(tmp_path, topology):
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(yaml.safe_dump(topology))
+    return build_model(topology_file)
+
+
+def test_parallel_implicit_participants_barely_wait(tmp_path, topology):
+    config = _model(tmp_path, topology)
+    schedule = simulate_schedule(config, windows=5, iterations=4)
+    (names, coupling_str, iterations), = schedule.schemes
+    assert coupling_str == "parallel-implicit" and iterations == 6
+    assert schedule.wall_time == pytest.approx(5 * 6 * 2.0, rel=0.05)
+    assert all(schedule.idle_fraction(name) < 0.05 for name in names)
+    placements = {p.quantity.name: p for p in config.placements}
+    assert list(schedule.m2n_bytes.values()) == [6 * sum(p.exchange_bytes for p in placements.values())]
+
+
+def test_serial_alternative_lets_the_participants_alternate(tmp_path, topology):
+    config = _model(tmp_path, topology)
+    _, (description, coupling_modes) = alternative_modes(config)
+    assert description.startswith("serial-implicit")
+    schedule = simulate_schedule(config, windows=5, iterations=4, coupling_modes=coupling_modes)
+    assert schedule.wall_time == pytest.approx(5 * 4 * 4.0, rel=0.05)
+    assert all(schedule.idle_fraction(name) == pytest.approx(0.5, abs=0.05) for name in schedule.participants)
+
+
+def test_one_way_receiver_waits_for_the_sender(tmp_path, topology):
+    topology["exchanges"] = topology["exchanges"][:1]
+    topology["participants"]["Solid"]["cost-per-window"] = 1.0
+    schedule = simulate_schedule(_model(tmp_path, topology), windows=3)
+    assert schedule.schemes[0][1:] == ("serial-explicit", 1)
+    solid = [solve for solve in schedule.solves if solve.participant == "Solid"]
+    fluid = [solve for solve in schedule.solves if solve.participant == "Fluid"]
+    assert all(s.start >= f.end for s, f in zip(solid, fluid))
+    assert schedule.wall_time == pytest.approx(3 * 2.0 + 1.0, rel=0.05)
+
+
+def test_steady_state_is_a_single_window(tmp_path, topology):
+    topology["coupling-scheme"]["steady-state"] = True
+    schedule = simulate_schedule(_model(tmp_path, topology), windows=10, iterations=4)
+    assert schedule.windows == 1
+    assert schedule.schemes[0][2] == 60
+    assert {solve.window for solve in schedule.solves} == {0}
+
+
+def test_command_writes_the_report_and_the_svg(tmp_path, topology, capsys):
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(yaml.safe_dump(topology))
+    svg = tmp_path / "timeline.svg"
+    assert main([str(topology_file), "-n", "2", "--alternatives", "--svg", str(svg)]) == 0
+    output = capsys.readouterr().out
+    assert "Predicted wall time" in output and "serial-implicit instead of parallel-implicit" in output
+    assert svg.read_text().count("<rect") == 2 * 2 * 6
+
+
+def test_one_way_pair_of_a_multi_scheme_does_not_deadlock(tmp_path, topology):
+    topology["participants"]["Heat"] = {"solver": "OpenFOAM", "cost-per-window": 2.0}
+    topology["exchanges"] += [
+        {"from": "Solid", "from-patch": "surface", "to": "Heat", "to-patch": "wall", "data": "Temperature", "type": "strong"},
+        {"from": "Heat", "from-patch": "wall", "to": "Solid", "to-patch": "surface", "data": "HeatTransfer", "type": "strong"},
+        {"from": "Fluid", "from-patch": "interface", "to": "Heat", "to-patch": "wall", "data": "Velocity", "type": "weak"}]
+    schedule = simulate_schedule(_model(tmp_path, topology), windows=2, iterations=3)
+    # Fluid and Heat iterate in the multi scheme Solid controls, the receiver of their one-way pair can not wait
+    assert [scheme[1] for scheme in schedule.schemes] == ["multi", "parallel-explicit"]
+    assert {solve.participant for solve in schedule.solves} == {"Fluid", "Solid", "Heat"}
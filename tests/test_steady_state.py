@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def topology(topology):
+    """ weak exchanges, which a steady state iterates nevertheless """
+    topology["coupling-scheme"] = {"max-time": 1e-1, "time-window-size": 1e-3, "steady-state": True}
+    for exchange in topology["exchanges"]:
+        exchange["type"] = "weak"
+    return topology
+
+
+def _schemes(root):
+    return [child for child in root if child.tag.startswith("coupling-scheme:")]
+
+
+def test_steady_state_iterates_a_single_window(generate):
+    schemes = _schemes(generate()[1])
+    assert [scheme.tag for scheme in schemes] == ["coupling-scheme:parallel-implicit"]
+    scheme = schemes[0]
+    assert scheme.find("max-time-windows").get("value") == "1"
+    assert scheme.find("max-time") is None
+    assert scheme.find("max-iterations").get("value") == "200"
+    measures = {child.get("data"): (child.tag, child.get("limit"))
+                for child in scheme if child.tag.endswith("-convergence-measure")}
+    assert measures == {"Force": ("residual-relative-convergence-measure", "0.001"),
+                        "Displacement": ("residual-relative-convergence-measure", "0.001")}
+    acceleration = next(child for child in scheme if child.tag == "acceleration:IQN-ILS")
+    assert acceleration.find("time-windows-reused").get("value") == "0"
+    assert acceleration.find("max-used-iterations").get("value") == "200"
+
+
+def test_steady_state_honors_the_scheme_settings(topology, generate):
+    topology["coupling-scheme"].update({"max-iterations": 80, "relative-accuracy": 1e-5})
+    schemes = _schemes(generate()[1])
+    assert schemes[0].find("max-iterations").get("value") == "80"
+    assert {child.get("limit") for child in schemes[0] if child.tag.endswith("-convergence-measure")} == {"1e-05"}
+
+
+def test_steady_state_drops_the_waveform_degree(topology, generate):
+    topology["exchanges"][0]["waveform-degree"] = 2
+    generator, root = generate()
+    force = next(data for data in root if data.tag.startswith("data:") and data.get("name") == "Force")
+    assert force.get("waveform-degree") is None
+    assert {exchange.get("substeps") for exchange in root.iter("exchange")} == {"false"}
+    waveform = next(p.waveform for p in generator.precice_config.placements if p.quantity.name == "Force")
+    assert "waveform degree 2 is dropped" in waveform.describe()
+
+
+def test_transient_topology_is_unchanged(topology, generate):
+    topology["coupling-scheme"]["steady-state"] = False
+    schemes = _schemes(generate()[1])
+    assert [scheme.tag for scheme in schemes] == ["coupling-scheme:parallel-explicit"]
+    assert schemes[0].find("max-time").get("value") == "0.1"
+
+
+def test_steady_state_hints_for_adapters_and_run_scripts(tmp_path, generate):
+    generator, _ = generate()
+    generator.generate_level_1()
+    adapter_configs = list(tmp_path.glob("_generated/*/adapter-config.json"))
+    assert len(adapter_configs) == 2
+    for adapter_config in adapter_configs:
+        assert json.loads(adapter_config.read_text())["steady_state"] is True
+        assert "Steady-state coupling" in (adapter_config.parent / "run.sh").read_text()
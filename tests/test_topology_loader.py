@@ -0,0 +1,125 @@
+from pathlib import Path
+import jsonschema
+import pytest
+import yaml
+
+import generation_utils.TopologyLoader as topology_loader_module
+from generation_utils.TopologyLoader import TopologyLoader, load_yaml
+
+EXAMPLE_TOPOLOGY = Path(__file__).parent.parent / "controller_utils" / "examples" / "1" / "topology.yaml"
+
+
+def test_fast_loader_matches_safe_loader():
+    """The libyaml loader (if available) must produce exactly what yaml.safe_load produces"""
+    content = EXAMPLE_TOPOLOGY.read_text()
+    assert load_yaml(content) == yaml.safe_load(content)
+
+
+def test_cache_skips_yaml_parsing(tmp_path, monkeypatch):
+    """A second load of unchanged content is served from the cache without parsing YAML"""
+    monkeypatch.setattr(TopologyLoader, "_fragment_cache", {})
+    loader = TopologyLoader(cache_dir=tmp_path)
+    first = loader.load(EXAMPLE_TOPOLOGY)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed on a cache hit")
+
+    monkeypatch.setattr(topology_loader_module, "load_yaml", fail)
+    # drop the in-process fragment cache so the on-disk cache has to serve the request
+    monkeypatch.setattr(TopologyLoader, "_fragment_cache", {})
+    assert TopologyLoader(cache_dir=tmp_path).load(EXAMPLE_TOPOLOGY) == first
+
+
+def test_cache_is_keyed_by_content(tmp_path):
+    """Changing the file content must not return the stale cache entry"""
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(EXAMPLE_TOPOLOGY.read_text())
+    loader = TopologyLoader(cache_dir=tmp_path / "cache")
+    assert loader.load(topology_file)["participants"]["Fluid"] == "SU2"
+
+    topology_file.write_text(EXAMPLE_TOPOLOGY.read_text().replace("SU2", "OpenFOAM"))
+    assert loader.load(topology_file)["participants"]["Fluid"] == "OpenFOAM"
+
+
+def test_numeric_keys_are_kept(tmp_path, monkeypatch):
+    """Keys that are not strings are neither turned into strings nor cached, with or without the cache"""
+    monkeypatch.setattr(TopologyLoader, "_fragment_cache", {})
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text("participants:\n    1: SU2\n    Solid: Calculix\n")
+    assert TopologyLoader().load(topology_file)["participants"] == {1: "SU2", "Solid": "Calculix"}
+
+    monkeypatch.setattr(TopologyLoader, "_fragment_cache", {})
+    loader = TopologyLoader(cache_dir=tmp_path / "cache")
+    assert loader.load(topology_file)["participants"] == {1: "SU2", "Solid": "Calculix"}
+    assert not list((tmp_path / "cache").glob("*.json"))
+
+
+BASE_FRAGMENT = """
+coupling-scheme:
+    max-time: 1e-1
+    time-window-size: 1e-3
+    relative-accuracy: 1e-4
+participants:
+    Fluid: SU2
+    Solid: Calculix
+"""
+
+EXCHANGES_FRAGMENT = """
+exchanges:
+    - {from: Fluid, from-patch: interface, to: Solid, to-patch: surface, data: Force, type: strong}
+    - {from: Solid, from-patch: surface, to: Fluid, to-patch: interface, data: Displacement, type: strong}
+"""
+
+
+def test_extends_and_include_are_deep_merged(tmp_path):
+    (tmp_path / "fragments").mkdir()
+    (tmp_path / "fragments" / "base.yaml").write_text(BASE_FRAGMENT)
+    (tmp_path / "fragments" / "exchanges.yaml").write_text(EXCHANGES_FRAGMENT)
+    topology_file = tmp_path / "topology.yaml"
+    topology_file.write_text(
+        "extends: fragments/base.yaml\n"
+        "include: [fragments/exchanges.yaml]\n"
+        "coupling-scheme:\n    max-time: 5e-1\n"
+    )
+
+    topology = TopologyLoader().load(topology_file)
+    assert "extends" not in topology and "include" not in topology
+    assert topology["coupling-scheme"] == {"max-time": "5e-1", "time-window-size": "1e-3",
+                                           "relative-accuracy": "1e-4"}
+    assert topology["participants"] == {"Fluid": "SU2", "Solid": "Calculix"}
+    assert len(topology["exchanges"]) == 2
+
+
+def test_shared_fragment_is_parsed_once(tmp_path, monkeypatch):
+    (tmp_path / "base.yaml").write_text(BASE_FRAGMENT + EXCHANGES_FRAGMENT)
+    for i in range(5):
+        (tmp_path / f"topology_{i}.yaml").write_text(f"extends: base.yaml\nparticipants:\n    Fluid: Solver{i}\n")
+
+    parsed = []
+    original_load_yaml = topology_loader_module.load_yaml
+
+    def counting_load_yaml(content):
+        parsed.append(content)
+        return original_load_yaml(content)
+
+    monkeypatch.setattr(topology_loader_module, "load_yaml", counting_load_yaml)
+    monkeypatch.setattr(TopologyLoader, "_fragment_cache", {})
+    for i in range(5):
+        assert TopologyLoader().load(tmp_path / f"topology_{i}.yaml")["participants"]["Fluid"] == f"Solver{i}"
+    # five topologies plus the shared base fragment
+    assert len(parsed) == 6
+
+
+def test_cyclic_extends_is_rejected(tmp_path):
+    (tmp_path / "a.yaml").write_text("extends: b.yaml\n")
+    (tmp_path / "b.yaml").write_text("extends: a.yaml\n")
+    with pytest.raises(ValueError, match="Cyclic"):
+        TopologyLoader().load(tmp_path / "a.yaml")
+
+
+def test_resolved_topology_is_validated(tmp_path):
+    (tmp_path / "base.yaml").write_text(BASE_FRAGMENT + EXCHANGES_FRAGMENT)
+    (tmp_path / "topology.yaml").write_text("extends: base.yaml\ncoupling-scheme:\n    unknown-key: 1\n")
+    with pytest.raises(jsonschema.ValidationError):
+        TopologyLoader().load(tmp_path / "topology.yaml")
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from generation_utils.format_precice_config import PrettyPrinter
+from generation_utils.validate_precice_config import validate_file, validate_files, validate_tree
+
+EXAMPLE_CONFIG = Path(__file__).parent.parent / "controller_utils" / "examples" / "1" / "precice-config.xml"
+
+VALID_CONFIG = """<?xml version="1.0" encoding="UTF-8"?>
+<precice-configuration>
+    <data:vector name="Force"/>
+    <data:vector name="Displacement"/>
+    <mesh name="Fluid-Mesh" dimensions="3"><use-data name="Force"/><use-data name="Displacement"/></mesh>
+    <mesh name="Solid-Mesh" dimensions="3"><use-data name="Force"/><use-data name="Displacement"/></mesh>
+    <participant name="Fluid">
+        <provide-mesh name="Fluid-Mesh"/>
+        <receive-mesh name="Solid-Mesh" from="Solid"/>
+        <write-data name="Force" mesh="Fluid-Mesh"/>
+        <read-data name="Displacement" mesh="Fluid-Mesh"/>
+        <mapping:nearest-neighbor direction="read" from="Solid-Mesh" to="Fluid-Mesh" constraint="consistent"/>
+        <mapping:nearest-neighbor direction="write" from="Fluid-Mesh" to="Solid-Mesh" constraint="conservative"/>
+    </participant>
+    <participant name="Solid">
+        <provide-mesh name="Solid-Mesh"/>
+        <write-data name="Displacement" mesh="Solid-Mesh"/>
+        <read-data name="Force" mesh="Solid-Mesh"/>
+    </participant>
+    <m2n:sockets acceptor="Fluid" connector="Solid"/>
+    <coupling-scheme:parallel-implicit>
+        <participants first="Fluid" second="Solid"/>
+        <max-time value="1"/>
+        <time-window-size value="0.01"/>
+        <exchange data="Force" mesh="Solid-Mesh" from="Fluid" to="Solid"/>
+        <exchange data="Displacement" mesh="Solid-Mesh" from="Solid" to="Fluid"/>
+        <relative-convergence-measure limit="1e-4" data="Displacement" mesh="Solid-Mesh"/>
+        <acceleration:IQN-ILS><data name="Displacement" mesh="Solid-Mesh"/></acceleration:IQN-ILS>
+    </coupling-scheme:parallel-implicit>
+</precice-configuration>
+"""
+
+
+def rules_of(content):
+    return sorted(issue.rule for issue in validate_tree(PrettyPrinter.parse_xml(content.encode())))
+
+
+def test_valid_configs_pass():
+    assert rules_of(VALID_CONFIG) == []
+    assert validate_file(EXAMPLE_CONFIG) == []
+
+
+def test_missing_read_mapping_is_reported():
+    broken = VALID_CONFIG.replace(
+        '<mapping:nearest-neighbor direction="read" from="Solid-Mesh" to="Fluid-Mesh" constraint="consistent"/>', '')
+    issues = validate_tree(PrettyPrinter.parse_xml(broken.encode()))
+    assert [issue.rule for issue in issues] == ["read-data-path"]
+    assert "Displacement" in issues[0].message and issues[0].line == 11
+
+
+def test_structural_violations_are_reported():
+    broken = VALID_CONFIG.replace(
+        '<m2n:sockets acceptor="Fluid" connector="Solid"/>',
+        '<m2n:sockets acceptor="Fluid" connector="Solid"/><m2n:sockets acceptor="Solid" connector="Fluid"/>'
+    ).replace(
+        '<acceleration:IQN-ILS><data name="Displacement"', '<acceleration:IQN-ILS><data name="Velocity"'
+    ).replace(
+        '<receive-mesh name="Solid-Mesh" from="Solid"/>', '<receive-mesh name="Solid-Mesh" from="Other"/>')
+    assert rules_of(broken) == ["acceleration-data", "duplicate-m2n", "receive-from"]
+
+
+def test_exchange_mesh_must_be_used_by_both_sides():
+    broken = VALID_CONFIG.replace('<exchange data="Force" mesh="Solid-Mesh"', '<exchange data="Force" mesh="Fluid-Mesh"')
+    assert "exchange-mesh" in rules_of(broken)
+
+
+def test_multi_scheme_exchanges_only_with_its_control_participant():
+    multi = VALID_CONFIG.replace('<participants first="Fluid" second="Solid"/>',
+                                 '<participant name="Fluid"/><participant name="Solid" control="yes"/>'
+                                 ).replace("coupling-scheme:parallel-implicit", "coupling-scheme:multi")
+    assert rules_of(multi) == []
+    assert rules_of(multi.replace(' control="yes"', '')) == ["multi-control"]
+    other_control = multi.replace(' control="yes"', '').replace(
+        '<participant name="Fluid"/>', '<participant name="Fluid"/><participant name="Heat" control="yes"/>')
+    assert rules_of(other_control) == ["multi-control", "multi-control"]
+
+def test_validate_files(tmp_path):
+    (tmp_path / "precice-config.xml").write_text(VALID_CONFIG)
+    (tmp_path / "precice-config-broken.xml").write_text(VALID_CONFIG.replace('<m2n:sockets acceptor="Fluid" connector="Solid"/>', ''))
+    results = validate_files([tmp_path], jobs=2)
+    assert results[tmp_path / "precice-config.xml"] == []
+    assert [issue.rule for issue in results[tmp_path / "precice-config-broken.xml"]] == ["missing-m2n"]
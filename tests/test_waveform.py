@@ -0,0 +1,47 @@
+import pytest
+
+
+@pytest.fixture
+def topology(topology):
+    """ the time window follows the time steps of the participants """
+    topology["coupling-scheme"]["time-window-size"] = "auto"
+    topology["participants"] = {"Fluid": {"solver": "SU2", "time-step-size": 1e-3},
+                                "Solid": {"solver": "Calculix", "time-step-size": 2.5e-4}}
+    return topology
+
+
+def _waveforms(root):
+    exchanges = {exchange.get("data"): exchange.get("substeps") for exchange in root.iter("exchange")}
+    degrees = {data.get("name"): data.get("waveform-degree") for data in root if data.tag.startswith("data:")}
+    window = next(root.iter("time-window-size")).get("value")
+    return exchanges, degrees, window
+
+
+def test_time_window_is_the_largest_time_step(generate):
+    exchanges, degrees, window = _waveforms(generate()[1])
+    assert float(window) == 1e-3
+    # the solid takes four steps per window, the fluid reads at the end of the window only
+    assert exchanges == {"Force": "false", "Displacement": "false"}
+    assert degrees == {"Force": None, "Displacement": None}
+
+
+def test_substeps_when_both_participants_step_within_the_window(topology, generate):
+    topology["coupling-scheme"]["time-window-size"] = 2e-3
+    exchanges, _, window = _waveforms(generate()[1])
+    assert float(window) == 2e-3
+    assert exchanges == {"Force": "true", "Displacement": "true"}
+
+
+def test_higher_waveform_degree_needs_substeps(topology, generate):
+    topology["exchanges"][1]["waveform-degree"] = 2
+    exchanges, degrees, _ = _waveforms(generate()[1])
+    assert exchanges["Displacement"] == "true" and degrees["Displacement"] == "2"
+    assert exchanges["Force"] == "false"
+
+
+def test_without_time_step_hints_nothing_is_written(topology, generate):
+    topology["coupling-scheme"]["time-window-size"] = 1e-3
+    topology["participants"] = {"Fluid": "SU2", "Solid": "Calculix"}
+    topology["exchanges"][0]["substeps"] = True
+    exchanges, degrees, _ = _waveforms(generate()[1])
+    assert exchanges == {"Force": "true", "Displacement": None}